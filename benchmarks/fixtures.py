@@ -0,0 +1,84 @@
+import numpy as np
+
+# Tangan kanan terbuka (telapak menghadap kamera) dalam koordinat ternormalisasi,
+# urutan landmark MediaPipe Hands
+HAND_TEMPLATE = np.array([
+    [0.500, 0.800, 0.000],   # wrist
+    [0.450, 0.760, -0.010],  # thumb cmc
+    [0.410, 0.710, -0.015],  # thumb mcp
+    [0.380, 0.660, -0.020],  # thumb ip
+    [0.360, 0.620, -0.025],  # thumb tip
+    [0.460, 0.600, -0.010],  # index mcp
+    [0.455, 0.520, -0.020],  # index pip
+    [0.452, 0.470, -0.030],  # index dip
+    [0.450, 0.430, -0.040],  # index tip
+    [0.500, 0.590, -0.010],  # middle mcp
+    [0.500, 0.500, -0.020],  # middle pip
+    [0.500, 0.450, -0.030],  # middle dip
+    [0.500, 0.400, -0.040],  # middle tip
+    [0.535, 0.600, -0.010],  # ring mcp
+    [0.540, 0.520, -0.020],  # ring pip
+    [0.543, 0.470, -0.030],  # ring dip
+    [0.545, 0.430, -0.040],  # ring tip
+    [0.565, 0.630, -0.010],  # pinky mcp
+    [0.575, 0.570, -0.020],  # pinky pip
+    [0.580, 0.530, -0.030],  # pinky dip
+    [0.585, 0.500, -0.040],  # pinky tip
+], dtype=np.float64)
+
+
+def synthetic_landmark_sequence(num_frames=300, num_hands=1, seed=0, noise=0.002):
+    """
+    Urutan landmark sintetis yang deterministik: tangan bergeser, berputar,
+    dan berubah skala perlahan dengan noise kecil per frame
+    Returns:
+        Array (num_frames, num_hands, 21, 3)
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(num_frames, dtype=np.float64)[:, None]
+    hand_offsets = np.linspace(-0.25, 0.25, num_hands) if num_hands > 1 else np.zeros(1)
+
+    angle = np.deg2rad(10.0) * np.sin(t / 45.0)
+    scale = 1.0 + 0.05 * np.sin(t / 30.0)
+    shift_x = 0.05 * np.sin(t / 60.0) + hand_offsets[None, :]
+    shift_y = 0.03 * np.cos(t / 50.0)
+
+    center = HAND_TEMPLATE[0, :2]
+    local = HAND_TEMPLATE[:, :2] - center
+    cos_a = np.cos(angle)[..., None]
+    sin_a = np.sin(angle)[..., None]
+
+    points = np.empty((num_frames, num_hands, 21, 3), dtype=np.float64)
+    rotated_x = local[:, 0] * cos_a - local[:, 1] * sin_a
+    rotated_y = local[:, 0] * sin_a + local[:, 1] * cos_a
+    points[..., 0] = (rotated_x * scale[..., None] + center[0] + shift_x[..., None])
+    points[..., 1] = (rotated_y * scale[..., None] + center[1] + shift_y[..., None])
+    points[..., 2] = HAND_TEMPLATE[:, 2] * scale[..., None]
+    points += rng.normal(0.0, noise, points.shape)
+    return points
+
+
+def load_landmark_fixture(path):
+    """
+    Muat urutan landmark rekaman (.npy atau .npz dengan key 'points')
+    Returns:
+        Array (num_frames, num_hands, 21, 3)
+    """
+    data = np.load(path)
+    points = data['points'] if hasattr(data, 'files') else data
+    if points.ndim == 3:
+        points = points[:, None]
+    return points.astype(np.float64)
+
+
+def synthetic_frame(width, height, seed=0):
+    """Frame BGR deterministik (gradien + noise) untuk benchmark gambar"""
+    rng = np.random.default_rng(seed)
+    gradient_x = np.linspace(40, 200, width, dtype=np.float32)[None, :]
+    gradient_y = np.linspace(30, 120, height, dtype=np.float32)[:, None]
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[..., 0] = gradient_x * 0.6 + gradient_y * 0.4
+    frame[..., 1] = gradient_y
+    frame[..., 2] = gradient_x
+    frame += rng.integers(0, 8, frame.shape, dtype=np.uint8)
+    return frame
@@ -0,0 +1,187 @@
+"""
+Load test layanan pengukuran lokal ('main.py serve').
+
+Jalankan dari root repo saat layanan aktif:
+    python -m benchmarks.load_test --concurrency 16 --requests 2000
+    python -m benchmarks.load_test --mode image --image tangan.jpg --websocket
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+import cv2
+import numpy as np
+from benchmarks.fixtures import synthetic_frame, synthetic_landmark_sequence
+from src.service.protocol import WS_TEXT, WS_BINARY, encode_frame, read_frame
+
+
+def build_payloads(args):
+    """
+    Body request yang dikirim bergiliran
+    Returns:
+        (content_type, list bytes)
+    """
+    if args.mode == 'landmarks':
+        sequence = synthetic_landmark_sequence(args.frames, num_hands=args.hands, seed=args.seed)
+        return 'application/json', [json.dumps({'landmarks': frame.round(5).tolist()}).encode()
+                                    for frame in sequence]
+    if args.image:
+        with open(args.image, 'rb') as f:
+            return 'image/jpeg', [f.read()]
+    # Tanpa --image: frame sintetis (tanpa tangan), menguji decode + MediaPipe + antrian
+    width, height = (int(n) for n in args.size.lower().split('x'))
+    success, encoded = cv2.imencode('.jpg', synthetic_frame(width, height, args.seed))
+    return 'image/jpeg', [encoded.tobytes()]
+
+
+async def read_response(reader):
+    """Baca satu respons HTTP: (status, header, body)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Koneksi ditutup server")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers, body
+
+
+async def http_client(args, content_type, payloads, counter, samples):
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        while True:
+            index = next(counter, None)
+            if index is None:
+                return
+            body = payloads[index % len(payloads)]
+            start = time.perf_counter()
+            writer.write((f"POST /measure HTTP/1.1\r\nHost: {args.host}\r\n"
+                          f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n").encode() + body)
+            await writer.drain()
+            status, headers, _ = await read_response(reader)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            samples.append((status, elapsed_ms,
+                            float(headers.get('x-queue-ms', 'nan')),
+                            int(headers.get('x-batch-size', 0))))
+            if headers.get('connection') == 'close':
+                writer.close()
+                reader, writer = await asyncio.open_connection(args.host, args.port)
+    finally:
+        writer.close()
+
+
+async def websocket_client(args, content_type, payloads, counter, samples):
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET /ws HTTP/1.1\r\nHost: {args.host}\r\nUpgrade: websocket\r\n"
+                  f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                  f"Sec-WebSocket-Version: 13\r\n\r\n").encode())
+    await writer.drain()
+    status, _, _ = await read_response(reader)
+    if status != 101:
+        raise ConnectionError(f"Upgrade WebSocket ditolak ({status})")
+    opcode = WS_TEXT if content_type == 'application/json' else WS_BINARY
+    try:
+        while True:
+            index = next(counter, None)
+            if index is None:
+                return
+            start = time.perf_counter()
+            writer.write(encode_frame(opcode, payloads[index % len(payloads)], mask=True))
+            await writer.drain()
+            _, payload = await read_frame(reader, 1 << 24)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            result = json.loads(payload)
+            samples.append((result.get('status', 200), elapsed_ms,
+                            result.get('latency_ms', {}).get('queue', float('nan')),
+                            result.get('batch_size', 0)))
+    finally:
+        writer.close()
+
+
+async def run_load_test(args):
+    content_type, payloads = build_payloads(args)
+    counter = iter(range(args.requests))
+    samples = []
+    client = websocket_client if args.websocket else http_client
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, content_type, payloads, counter, samples)
+                           for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    statuses = np.array([sample[0] for sample in samples])
+    ok = statuses == 200
+    latency = np.array([sample[1] for sample in samples])[ok]
+    queue = np.array([sample[2] for sample in samples])[ok]
+    batch = np.array([sample[3] for sample in samples])[ok]
+    return {
+        'mode': args.mode,
+        'transport': 'websocket' if args.websocket else 'http',
+        'concurrency': args.concurrency,
+        'requests': len(samples),
+        'ok': int(ok.sum()),
+        'errors': {str(status): int((statuses == status).sum()) for status in np.unique(statuses[~ok])},
+        'duration_s': elapsed,
+        'throughput_per_s': ok.sum() / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': float(np.percentile(latency, 50)) if latency.size else None,
+        'p95_ms': float(np.percentile(latency, 95)) if latency.size else None,
+        'p99_ms': float(np.percentile(latency, 99)) if latency.size else None,
+        'server_queue_p50_ms': float(np.nanpercentile(queue, 50)) if queue.size else None,
+        'mean_batch_size': float(batch.mean()) if batch.size else None
+    }
+
+
+def print_report(report):
+    print(f"\nLoad test {report['mode']} via {report['transport']}, {report['concurrency']} koneksi:")
+    print(f"- Request: {report['ok']}/{report['requests']} sukses"
+          + (f", error {report['errors']}" if report['errors'] else ""))
+    print(f"- Throughput: {report['throughput_per_s']:.1f} request/s dalam {report['duration_s']:.2f} s")
+    if report['p50_ms'] is not None:
+        print(f"- Latensi klien: p50 {report['p50_ms']:.2f} ms, p95 {report['p95_ms']:.2f} ms, "
+              f"p99 {report['p99_ms']:.2f} ms")
+        print(f"- Antrian server p50 {report['server_queue_p50_ms']:.2f} ms, "
+              f"rata-rata {report['mean_batch_size']:.2f} request per batch")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test layanan pengukuran di localhost")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help="Jumlah koneksi paralel")
+    parser.add_argument('-n', '--requests', type=int, default=1000, help="Total request")
+    parser.add_argument('--mode', choices=('landmarks', 'image'), default='landmarks')
+    parser.add_argument('--image', help="File JPEG untuk mode image (default: frame sintetis)")
+    parser.add_argument('--size', default='640x480', help="Ukuran frame sintetis mode image")
+    parser.add_argument('--hands', type=int, default=1, help="Jumlah tangan per request mode landmarks")
+    parser.add_argument('--frames', type=int, default=300, help="Jumlah payload landmark berbeda")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--websocket', action='store_true', help="Kirim lewat /ws, bukan POST /measure")
+    parser.add_argument('-o', '--output', help="Simpan hasil sebagai JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        report = asyncio.run(run_load_test(args))
+    except ConnectionError as e:
+        print(f"Error: {e} (apakah 'main.py serve' sudah berjalan di {args.host}:{args.port}?)")
+        return 1
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nHasil disimpan: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""
+Benchmark tanpa kamera untuk DimensionCalculator, LandmarkFilter, Drawer, dan HandDetector.
+
+Jalankan dari root repo:
+    python -m benchmarks.run_benchmarks -o baseline.json
+    python -m benchmarks.run_benchmarks --compare baseline.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import cv2
+import numpy as np
+import yaml
+from benchmarks.fixtures import (
+    synthetic_landmark_sequence, load_landmark_fixture, synthetic_frame
+)
+from src.detector.calibration import Calibrator
+from src.measurement.dimension_calculator import DimensionCalculator
+from src.measurement.landmark_engine import array_to_landmarks
+from src.measurement.landmark_filter import LandmarkFilter
+from src.visualization.drawer import Drawer
+
+RESOLUTIONS = {
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '4k': (3840, 2160)
+}
+
+
+def summarize(samples_ms, peak_bytes):
+    samples = np.asarray(samples_ms)
+    total_s = samples.sum() / 1000
+    return {
+        'iterations': int(samples.size),
+        'mean_ms': float(samples.mean()),
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p95_ms': float(np.percentile(samples, 95)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'throughput_per_s': float(samples.size / total_s) if total_s > 0 else 0.0,
+        'peak_memory_kib': peak_bytes / 1024
+    }
+
+
+def measure(setup, call, iterations, memory_iterations=20):
+    """
+    Jalankan call(state, i) berulang kali; waktu dan memori diukur pada pass
+    terpisah karena tracemalloc memperlambat eksekusi. Jika call mengembalikan
+    durasi (detik), nilai itu yang dipakai sehingga persiapan tidak ikut terukur.
+    """
+    state = setup()
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        elapsed = call(state, i)
+        if elapsed is None:
+            elapsed = time.perf_counter() - start
+        samples[i] = elapsed * 1000
+
+    state = setup()
+    tracemalloc.start()
+    for i in range(min(memory_iterations, iterations)):
+        call(state, i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return summarize(samples, peak)
+
+
+def calibrated():
+    calibrator = Calibrator()
+    calibrator.calibrate(326, verbose=False)
+    return calibrator
+
+
+def bench_calculator(config, sequence):
+    hands = [[array_to_landmarks(points) for points in frame] for frame in sequence]
+
+    def setup():
+        return DimensionCalculator(calibrated(), config)
+
+    def call(calculator, i):
+        frame_hands = hands[i % len(hands)]
+        calculator.get_multi_hand_dimensions(frame_hands, list(range(len(frame_hands))))
+
+    return measure(setup, call, len(hands))
+
+
+def bench_landmark_filter(config, sequence):
+    """Filter One-Euro semua tangan per frame, termasuk tulis balik ke protobuf"""
+    hands = [[array_to_landmarks(points) for points in frame] for frame in sequence]
+    filter_config = dict(config, landmark_filter=dict(config.get('landmark_filter', {}), enabled=True))
+
+    def setup():
+        return LandmarkFilter(filter_config)
+
+    def call(landmark_filter, i):
+        frame_hands = hands[i % len(hands)]
+        landmark_filter.apply(frame_hands, list(range(len(frame_hands))), i / 30)
+
+    return measure(setup, call, len(hands))
+
+
+def bench_drawer(config, sequence, width, height, iterations, calibrate):
+    source = synthetic_frame(width, height)
+    hands = [array_to_landmarks(points) for points in sequence[:iterations, 0]]
+    calculator = DimensionCalculator(calibrated(), config)
+    dimensions = [calculator.get_hand_dimensions(hand_landmarks) for hand_landmarks in hands]
+
+    def setup():
+        calibrator = calibrated() if calibrate else Calibrator()
+        return Drawer(config, calibrator), source.copy()
+
+    def call(state, i):
+        drawer, frame = state
+        np.copyto(frame, source)
+        start = time.perf_counter()
+        drawer.draw_frame(frame, hands[i % len(hands)], dimensions[i % len(dimensions)])
+        return time.perf_counter() - start
+
+    return measure(setup, call, iterations)
+
+
+def bench_drawer_hands(config, sequence, width, height, iterations):
+    """Semua tangan per frame dalam satu draw_hands (overlay di-batch)"""
+    source = synthetic_frame(width, height)
+    calculator = DimensionCalculator(calibrated(), config)
+    frames = []
+    for frame_points in sequence[:iterations]:
+        hands = [array_to_landmarks(points) for points in frame_points]
+        dimensions = calculator.get_multi_hand_dimensions(hands, list(range(len(hands))))
+        frames.append([(hand_landmarks, hand_dimensions, f"PENGUKURAN TANGAN #{track_id}")
+                       for track_id, (hand_landmarks, hand_dimensions) in enumerate(zip(hands, dimensions))])
+
+    def setup():
+        return Drawer(config, calibrated()), source.copy()
+
+    def call(state, i):
+        drawer, frame = state
+        np.copyto(frame, source)
+        start = time.perf_counter()
+        drawer.draw_hands(frame, frames[i % len(frames)])
+        return time.perf_counter() - start
+
+    return measure(setup, call, iterations)
+
+
+def bench_detector(config, clip_path, max_frames):
+    from src.detector.hand_detector import HandDetector
+
+    cap = cv2.VideoCapture(clip_path)
+    frames = []
+    while len(frames) < max_frames:
+        success, frame = cap.read()
+        if not success:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise ValueError(f"Clip tidak dapat dibaca: {clip_path}")
+
+    def setup():
+        return HandDetector(config)
+
+    def call(detector, i):
+        detector.detect(frames[i % len(frames)])
+
+    return measure(setup, call, len(frames))
+
+
+def run_benchmarks(config, args):
+    if args.landmarks:
+        sequence = load_landmark_fixture(args.landmarks)
+    else:
+        sequence = synthetic_landmark_sequence(args.frames, num_hands=args.hands, seed=args.seed)
+
+    results = {}
+    print(f"Benchmark DimensionCalculator ({len(sequence)} frame)...")
+    results['calculator.get_multi_hand_dimensions'] = bench_calculator(config, sequence)
+    print(f"Benchmark LandmarkFilter ({len(sequence)} frame)...")
+    results['landmark_filter.apply'] = bench_landmark_filter(config, sequence)
+
+    for name in args.resolutions:
+        width, height = RESOLUTIONS[name]
+        print(f"Benchmark Drawer {name}...")
+        results[f'drawer.draw_frame.{name}'] = bench_drawer(
+            config, sequence, width, height, args.draw_iterations, calibrate=True)
+        results[f'drawer.draw_frame.{name}.guide'] = bench_drawer(
+            config, sequence, width, height, args.draw_iterations, calibrate=False)
+        results[f'drawer.draw_hands.{name}'] = bench_drawer_hands(
+            config, sequence, width, height, args.draw_iterations)
+
+    if args.clip:
+        print(f"Benchmark HandDetector ({args.clip})...")
+        results['detector.detect'] = bench_detector(config, args.clip, args.frames)
+
+    return {
+        'meta': {
+            'timestamp': time.time(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__,
+            'landmarks': args.landmarks or f'synthetic(seed={args.seed})',
+            'frames': int(len(sequence))
+        },
+        'results': results
+    }
+
+
+def compare(report, baseline, threshold, metric):
+    """
+    Bandingkan dengan baseline
+    Returns:
+        Daftar nama benchmark yang melambat lebih dari threshold
+    """
+    regressions = []
+    print(f"\n{'benchmark':<36} {'baseline':>10} {'sekarang':>10} {'delta':>8}")
+    for name, result in report['results'].items():
+        if name not in baseline['results']:
+            print(f"{name:<36} {'-':>10} {result[metric]:>10.3f}     baru")
+            continue
+        before = baseline['results'][name][metric]
+        after = result[metric]
+        delta = (after - before) / before if before > 0 else 0.0
+        flag = '  REGRESI' if delta > threshold else ''
+        print(f"{name:<36} {before:>10.3f} {after:>10.3f} {delta:>+7.1%}{flag}")
+        if delta > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def print_report(report):
+    print(f"\n{'benchmark':<36} {'p50 ms':>8} {'p95 ms':>8} {'per s':>9} {'peak KiB':>9}")
+    for name, result in report['results'].items():
+        print(f"{name:<36} {result['p50_ms']:>8.3f} {result['p95_ms']:>8.3f} "
+              f"{result['throughput_per_s']:>9.1f} {result['peak_memory_kib']:>9.1f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Hand Measurement System tanpa kamera")
+    parser.add_argument('--config', default='config/config.yaml')
+    parser.add_argument('-o', '--output', help="Simpan hasil sebagai JSON baseline")
+    parser.add_argument('--compare', help="File JSON baseline untuk dibandingkan")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Batas perlambatan relatif sebelum dianggap regresi (default 0.10)")
+    parser.add_argument('--metric', default='p50_ms', choices=['mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'])
+    parser.add_argument('--landmarks', help="Fixture landmark rekaman (.npy/.npz, shape (F, [H,] 21, 3))")
+    parser.add_argument('--frames', type=int, default=300, help="Jumlah frame landmark sintetis")
+    parser.add_argument('--hands', type=int, default=1, help="Jumlah tangan per frame sintetis")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--resolutions', nargs='+', default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument('--draw-iterations', type=int, default=100)
+    parser.add_argument('--clip', help="Video pendek untuk benchmark HandDetector (opsional)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+
+    report = run_benchmarks(config, args)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nHasil disimpan: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.metric)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark melambat lebih dari {args.threshold:.0%}")
+            return 1
+        print("\nTidak ada regresi")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,376 @@
+"""
+Sweep titik operasi akurasi vs kecepatan pada klip rekaman dengan ukuran tangan diketahui.
+
+Setiap kombinasi confidence deteksi/tracking, model_complexity MediaPipe,
+resolusi capture, dan measurement.buffer_size dijalankan pada semua klip.
+Hasilnya FPS, latensi p95, waktu sampai pembacaan stabil, dan MAE per dimensi,
+lalu tabel Pareto dan konfigurasi tercepat yang masih dalam toleransi.
+
+Manifest klip (YAML, path relatif terhadap file manifest):
+    clips:
+      - path: rekaman/tangan_a.mp4
+        reference_pixels: 330  # Opsional: panjang kartu referensi (pixel) pada resolusi asli klip
+        ground_truth:          # Ukuran sebenarnya (cm), nama field seperti pada output batch
+          index_length_cm: 7.1
+          palm_width_cm: 8.2
+
+Jalankan dari root repo:
+    python -m benchmarks.sweep clips.yaml -o sweep.json
+    python -m benchmarks.sweep clips.yaml --widths 1280 640 --complexity 0 1 --buffer-sizes 5
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+import cv2
+import numpy as np
+import yaml
+from src.batch.batch_runner import REFERENCE_WIDTH_RATIO
+from src.detector.calibration import Calibrator
+from src.detector.hand_detector import HandDetector
+from src.detector.hand_tracker import HandTracker
+from src.detector.landmark_recording import ReplayLandmarks
+from src.measurement.dimension_calculator import DimensionCalculator, MEASUREMENT_FIELDS
+from src.measurement.landmark_engine import stack_landmarks
+
+# Kolom kombinasi setting, urutan sama dengan itertools.product di run_sweep
+SETTINGS = ('detection_confidence', 'tracking_confidence', 'model_complexity', 'capture_width', 'buffer_size')
+
+
+class Clip:
+    """Satu klip rekaman dengan ukuran tangan sebenarnya"""
+
+    __slots__ = ('path', 'reference_pixels', 'ground_truth', 'size', 'fps')
+
+    def __init__(self, path, reference_pixels, ground_truth, size, fps):
+        self.path = path
+        self.reference_pixels = reference_pixels  # Pada resolusi asli klip
+        self.ground_truth = ground_truth  # field -> cm
+        self.size = size  # (lebar, tinggi)
+        self.fps = fps
+
+
+def load_manifest(path):
+    """Baca manifest YAML dan metadata setiap klip"""
+    with open(path, 'r') as f:
+        manifest = yaml.safe_load(f) or {}
+    base = os.path.dirname(path)
+
+    clips = []
+    for entry in manifest.get('clips') or []:
+        clip_path = os.path.join(base, entry['path'])
+        ground_truth = {field: float(value) for field, value in (entry.get('ground_truth') or {}).items()}
+        if not ground_truth:
+            raise ValueError(f"Klip tanpa ground_truth: {clip_path}")
+        unknown = sorted(set(ground_truth) - set(MEASUREMENT_FIELDS))
+        if unknown:
+            raise ValueError(f"Dimensi ground truth tidak dikenal: {', '.join(unknown)} "
+                             f"(pilihan: {', '.join(MEASUREMENT_FIELDS)})")
+
+        cap = cv2.VideoCapture(clip_path)
+        if not cap.isOpened():
+            raise ValueError(f"Klip tidak dapat dibuka: {clip_path}")
+        size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        cap.release()
+
+        reference_pixels = entry.get('reference_pixels') or int(size[0] * REFERENCE_WIDTH_RATIO)
+        clips.append(Clip(clip_path, float(reference_pixels), ground_truth, size, fps))
+    if not clips:
+        raise ValueError(f"Manifest tidak berisi klip: {path}")
+    return clips
+
+
+def variant_config(config, detection_confidence, tracking_confidence, model_complexity, buffer_size):
+    """Salinan config dengan setting satu titik operasi"""
+    return dict(
+        config,
+        detection=dict(config['detection'],
+                       min_detection_confidence=detection_confidence,
+                       min_tracking_confidence=tracking_confidence,
+                       model_complexity=model_complexity),
+        measurement=dict(config.get('measurement', {}), buffer_size=buffer_size)
+    )
+
+
+def detect_clip(config, clip, width, max_frames=None):
+    """
+    Deteksi landmark semua frame klip pada resolusi capture tertentu
+    Returns:
+        (list per frame (points, labels, world_points), array waktu deteksi ms)
+    """
+    detector = HandDetector(config)
+    # Model MediaPipe dibuat sebelum waktu deteksi diukur (lazy, lihat HandDetector.hands)
+    detector.hands
+    height = max(1, round(clip.size[1] * width / clip.size[0]))
+    cap = cv2.VideoCapture(clip.path)
+    detections = []
+    detect_ms = []
+    frame = resized = None
+    while max_frames is None or len(detections) < max_frames:
+        success, frame = cap.read(frame)
+        if not success:
+            break
+        if width != clip.size[0]:
+            # Resolusi capture lebih rendah disimulasikan dengan downscale, tidak ikut diukur
+            resized = cv2.resize(frame, (width, height), dst=resized, interpolation=cv2.INTER_AREA)
+            source = resized
+        else:
+            source = frame
+
+        start = time.perf_counter()
+        results = detector.detect(source)
+        detect_ms.append((time.perf_counter() - start) * 1000)
+
+        hand_landmarks_list = list(results.multi_hand_landmarks or [])
+        world_landmarks_list = getattr(results, 'multi_hand_world_landmarks', None)
+        detections.append((
+            stack_landmarks(hand_landmarks_list),
+            [HandDetector.get_handedness(results, i)[0] for i in range(len(hand_landmarks_list))],
+            stack_landmarks(world_landmarks_list) if world_landmarks_list else None
+        ))
+    cap.release()
+    detector.close()
+    return detections, np.array(detect_ms)
+
+
+def measure_clip(config, clip, detections, tolerance_cm):
+    """
+    Jalankan tracker, filter landmark, dan kalkulator pada hasil deteksi satu klip
+    Returns:
+        (array waktu pengukuran ms, dict field -> list error cm, detik sampai stabil atau None)
+    """
+    calibrator = Calibrator()
+    # Panjang segmen dihitung dari koordinat ternormalisasi (tidak bergantung resolusi),
+    # jadi kalibrasi resolusi asli klip berlaku untuk semua lebar capture
+    calibrator.calibrate(clip.reference_pixels, verbose=False)
+    calculator = DimensionCalculator(calibrator, config)
+    calculator.distance.frame_size = clip.size
+    tracker = HandTracker(config)
+
+    measure_ms = np.empty(len(detections))
+    errors = {field: [] for field in clip.ground_truth}
+    first_seen = stable_at = None
+    for frame_index, (points, labels, world_points) in enumerate(detections):
+        timestamp = frame_index / clip.fps
+        start = time.perf_counter()
+        hands = [ReplayLandmarks(hand_points) for hand_points in points]
+        track_ids, evicted = tracker.update(hands, labels)
+        for track_id in evicted:
+            calculator.drop_track(track_id)
+        calculator.landmark_filter.apply(hands, track_ids, timestamp)
+        world = [ReplayLandmarks(hand_points) for hand_points in world_points] if world_points is not None else None
+        dimensions_list = calculator.get_multi_hand_dimensions(hands, track_ids, world)
+        measure_ms[frame_index] = (time.perf_counter() - start) * 1000
+
+        if not dimensions_list or not dimensions_list[0]:
+            continue
+        # Klip berisi satu tangan: tangan pertama dibandingkan dengan ground truth
+        dimensions = dimensions_list[0]
+        if first_seen is None:
+            first_seen = timestamp
+        frame_errors = []
+        for field, truth in clip.ground_truth.items():
+            if field in dimensions:
+                error = abs(dimensions[field] - truth)
+                errors[field].append(error)
+                frame_errors.append(error)
+        # Stabil: semua dimensi ground truth sudah terbaca dan dalam toleransi
+        if (stable_at is None and len(frame_errors) == len(clip.ground_truth)
+                and max(frame_errors) <= tolerance_cm):
+            stable_at = timestamp
+
+    time_to_stable = stable_at - first_seen if stable_at is not None else None
+    return measure_ms, errors, time_to_stable
+
+
+def summarize(settings, latency_ms, errors, stable_times, tolerance_cm):
+    """Satu baris hasil untuk satu kombinasi setting (semua klip digabung)"""
+    total_s = latency_ms.sum() / 1000
+    mae = {field: float(np.mean(values)) if values else None for field, values in errors.items()}
+    measured = [value for value in mae.values() if value is not None]
+    complete = len(measured) == len(mae)
+    return dict(
+        zip(SETTINGS, settings),
+        frames=int(latency_ms.size),
+        fps=float(latency_ms.size / total_s) if total_s > 0 else 0.0,
+        p95_ms=float(np.percentile(latency_ms, 95)) if latency_ms.size else None,
+        # Rata-rata semua klip; None jika ada klip yang tidak pernah stabil
+        time_to_stable_s=float(np.mean(stable_times)) if None not in stable_times else None,
+        mae_cm=mae,
+        mae_mean_cm=float(np.mean(measured)) if measured else None,
+        mae_max_cm=max(measured) if complete else None,
+        within_tolerance=complete and max(measured) <= tolerance_cm
+    )
+
+
+def pareto_front(rows):
+    """
+    Tandai baris yang tidak didominasi baris lain pada FPS (naik), latensi p95,
+    waktu stabil, dan MAE rata-rata (turun)
+    """
+    def objectives(row):
+        missing = float('inf')
+        return (-row['fps'],
+                row['p95_ms'] if row['p95_ms'] is not None else missing,
+                row['time_to_stable_s'] if row['time_to_stable_s'] is not None else missing,
+                row['mae_mean_cm'] if row['mae_mean_cm'] is not None else missing)
+
+    points = np.array([objectives(row) for row in rows])
+    for i, row in enumerate(rows):
+        dominated = np.all(points <= points[i], axis=1) & np.any(points < points[i], axis=1)
+        row['pareto'] = not dominated.any()
+    return rows
+
+
+def run_sweep(config, clips, grid, tolerance_cm, max_frames=None):
+    """
+    Jalankan semua kombinasi grid pada semua klip
+    Returns:
+        List baris hasil (lihat summarize), kolom 'pareto' sudah terisi
+    """
+    # Deteksi hanya bergantung pada setting MediaPipe dan resolusi; hasilnya
+    # dipakai ulang untuk setiap buffer_size
+    detection_grid = list(itertools.product(grid['detection_confidence'], grid['tracking_confidence'],
+                                            grid['model_complexity'], grid['capture_width']))
+    print(f"Sweep: {len(detection_grid) * len(grid['buffer_size'])} kombinasi x {len(clips)} klip "
+          f"({len(detection_grid)} pass deteksi)")
+
+    rows = []
+    for n, (detection_confidence, tracking_confidence, model_complexity, width) in enumerate(detection_grid, 1):
+        print(f"[{n}/{len(detection_grid)}] deteksi {detection_confidence}, tracking {tracking_confidence}, "
+              f"model {model_complexity}, lebar {width}px")
+        detector_config = variant_config(config, detection_confidence, tracking_confidence, model_complexity,
+                                         grid['buffer_size'][0])
+        clip_detections = [detect_clip(detector_config, clip, width, max_frames) for clip in clips]
+
+        for buffer_size in grid['buffer_size']:
+            measure_config = variant_config(config, detection_confidence, tracking_confidence, model_complexity,
+                                            buffer_size)
+            latency = []
+            errors = {}
+            stable_times = []
+            for clip, (detections, detect_ms) in zip(clips, clip_detections):
+                measure_ms, clip_errors, time_to_stable = measure_clip(
+                    measure_config, clip, detections, tolerance_cm)
+                latency.append(detect_ms + measure_ms)
+                for field, values in clip_errors.items():
+                    errors.setdefault(field, []).extend(values)
+                stable_times.append(time_to_stable)
+            rows.append(summarize((detection_confidence, tracking_confidence, model_complexity, width, buffer_size),
+                                  np.concatenate(latency), errors, stable_times, tolerance_cm))
+    return pareto_front(rows)
+
+
+def _format(value, width):
+    return '-'.rjust(width) if value is None else f"{value:>{width}.2f}"
+
+
+def print_table(rows, tolerance_cm, show_all=False):
+    shown = sorted((row for row in rows if show_all or row['pareto']), key=lambda row: -row['fps'])
+    title = "Semua titik operasi" if show_all else "Titik operasi Pareto"
+    print(f"\n{title} (urut FPS, * = Pareto, v = MAE maksimum <= {tolerance_cm} cm):")
+    print(f"{'':2} {'det':>5} {'track':>5} {'model':>5} {'lebar':>6} {'buffer':>6} {'FPS':>7} "
+          f"{'p95 ms':>8} {'stabil s':>8} {'MAE cm':>7} {'maks cm':>7}  dimensi terburuk")
+    for row in shown:
+        measured = {field: value for field, value in row['mae_cm'].items() if value is not None}
+        worst = max(measured, key=measured.get) if measured else '-'
+        flags = ('*' if row['pareto'] else ' ') + ('v' if row['within_tolerance'] else ' ')
+        print(f"{flags:2} {row['detection_confidence']:>5} {row['tracking_confidence']:>5} "
+              f"{row['model_complexity']:>5} {row['capture_width']:>6} {row['buffer_size']:>6} "
+              f"{row['fps']:>7.1f} {_format(row['p95_ms'], 8)} {_format(row['time_to_stable_s'], 8)} "
+              f"{_format(row['mae_mean_cm'], 7)} {_format(row['mae_max_cm'], 7)}  {worst}")
+
+
+def recommend(rows):
+    """Konfigurasi tercepat yang semua dimensinya dalam toleransi, atau None"""
+    candidates = [row for row in rows if row['within_tolerance']]
+    return max(candidates, key=lambda row: row['fps']) if candidates else None
+
+
+def print_recommendation(row, tolerance_cm):
+    if row is None:
+        print(f"\nTidak ada titik operasi dengan MAE semua dimensi <= {tolerance_cm} cm")
+        return
+    print(f"\nTercepat dalam toleransi {tolerance_cm} cm: {row['fps']:.1f} FPS, p95 {row['p95_ms']:.2f} ms, "
+          f"MAE maksimum {row['mae_max_cm']:.2f} cm")
+    print("Setting config.yaml:")
+    print(f"  detection.min_detection_confidence: {row['detection_confidence']}")
+    print(f"  detection.min_tracking_confidence: {row['tracking_confidence']}")
+    print(f"  detection.model_complexity: {row['model_complexity']}")
+    print(f"  camera.width: {row['capture_width']}  # tinggi mengikuti rasio klip")
+    print(f"  measurement.buffer_size: {row['buffer_size']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep titik operasi akurasi vs kecepatan pada klip berlabel")
+    parser.add_argument('manifest', help="File YAML berisi klip dan ground truth ukuran tangan")
+    parser.add_argument('--config', default='config/config.yaml')
+    parser.add_argument('--detection-confidence', type=float, nargs='+', help="Nilai min_detection_confidence")
+    parser.add_argument('--tracking-confidence', type=float, nargs='+', help="Nilai min_tracking_confidence")
+    parser.add_argument('--complexity', type=int, nargs='+', choices=(0, 1), help="Nilai model_complexity")
+    parser.add_argument('--widths', type=int, nargs='+', help="Lebar frame capture (pixel)")
+    parser.add_argument('--buffer-sizes', type=int, nargs='+', help="Nilai measurement.buffer_size")
+    parser.add_argument('--tolerance', type=float, help="MAE maksimum per dimensi (cm) untuk rekomendasi")
+    parser.add_argument('--max-frames', type=int, help="Batas frame per klip")
+    parser.add_argument('--all', action='store_true', help="Tampilkan semua kombinasi, bukan hanya Pareto")
+    parser.add_argument('-o', '--output', help="Simpan semua baris hasil sebagai JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+    sweep = config.get('sweep', {})
+    detection = config['detection']
+
+    try:
+        clips = load_manifest(args.manifest)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: Manifest tidak valid: {e}")
+        return 1
+
+    grid = {
+        'detection_confidence': args.detection_confidence or sweep.get(
+            'detection_confidence', [detection['min_detection_confidence']]),
+        'tracking_confidence': args.tracking_confidence or sweep.get(
+            'tracking_confidence', [detection['min_tracking_confidence']]),
+        'model_complexity': args.complexity or sweep.get(
+            'model_complexity', [detection.get('model_complexity', 1)]),
+        'capture_width': args.widths or sweep.get('capture_widths', [config['camera']['width']]),
+        'buffer_size': args.buffer_sizes or sweep.get(
+            'buffer_sizes', [config.get('measurement', {}).get('buffer_size', 10)])
+    }
+    # Klip tidak bisa di-upscale menjadi resolusi capture yang lebih tinggi
+    max_width = min(clip.size[0] for clip in clips)
+    skipped = [width for width in grid['capture_width'] if width > max_width]
+    grid['capture_width'] = [width for width in grid['capture_width'] if width <= max_width] or [max_width]
+    if skipped:
+        print(f"Lebar {', '.join(map(str, skipped))}px dilewati: melebihi klip terkecil ({max_width}px)")
+    tolerance_cm = args.tolerance if args.tolerance is not None else sweep.get('tolerance_cm', 0.5)
+
+    rows = run_sweep(config, clips, grid, tolerance_cm, args.max_frames)
+    print_table(rows, tolerance_cm, show_all=args.all)
+    best = recommend(rows)
+    print_recommendation(best, tolerance_cm)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'manifest': args.manifest,
+                'clips': [{'path': clip.path, 'size': list(clip.size), 'fps': clip.fps,
+                           'ground_truth': clip.ground_truth} for clip in clips],
+                'grid': grid,
+                'tolerance_cm': tolerance_cm,
+                'recommended': best,
+                'results': rows
+            }, f, indent=2)
+        print(f"\nHasil disimpan: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
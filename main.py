@@ -1,38 +1,251 @@
-import cv2
+# Diimport pertama agar waktu startup diukur sedini mungkin
+from src.profiling.startup import startup
+import argparse
+import time
 import yaml
-import numpy as np
-from src.detector.hand_detector import HandDetector
-from src.detector.calibration import Calibrator
-from src.measurement.dimension_calculator import DimensionCalculator
-from src.visualization.drawer import Drawer
 
-def load_config():
-    with open('config/config.yaml', 'r') as f:
+# OpenCV, MediaPipe, dan komponen GUI diimport di dalam mode yang membutuhkannya,
+# sehingga --help dan mode batch tidak menanggung biaya import mode live
+
+def load_config(path='config/config.yaml'):
+    with open(path, 'r') as f:
         return yaml.safe_load(f)
 
 def calculate_object_pixels(frame):
     """
     Calculate reference object pixels with improved accuracy for fixed distance
     """
+    from src.detector.card_detector import TARGET_WIDTH_RATIO
     height, width = frame.shape[:2]
     # Using 17% of frame width as reference for credit card at 50cm distance
-    return int(width * 0.17)
+    return int(width * TARGET_WIDTH_RATIO)
+
+def calibrate_from_card(calibrator, measurement, frame, fallback_to_guide=True):
+    """Kalibrasi dari hasil CardDetector, atau dari kotak panduan jika kartu tidak ditemukan"""
+    if measurement.found:
+        print(f"\nKartu terdeteksi pada {measurement.samples}/{measurement.frames} frame")
+        calibrated = calibrator.calibrate(measurement.length_px, confidence=measurement.confidence)
+    else:
+        print(f"\nWarning: Kartu tidak terdeteksi dengan yakin "
+              f"(confidence {measurement.confidence:.2f}, {measurement.samples}/{measurement.frames} frame)")
+        if not fallback_to_guide:
+            print("Pastikan kartu berada di dalam kotak dan tekan 'c' lagi")
+            return False
+        print("Menggunakan ukuran kotak panduan sebagai referensi")
+        calibrated = calibrator.calibrate(calculate_object_pixels(frame), confidence=0.0)
+        
+    if calibrated:
+        print("\nKalibrasi berhasil pada jarak 50cm!")
+        print("Anda dapat melanjutkan pengukuran tangan")
+    return calibrated
+
+def load_calibration_profile(store, key, calibrator, name=None):
+    """Terapkan profil tersimpan ke calibrator; kembalikan nama profil atau None"""
+    profile = store.load(key, name)
+    if profile is None:
+        return None
+    calibrator.apply_profile(profile)
+    name = store.active_name(key)
+    print(f"Profil kalibrasi '{name}' dimuat ({key}): 1 pixel = {calibrator.pixel_to_cm_ratio:.6f} cm")
+    return name
+
+def draw_calibration_status(frame, calibrator, distance_cm=None):
+    """Show calibration status and distance reminder (atau jarak terestimasi)"""
+    import cv2
+    status = calibrator.get_calibration_status()
+    if status['is_calibrated']:
+        cv2.putText(frame, "Calibrated", (1110, 30), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        # Add distance reminder
+        distance_text = f"~{distance_cm:.0f}cm" if distance_cm is not None else f"{status['camera_distance']}cm"
+        cv2.putText(frame, distance_text, (1110, 60),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    else:
+        cv2.putText(frame, "Not Calibrated", (1050, 30),
+                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        # Add distance instruction
+        cv2.putText(frame, "Set 50cm", (1050, 60),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hand Measurement System")
+    parser.add_argument('--config', default='config/config.yaml',
+                        help="Path file konfigurasi (default: config/config.yaml)")
+    parser.add_argument('--profile', default=None,
+                        help="Nama profil kalibrasi yang dimuat saat mulai (default: profil aktif terakhir)")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="Cetak waktu setiap fase startup")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    subparsers.add_parser('live', help="Pengukuran langsung dari webcam (default)")
+    
+    batch = subparsers.add_parser('batch', help="Pengukuran offline dari file video atau folder gambar")
+    batch.add_argument('inputs', nargs='+', help="File video, file gambar, atau folder gambar")
+    batch.add_argument('-o', '--output', required=True,
+                       help="File output (.csv, .jsonl, atau .parquet)")
+    batch.add_argument('-w', '--workers', type=int, default=None,
+                       help="Jumlah proses worker (default: jumlah core)")
+    batch.add_argument('--reference-pixels', type=float, default=None,
+                       help="Panjang kartu referensi dalam pixel (default: 17%% lebar frame)")
+    batch.add_argument('--chunk-frames', type=int, default=300,
+                       help="Jumlah frame video per shard (0 = satu shard per video)")
+    batch.add_argument('--mirror', action='store_true',
+                       help="Flip frame horizontal seperti tampilan live")
+    
+    replay = subparsers.add_parser('replay', help="Proses ulang rekaman landmark (.hlr) tanpa kamera/MediaPipe")
+    replay.add_argument('inputs', nargs='+', help="File .hlr atau folder rekaman")
+    replay.add_argument('-o', '--output', default=None,
+                        help="File output (.csv, .jsonl, atau .parquet)")
+    replay.add_argument('--reference-pixels', type=float, default=None,
+                        help="Panjang kartu referensi dalam pixel (default: profil kalibrasi aktif)")
+    replay.add_argument('--show', action='store_true',
+                        help="Tampilkan landmark dan panel pengukuran saat replay")
+    
+    multi = subparsers.add_parser('multi', help="Beberapa kamera/video (stasiun) dalam satu proses")
+    multi.add_argument('--source', action='append', default=None,
+                       help="Indeks kamera atau file video; ulangi untuk beberapa sumber (default: multi_source.sources)")
+    multi.add_argument('-w', '--workers', type=int, default=None,
+                       help="Jumlah worker deteksi (default: multi_source.workers)")
+    multi.add_argument('--preview', choices=('tiled', 'none'), default=None,
+                       help="Tampilan gabungan atau tanpa jendela (default: multi_source.preview)")
+    
+    lens = subparsers.add_parser('lens', help="Kalibrasi distorsi lensa dari papan catur (gambar, video, atau kamera)")
+    lens.add_argument('inputs', nargs='*', help="File/folder gambar atau video (kosong = kamera live)")
+    lens.add_argument('-o', '--output', default=None,
+                      help="File model lensa (default: lens.model_path di config)")
+    lens.add_argument('--pattern', default=None,
+                      help="Jumlah sudut dalam papan catur, mis. 9x6 (default: dari config)")
+    lens.add_argument('--square-mm', type=float, default=None,
+                      help="Ukuran satu kotak papan catur dalam mm (default: dari config)")
+    lens.add_argument('--video-stride', type=int, default=15,
+                      help="Ambil satu frame setiap N frame video")
+    
+    serve = subparsers.add_parser('serve', help="Layanan HTTP/WebSocket lokal untuk aplikasi lain (gambar atau landmark)")
+    serve.add_argument('--host', default=None,
+                       help="Alamat bind (default: service.host)")
+    serve.add_argument('--port', type=int, default=None,
+                       help="Port (default: service.port)")
+    serve.add_argument('-w', '--workers', type=int, default=None,
+                       help="Jumlah worker HandDetector (default: service.workers)")
+    
+    return parser.parse_args(argv)
+
+def print_startup_report(config, force=False):
+    if force or config.get('profiling', {}).get('startup_report', False):
+        print("\nStartup:")
+        print(startup.format())
 
-def main():
-    # Load configuration
-    config = load_config()
+def run_batch_command(args, config, startup_report=False):
+    from src.batch.batch_runner import run_batch
+    startup.finish('imports')
+    print_startup_report(config, startup_report)
+    run_batch(config, args.inputs, args.output,
+              workers=args.workers,
+              reference_pixels=args.reference_pixels,
+              mirror=args.mirror,
+              chunk_frames=args.chunk_frames)
+
+def run_replay_command(args, config, startup_report=False):
+    from src.batch.replay_runner import run_replay
+    startup.finish('imports')
+    print_startup_report(config, startup_report)
+    run_replay(config, args.inputs, args.output,
+               reference_pixels=args.reference_pixels,
+               show=args.show)
+
+def run_multi_command(args, config, startup_report=False):
+    from src.pipeline.multi_source import run_multi_source
+    from src.profiling.metrics import metrics
+    startup.finish('imports')
+    print_startup_report(config, startup_report)
+    metrics.configure(config.get('profiling', {}))
+    run_multi_source(config, args.source, workers=args.workers, preview=args.preview)
+
+def run_lens_command(args, config, startup_report=False):
+    from src.batch.lens_runner import run_lens_calibration
+    startup.finish('imports')
+    print_startup_report(config, startup_report)
+    pattern = tuple(int(n) for n in args.pattern.lower().split('x')) if args.pattern else None
+    run_lens_calibration(config, args.inputs, args.output,
+                         pattern=pattern,
+                         square_size_mm=args.square_mm,
+                         video_stride=args.video_stride)
+
+def run_serve_command(args, config, startup_report=False):
+    from src.service.http_server import run_service
+    from src.profiling.metrics import metrics
+    startup.finish('imports')
+    print_startup_report(config, startup_report)
+    metrics.configure(config.get('profiling', {}))
+    run_service(config, host=args.host, port=args.port, workers=args.workers)
+
+def main(config, profile_name=None, startup_report=False):
+    import cv2
+    from src.detector.hand_detector import HandDetector
+    from src.detector.calibration import Calibrator
+    from src.detector.card_detector import CardDetector
+    from src.detector.calibration_store import CalibrationStore, profile_key
+    from src.detector.hand_tracker import HandTracker
+    from src.measurement.dimension_calculator import DimensionCalculator
+    from src.visualization.drawer import Drawer
+    from src.pipeline.frame_pipeline import FramePipeline
+    from src.pipeline.frame_pool import FramePool
+    from src.pipeline.latency_controller import LatencyController
+    from src.pipeline.presence_gate import PresenceGate
+    from src.profiling.metrics import metrics, MetricsExporter
+    from src.export.measurement_sink import MeasurementSink
+    from src.measurement.session_aggregator import SessionAggregator
+    from src.detector.landmark_recording import LandmarkRecorder
+    from src.detector.lens_model import LensModel
+    startup.mark('imports')
+    
+    # Profiling per tahap
+    profiling = config.get('profiling', {})
+    metrics.configure(profiling)
+    exporter = MetricsExporter(metrics, profiling)
+    show_hud = metrics.enabled and profiling.get('hud', False)
+    hud_snapshot = None
+    next_hud_update = 0.0
     
     # Initialize components
-    detector = HandDetector(config)
+    recorder = LandmarkRecorder.from_config(config, (config['camera']['width'], config['camera']['height']))
+    detector = HandDetector(config, recorder=recorder)
+    if recorder is not None:
+        print(f"Merekam landmark ke {recorder.path}")
     calibrator = Calibrator()
-    calculator = DimensionCalculator(calibrator)
+    # Model lensa: koreksi distorsi hanya pada koordinat landmark dan sudut kartu
+    lens = LensModel.from_config(config, mirrored=True)
+    if lens is not None and not lens.matches((config['camera']['width'], config['camera']['height'])):
+        print(f"Warning: Model lensa {lens.image_size} tidak cocok dengan resolusi kamera, "
+              f"jalankan ulang 'main.py lens'")
+        lens = None
+    elif lens is not None:
+        print(f"Model lensa dimuat: {lens.describe()}")
+    calculator = DimensionCalculator(calibrator, config, lens=lens)
     drawer = Drawer(config, calibrator)  # Fixed: Added calibrator parameter
+    card_detector = CardDetector(config, lens=lens)
+    fallback_to_guide = config.get('card_detection', {}).get('fallback_to_guide', True)
+    
+    # Profil kalibrasi per kamera + resolusi: warm start tanpa kalibrasi ulang
+    calibration_config = config.get('calibration', {})
+    camera_device = config['camera'].get('device', 0)
+    profile_store = CalibrationStore.from_config(config)
+    store_key = profile_key(camera_device, config['camera']['width'], config['camera']['height'])
+    auto_save = calibration_config.get('auto_save', True)
+    active_profile = None
+    if profile_name or calibration_config.get('auto_load', True):
+        active_profile = load_calibration_profile(profile_store, store_key, calibrator, profile_name)
+        if active_profile is None and profile_name:
+            print(f"Warning: Profil kalibrasi '{profile_name}' tidak ditemukan untuk {store_key}")
+    
+    startup.mark('components')
     
     # Initialize camera
-    cap = cv2.VideoCapture(0)
+    cap = cv2.VideoCapture(camera_device)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, config['camera']['width'])
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config['camera']['height'])
     cap.set(cv2.CAP_PROP_FPS, config['camera']['fps'])
+    startup.mark('camera')
     
     print("\n=== Hand Measurement System ===")
     print("Instructions:")
@@ -40,56 +253,143 @@ def main():
     print("2. Tahan kartu kredit atau ID card secara horizontal")
     print("3. Tekan 'c' untuk kalibrasi menggunakan kartu")
     print("4. Setelah kalibrasi, tunjukkan tangan untuk pengukuran")
-    print("5. Tekan 'q' untuk keluar\n")
+    print("5. Tekan 's' untuk menyimpan kalibrasi sebagai profil baru, 'p' untuk ganti profil")
+    print("6. Tekan 'i' untuk statistik pipeline")
+    print("7. Tekan 'q' untuk keluar\n")
+    if calculator.distance.enabled:
+        if calculator.distance.reference == 'palm':
+            print("Estimasi jarak aktif: tunjukkan tangan pada jarak kalibrasi dulu, setelah itu tangan boleh maju/mundur\n")
+        else:
+            print("Estimasi jarak aktif: jarak tangan dihitung dari world landmarks MediaPipe\n")
     
-    while cap.isOpened():
-        success, frame = cap.read()
-        if not success:
-            break
+    # Capture dan inferensi berjalan di thread terpisah, render di main thread
+    controller = LatencyController(config)
+    sink = MeasurementSink.from_config(config)
+    aggregator = SessionAggregator(config) if config.get('session', {}).get('enabled', False) else None
+    presence_gate = PresenceGate(config)
+    if sink is not None:
+        sink.start()
+    pipeline = FramePipeline(cap, detector, calculator,
+                             queue_size=config['pipeline']['queue_size'],
+                             controller=controller,
+                             tracker=HandTracker(config),
+                             sink=sink,
+                             aggregator=aggregator,
+                             presence_gate=presence_gate if presence_gate.enabled else None,
+                             mirror_mode=config['pipeline'].get('mirror_mode', 'pixels'),
+                             frame_pool=FramePool() if config['pipeline'].get('frame_pool', False) else None)
+    multi_hand = config['detection']['max_num_hands'] > 1
+    pipeline.start()
+    if controller.enabled:
+        print(f"Titik operasi awal: {controller.describe()}")
+    
+    while pipeline.is_running():
+        packet = pipeline.get_result(timeout=0.1)
+        if packet is None:
+            continue
+        if not startup.done:
+            # Frame pertama mencakup pembuatan MediaPipe Hands (lazy) dan inferensi pertama
+            startup.finish('first_frame')
+            print_startup_report(config, startup_report)
             
-        # Flip frame horizontally for mirror effect
-        frame = cv2.flip(frame, 1)
-        
-        # Detect hands
-        results = detector.detect(frame)
-        
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Calculate dimensions if calibrated
-                dimensions = calculator.get_hand_dimensions(hand_landmarks)
+        frame = pipeline.display_frame(packet)
+        if card_detector.active:
+            # Deteksi kartu pada frame mentah, sebelum overlay digambar
+            measurement = card_detector.process(frame)
+            if measurement is not None:
+                if calibrate_from_card(calibrator, measurement, frame, fallback_to_guide) and auto_save:
+                    active_profile = profile_store.save(store_key, calibrator, active_profile)
+                    print(f"Profil kalibrasi '{active_profile}' disimpan ({store_key})")
                 
-                # Draw visualization with measurements if calibrated
-                frame = drawer.draw_frame(frame, hand_landmarks, dimensions)
+        draw_start = time.perf_counter()
+        # Urutkan berdasarkan ID agar posisi panel setiap tangan stabil
+        hands = sorted(packet.hands, key=lambda hand: hand[0])
+        overlays = []
+        for track_id, hand_landmarks, dimensions in hands:
+            title = f"PENGUKURAN TANGAN #{track_id}" if multi_hand else None
+            session = aggregator.get(track_id) if aggregator is not None else None
+            if session is not None and session.converged:
+                # Tampilkan hasil akhir sesi, bukan nilai per frame
+                dimensions = dict(dimensions, **session.means())
+                title = f"PENGUKURAN SELESAI #{track_id}" if multi_hand else "PENGUKURAN SELESAI"
+            overlays.append((hand_landmarks, dimensions, title))
+        # Draw visualization with measurements if calibrated (semua tangan dalam satu batch)
+        frame = drawer.draw_hands(frame, overlays)
         
-        # Show calibration status and distance reminder
-        status = calibrator.get_calibration_status()
-        if status['is_calibrated']:
-            cv2.putText(frame, "Calibrated", (1110, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            # Add distance reminder
-            cv2.putText(frame, "50cm", (1110, 60),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        else:
-            cv2.putText(frame, "Not Calibrated", (1050, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            # Add distance instruction
-            cv2.putText(frame, "Set 50cm", (1050, 60),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+        with metrics.timer('draw.status'):
+            # Jarak terestimasi tangan pertama (jika estimasi jarak aktif)
+            distance_cm = next((dimensions['distance_cm'] for _, _, dimensions in hands
+                                if dimensions and 'distance_cm' in dimensions), None)
+            draw_calibration_status(frame, calibrator, distance_cm)
+            if card_detector.active:
+                drawer.draw_card_detection(frame, card_detector)
+        if show_hud:
+            # Persentil dihitung ulang dua kali per detik, bukan setiap frame
+            if time.perf_counter() >= next_hud_update:
+                hud_snapshot = metrics.snapshot()
+                next_hud_update = time.perf_counter() + 0.5
+            drawer.draw_metrics_hud(frame, hud_snapshot)
+        draw_ms = (time.perf_counter() - draw_start) * 1000
+        metrics.record('draw', draw_ms)
         
         # Show frame
-        cv2.imshow('Hand Measurement System', frame)
+        with metrics.timer('imshow'):
+            cv2.imshow('Hand Measurement System', frame)
+        # imshow menyalin frame, buffer bisa langsung dipakai ulang oleh capture
+        pipeline.release(packet)
+        pipeline.mark_rendered(draw_ms)
+        metrics.tick_frame()
+        exporter.maybe_export()
         
-        key = cv2.waitKey(1) & 0xFF
+        with metrics.timer('waitkey'):
+            key = cv2.waitKey(1) & 0xFF
         if key == ord('q'):
             break
         elif key == ord('c'):
-            reference_pixels = calculate_object_pixels(frame)
-            if calibrator.calibrate(reference_pixels):
-                print("\nKalibrasi berhasil pada jarak 50cm!")
-                print("Anda dapat melanjutkan pengukuran tangan")
+            # Deteksi berjalan bertahap selama beberapa frame berikutnya
+            card_detector.start()
+            print("\nMendeteksi kartu di dalam kotak panduan...")
+        elif key == ord('s'):
+            if calibrator.is_calibrated:
+                active_profile = profile_store.save(store_key, calibrator, profile_store.new_name(store_key))
+                print(f"\nProfil kalibrasi '{active_profile}' disimpan ({store_key})")
+            else:
+                print("\nBelum terkalibrasi, tidak ada yang disimpan")
+        elif key == ord('p'):
+            # Ganti profil instan: state diterapkan langsung tanpa kalibrasi ulang
+            next_profile = profile_store.next_name(store_key, active_profile)
+            if next_profile is None:
+                print(f"\nBelum ada profil kalibrasi untuk {store_key}")
+            else:
+                active_profile = load_calibration_profile(profile_store, store_key, calibrator, next_profile)
+        elif key == ord('i'):
+            print("\nStatistik pipeline:")
+            print(pipeline.format_stats())
             
+    pipeline.stop()
+    detector.close()
+    if sink is not None:
+        sink.stop()
+    exporter.close()
+    print("\nStatistik pipeline:")
+    print(pipeline.format_stats())
     cap.release()
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    startup.mark('args')
+    config = load_config(args.config)
+    startup.mark('config')
+    if args.command == 'batch':
+        run_batch_command(args, config, args.startup_report)
+    elif args.command == 'replay':
+        run_replay_command(args, config, args.startup_report)
+    elif args.command == 'multi':
+        run_multi_command(args, config, args.startup_report)
+    elif args.command == 'lens':
+        run_lens_command(args, config, args.startup_report)
+    elif args.command == 'serve':
+        run_serve_command(args, config, args.startup_report)
+    else:
+        main(config, args.profile, args.startup_report)
\ No newline at end of file
@@ -0,0 +1,274 @@
+import multiprocessing
+import os
+import time
+import cv2
+from src.detector.hand_detector import HandDetector
+from src.detector.calibration import Calibrator
+from src.detector.hand_tracker import HandTracker
+from src.detector.lens_model import LensModel
+from src.measurement.dimension_calculator import DimensionCalculator
+from src.export.record_writer import dimensions_to_record, open_record_writer
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm', '.m4v')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+# Rasio kartu referensi terhadap lebar frame, sama dengan mode live
+REFERENCE_WIDTH_RATIO = 0.17
+
+# State per proses worker: satu HandDetector per mode MediaPipe
+_worker_state = {}
+
+
+class BatchJob:
+    """Satu shard pekerjaan: rentang frame video atau sekumpulan gambar"""
+
+    __slots__ = ('kind', 'source', 'paths', 'start_frame', 'end_frame')
+
+    def __init__(self, kind, source, paths=None, start_frame=0, end_frame=None):
+        self.kind = kind  # 'video' atau 'images'
+        self.source = source
+        self.paths = paths or []
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+
+
+def _video_frame_count(path):
+    cap = cv2.VideoCapture(path)
+    count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    return count
+
+
+def discover_jobs(inputs, chunk_frames=300, chunk_images=50):
+    """
+    Pecah input menjadi shard untuk process pool
+    Args:
+        inputs: Daftar file video, file gambar, atau folder gambar
+        chunk_frames: Jumlah frame video per shard (0 = satu shard per video)
+        chunk_images: Jumlah gambar per shard
+    """
+    jobs = []
+    loose_images = []
+
+    for path in inputs:
+        if os.path.isdir(path):
+            images = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            for i in range(0, len(images), chunk_images):
+                jobs.append(BatchJob('images', path, paths=images[i:i + chunk_images]))
+        elif path.lower().endswith(IMAGE_EXTENSIONS):
+            loose_images.append(path)
+        elif path.lower().endswith(VIDEO_EXTENSIONS):
+            frame_count = _video_frame_count(path)
+            if chunk_frames <= 0 or frame_count <= 0:
+                jobs.append(BatchJob('video', path))
+                continue
+            for start in range(0, frame_count, chunk_frames):
+                jobs.append(BatchJob('video', path, start_frame=start,
+                                     end_frame=min(start + chunk_frames, frame_count)))
+        else:
+            print(f"Warning: Input dilewati (format tidak dikenal): {path}")
+
+    for i in range(0, len(loose_images), chunk_images):
+        chunk = loose_images[i:i + chunk_images]
+        jobs.append(BatchJob('images', os.path.dirname(chunk[0]) or '.', paths=chunk))
+
+    return jobs
+
+
+def _init_worker(config, reference_pixels, mirror):
+    # Satu thread OpenCV per proses agar skala mendekati linear terhadap jumlah core
+    cv2.setNumThreads(1)
+    _worker_state['config'] = config
+    _worker_state['reference_pixels'] = reference_pixels
+    _worker_state['mirror'] = mirror
+    # Mode 'landmarks': frame tidak di-flip, koordinat landmark yang dicerminkan detektor
+    _worker_state['mirror_landmarks'] = mirror and config.get('pipeline', {}).get('mirror_mode') == 'landmarks'
+    _worker_state['detectors'] = {}
+    _worker_state['lens'] = LensModel.from_config(config, mirrored=mirror)
+
+
+def _create_detector(static_image_mode):
+    detector = HandDetector(_worker_state['config'], static_image_mode=static_image_mode)
+    detector.mirror_landmarks = _worker_state['mirror_landmarks']
+    return detector
+
+
+def _get_detector(static_image_mode):
+    """Detektor mode statis dipakai ulang per worker; tanpa state antar gambar"""
+    detectors = _worker_state['detectors']
+    if static_image_mode not in detectors:
+        detectors[static_image_mode] = _create_detector(static_image_mode)
+    return detectors[static_image_mode]
+
+
+def _create_calculator(frame_size, smoothing=None):
+    config = _worker_state['config']
+    frame_width = frame_size[0]
+    reference_pixels = _worker_state['reference_pixels']
+    if reference_pixels is None:
+        reference_pixels = int(frame_width * REFERENCE_WIDTH_RATIO)
+
+    calibrator = Calibrator()
+    calibrator.calibrate(reference_pixels, verbose=False)
+
+    if smoothing is not None:
+        config = dict(config, measurement=dict(config.get('measurement', {}), smoothing=smoothing),
+                      landmark_filter=dict(config.get('landmark_filter', {}), enabled=False))
+    # Model lensa hanya berlaku untuk frame dengan rasio aspek yang sama
+    lens = _worker_state['lens']
+    if lens is not None and not lens.matches(frame_size):
+        lens = None
+    calculator = DimensionCalculator(calibrator, config, lens=lens)
+    calculator.distance.frame_size = tuple(frame_size)
+    return calculator
+
+
+def _measure_frame(detector, calculator, tracker, frame, source, frame_index, timestamp_ms):
+    if _worker_state['mirror'] and not _worker_state['mirror_landmarks']:
+        # Frame milik pemanggil dan tidak dipakai lagi, flip in-place
+        cv2.flip(frame, 1, dst=frame)
+
+    results = detector.detect(frame)
+    hand_landmarks_list = list(results.multi_hand_landmarks or [])
+    handedness = [HandDetector.get_handedness(results, i) for i in range(len(hand_landmarks_list))]
+    track_ids, evicted = tracker.update(hand_landmarks_list, [label for label, _ in handedness])
+    for track_id in evicted:
+        calculator.drop_track(track_id)
+    calculator.landmark_filter.apply(hand_landmarks_list, track_ids,
+                                     None if timestamp_ms is None else timestamp_ms / 1000)
+
+    records = []
+    dimensions_list = calculator.get_multi_hand_dimensions(
+        hand_landmarks_list, track_ids, getattr(results, 'multi_hand_world_landmarks', None))
+    for hand_index, dimensions in enumerate(dimensions_list):
+        label, score = handedness[hand_index]
+        records.append(dimensions_to_record(
+            dimensions,
+            source=source,
+            frame_index=frame_index,
+            timestamp_ms=timestamp_ms,
+            hand_index=hand_index,
+            hand_id=track_ids[hand_index],
+            handedness=label,
+            handedness_score=score
+        ))
+    return records
+
+
+def _process_video(job):
+    # Detektor baru per shard: tracking MediaPipe dan ROI tidak boleh terbawa dari
+    # shard sebelumnya (video lain atau rentang frame yang tidak bersambung)
+    detector = _create_detector(static_image_mode=False)
+    try:
+        return _measure_video(detector, job)
+    finally:
+        detector.close()
+
+
+def _measure_video(detector, job):
+    cap = cv2.VideoCapture(job.source)
+    if job.start_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, job.start_frame)
+
+    calculator = None
+    tracker = HandTracker(_worker_state['config'])
+    records = []
+    frame_index = job.start_frame
+    frame = None
+    while job.end_frame is None or frame_index < job.end_frame:
+        # Frame berikutnya ditulis ke buffer frame sebelumnya
+        success, frame = cap.read(frame)
+        if not success:
+            break
+        if calculator is None:
+            calculator = _create_calculator((frame.shape[1], frame.shape[0]))
+
+        timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+        records.extend(_measure_frame(detector, calculator, tracker, frame,
+                                      job.source, frame_index, timestamp_ms))
+        frame_index += 1
+
+    cap.release()
+    return records, frame_index - job.start_frame
+
+
+def _process_images(job):
+    # Gambar tidak berurutan secara waktu: mode statis dan tanpa smoothing
+    detector = _get_detector(static_image_mode=True)
+    records = []
+    frames = 0
+    for path in job.paths:
+        frame = cv2.imread(path)
+        if frame is None:
+            print(f"Warning: Gambar tidak dapat dibaca: {path}")
+            continue
+        calculator = _create_calculator((frame.shape[1], frame.shape[0]), smoothing='none')
+        records.extend(_measure_frame(detector, calculator, HandTracker(), frame, path, 0, None))
+        frames += 1
+    return records, frames
+
+
+def _run_job(job):
+    start = time.perf_counter()
+    if job.kind == 'video':
+        records, frames = _process_video(job)
+    else:
+        records, frames = _process_images(job)
+    return records, frames, time.perf_counter() - start
+
+
+def run_batch(config, inputs, output_path, workers=None, reference_pixels=None,
+              mirror=False, chunk_frames=300, output_format=None):
+    """
+    Ukur semua input secara headless dengan process pool
+    Returns:
+        Dict ringkasan (frame, tangan, waktu, fps)
+    """
+    jobs = discover_jobs(inputs, chunk_frames=chunk_frames)
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs))) if jobs else 1
+
+    print(f"Batch: {len(jobs)} shard dari {len(inputs)} input, {workers} worker")
+
+    writer = open_record_writer(output_path, output_format)
+    total_frames = 0
+    total_records = 0
+    busy_seconds = 0.0
+    start = time.perf_counter()
+
+    # spawn: MediaPipe dan OpenCV tidak aman di-fork setelah thread berjalan
+    context = multiprocessing.get_context('spawn')
+    try:
+        with context.Pool(workers, initializer=_init_worker,
+                          initargs=(config, reference_pixels, mirror)) as pool:
+            for done, (records, frames, seconds) in enumerate(
+                    pool.imap_unordered(_run_job, jobs), start=1):
+                writer.write(records)
+                total_frames += frames
+                total_records += len(records)
+                busy_seconds += seconds
+                print(f"\r- Shard {done}/{len(jobs)}, {total_frames} frame", end='', flush=True)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        'jobs': len(jobs),
+        'workers': workers,
+        'frames': total_frames,
+        'hands': total_records,
+        'seconds': elapsed,
+        'fps': total_frames / elapsed if elapsed > 0 else 0.0,
+        'fps_per_worker': total_frames / busy_seconds if busy_seconds > 0 else 0.0
+    }
+
+    print(f"\n\nBatch selesai:")
+    print(f"- Frame diproses: {summary['frames']}")
+    print(f"- Tangan terukur: {summary['hands']}")
+    print(f"- Waktu: {summary['seconds']:.2f} s")
+    print(f"- Throughput: {summary['fps']:.1f} frame/s ({summary['fps_per_worker']:.1f} frame/s per worker)")
+    print(f"- Output: {output_path}")
+    return summary
@@ -0,0 +1,146 @@
+import os
+import cv2
+from src.batch.batch_runner import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
+from src.detector.lens_model import calibrate_lens, find_checkerboard
+
+
+def iter_calibration_frames(inputs, video_stride=15):
+    """
+    Frame papan catur dari file gambar, folder gambar, atau video
+    Yields:
+        (sumber, frame BGR)
+    """
+    for path in inputs:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    image_path = os.path.join(path, name)
+                    frame = cv2.imread(image_path)
+                    if frame is not None:
+                        yield image_path, frame
+        elif path.lower().endswith(IMAGE_EXTENSIONS):
+            frame = cv2.imread(path)
+            if frame is not None:
+                yield path, frame
+        elif path.lower().endswith(VIDEO_EXTENSIONS):
+            cap = cv2.VideoCapture(path)
+            index = 0
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if index % video_stride == 0:
+                    yield f"{path}#{index}", frame
+                index += 1
+            cap.release()
+        else:
+            print(f"Warning: Input dilewati (format tidak dikenal): {path}")
+
+
+def collect_from_files(inputs, pattern, video_stride=15):
+    """
+    Cari papan catur pada semua input
+    Returns:
+        (list sudut, ukuran frame)
+    """
+    corner_sets = []
+    image_size = None
+    for source, frame in iter_calibration_frames(inputs, video_stride):
+        size = (frame.shape[1], frame.shape[0])
+        if image_size is None:
+            image_size = size
+        elif size != image_size:
+            print(f"Warning: Resolusi berbeda dilewati ({size[0]}x{size[1]}): {source}")
+            continue
+        corners = find_checkerboard(frame, pattern)
+        if corners is not None:
+            corner_sets.append(corners)
+        print(f"- {source}: {'papan catur ditemukan' if corners is not None else 'tidak ditemukan'}")
+    return corner_sets, image_size
+
+
+def collect_from_camera(config, pattern, min_frames):
+    """
+    Ambil frame papan catur dari kamera live: spasi = simpan frame,
+    'c' = hitung kalibrasi, 'q' = batal. Frame disimpan tanpa flip (koordinat sensor).
+    Returns:
+        (list sudut, ukuran frame); list kosong jika dibatalkan
+    """
+    camera = config['camera']
+    cap = cv2.VideoCapture(camera.get('device', 0))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, camera['width'])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, camera['height'])
+
+    print("\n=== Kalibrasi Lensa ===")
+    print(f"1. Tunjukkan papan catur {pattern[0]}x{pattern[1]} sudut dalam ke kamera")
+    print("2. Variasikan posisi (tengah, sudut, tepi frame) dan kemiringan papan")
+    print("3. Tekan SPASI untuk menyimpan frame saat papan terdeteksi")
+    print(f"4. Tekan 'c' untuk menghitung kalibrasi (minimal {min_frames} frame), 'q' untuk batal\n")
+
+    corner_sets = []
+    image_size = None
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                print("Error: Tidak dapat membaca frame dari kamera")
+                return [], image_size
+            image_size = (frame.shape[1], frame.shape[0])
+            corners = find_checkerboard(frame, pattern)
+
+            view = frame.copy()
+            if corners is not None:
+                cv2.drawChessboardCorners(view, tuple(pattern), corners, True)
+            cv2.putText(view, f"Frame: {len(corner_sets)}/{min_frames}", (20, 40),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0) if corners is not None else (0, 0, 255), 2)
+            cv2.imshow('Lens Calibration', view)
+
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord('q'):
+                return [], image_size
+            if key == ord(' ') and corners is not None:
+                corner_sets.append(corners)
+                print(f"Frame {len(corner_sets)} disimpan")
+            elif key == ord('c'):
+                if len(corner_sets) >= min_frames:
+                    return corner_sets, image_size
+                print(f"Butuh minimal {min_frames} frame, baru {len(corner_sets)}")
+    finally:
+        cap.release()
+        cv2.destroyAllWindows()
+
+
+def run_lens_calibration(config, inputs=None, output_path=None, pattern=None, square_size_mm=None,
+                         video_stride=15):
+    """
+    Kalibrasi intrinsik kamera dari papan catur dan simpan model lensa
+    Args:
+        inputs: File/folder gambar atau video; kosong = ambil dari kamera live
+        output_path: Lokasi file model (default: lens.model_path)
+    Returns:
+        LensModel atau None jika gagal
+    """
+    lens_config = config.get('lens', {})
+    pattern = tuple(pattern or lens_config.get('pattern', (9, 6)))
+    square_size_mm = square_size_mm or lens_config.get('square_size_mm', 25.0)
+    min_frames = lens_config.get('min_frames', 10)
+    output_path = output_path or lens_config.get('model_path', 'data/lens_model.json')
+
+    if inputs:
+        corner_sets, image_size = collect_from_files(inputs, pattern, video_stride)
+    else:
+        corner_sets, image_size = collect_from_camera(config, pattern, min_frames)
+
+    if len(corner_sets) < min_frames:
+        print(f"Error: Papan catur hanya ditemukan pada {len(corner_sets)} frame "
+              f"(minimal {min_frames}), kalibrasi lensa dibatalkan")
+        return None
+
+    model = calibrate_lens(corner_sets, pattern, square_size_mm, image_size)
+    model.save(output_path)
+    print(f"\nKalibrasi lensa selesai ({len(corner_sets)} frame):")
+    print(f"- {model.describe()}")
+    print(f"- Disimpan ke {output_path}")
+    if model.rms is not None and model.rms > 1.0:
+        print("Warning: RMS reprojection error di atas 1 pixel, pertimbangkan mengambil ulang frame")
+    return model
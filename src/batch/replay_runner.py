@@ -0,0 +1,202 @@
+import os
+import time
+from src.detector.calibration import Calibrator
+from src.detector.calibration_store import CalibrationStore, profile_key
+from src.detector.hand_tracker import HandTracker
+from src.detector.landmark_recording import LandmarkRecording
+from src.detector.lens_model import LensModel
+from src.measurement.dimension_calculator import DimensionCalculator
+from src.measurement.session_aggregator import SessionAggregator
+from src.export.record_writer import dimensions_to_record, open_record_writer
+
+RECORDING_EXTENSION = '.hlr'
+
+# Rasio kartu referensi terhadap lebar frame, sama dengan mode live
+REFERENCE_WIDTH_RATIO = 0.17
+
+
+def discover_recordings(inputs):
+    """File .hlr dari daftar file dan folder"""
+    paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            paths.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.endswith(RECORDING_EXTENSION)))
+        elif path.endswith(RECORDING_EXTENSION):
+            paths.append(path)
+        else:
+            print(f"Warning: Input dilewati (bukan rekaman landmark): {path}")
+    return paths
+
+
+def create_calibrator(config, recording, reference_pixels=None):
+    """
+    Kalibrasi untuk replay: --reference-pixels, lalu profil kalibrasi aktif
+    untuk kamera di config, lalu 17% lebar frame rekaman
+    """
+    calibrator = Calibrator()
+    if reference_pixels is not None:
+        calibrator.calibrate(reference_pixels, verbose=False)
+        return calibrator
+
+    camera = config['camera']
+    store = CalibrationStore.from_config(config)
+    profile = store.load(profile_key(camera.get('device', 0), camera['width'], camera['height']))
+    if profile is not None:
+        calibrator.apply_profile(profile)
+        return calibrator
+
+    frame_size = recording.header.get('frame_size') or (camera['width'], camera['height'])
+    calibrator.calibrate(int(frame_size[0] * REFERENCE_WIDTH_RATIO), verbose=False)
+    return calibrator
+
+
+def create_lens(config, recording):
+    """Model lensa untuk rekaman; None jika tidak ada atau rasio aspek frame berbeda"""
+    lens = LensModel.from_config(config, mirrored=recording.header.get('mirrored', True))
+    frame_size = recording.header.get('frame_size')
+    if lens is not None and frame_size and not lens.matches(frame_size):
+        print(f"Warning: Model lensa {lens.image_size} tidak cocok dengan rekaman {tuple(frame_size)}, "
+              f"koreksi distorsi dilewati")
+        return None
+    return lens
+
+
+def replay_recording(config, recording, calibrator, writer=None, viewer=None):
+    """
+    Jalankan ulang tracker, kalkulator, dan agregator sesi pada satu rekaman
+    Returns:
+        (jumlah frame, jumlah record)
+    """
+    calculator = DimensionCalculator(calibrator, config, lens=create_lens(config, recording))
+    frame_size = recording.header.get('frame_size')
+    if frame_size:
+        calculator.distance.frame_size = tuple(frame_size)
+    tracker = HandTracker(config)
+    aggregator = SessionAggregator(dict(config, session=dict(config.get('session', {}), output_path=None)))
+    source = os.path.basename(recording.path)
+    total_records = 0
+    frames = 0
+
+    for frame_index, timestamp, results in recording.frames():
+        hand_landmarks_list = list(results.multi_hand_landmarks or [])
+        handedness = [(c.classification[0].label, c.classification[0].score)
+                      for c in (results.multi_handedness or [])]
+        track_ids, evicted = tracker.update(hand_landmarks_list, [label for label, _ in handedness])
+        for track_id in evicted:
+            calculator.drop_track(track_id)
+            aggregator.drop(track_id)
+        calculator.landmark_filter.apply(hand_landmarks_list, track_ids, timestamp)
+
+        dimensions_list = calculator.get_multi_hand_dimensions(hand_landmarks_list, track_ids)
+        records = []
+        for hand_index, (track_id, dimensions) in enumerate(zip(track_ids, dimensions_list)):
+            if not dimensions:
+                continue
+            label, score = handedness[hand_index] if hand_index < len(handedness) else (None, None)
+            records.append(dimensions_to_record(
+                dimensions,
+                source=source,
+                frame_index=frame_index,
+                timestamp_ms=timestamp * 1000,
+                hand_index=hand_index,
+                hand_id=track_id,
+                handedness=label,
+                handedness_score=score,
+                calibration_confidence=calibrator.confidence
+            ))
+        for session in aggregator.update(track_ids, dimensions_list, timestamp):
+            records.append(dict(session, source=source, timestamp_ms=session['finished_at'] * 1000,
+                                calibration_confidence=calibrator.confidence))
+
+        if writer is not None:
+            writer.write(records)
+        total_records += len(records)
+        frames += 1
+
+        if viewer is not None and not viewer(recording, calibrator, hand_landmarks_list,
+                                             track_ids, dimensions_list):
+            break
+
+    return frames, total_records
+
+
+def run_replay(config, inputs, output_path=None, reference_pixels=None, show=False, output_format=None):
+    """
+    Proses ulang rekaman landmark tanpa kamera maupun MediaPipe
+    Returns:
+        Dict ringkasan (rekaman, frame, record, waktu, fps)
+    """
+    paths = discover_recordings(inputs)
+    print(f"Replay: {len(paths)} rekaman")
+
+    writer = open_record_writer(output_path, output_format) if output_path else None
+    viewer = ReplayViewer(config) if show else None
+    total_frames = 0
+    total_records = 0
+    start = time.perf_counter()
+    try:
+        for path in paths:
+            recording = LandmarkRecording(path)
+            calibrator = create_calibrator(config, recording, reference_pixels)
+            frames, records = replay_recording(config, recording, calibrator, writer, viewer)
+            total_frames += frames
+            total_records += records
+            print(f"- {path}: {frames} frame, {records} record")
+            if viewer is not None and viewer.stopped:
+                break
+    finally:
+        if writer is not None:
+            writer.close()
+        if viewer is not None:
+            viewer.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        'recordings': len(paths),
+        'frames': total_frames,
+        'records': total_records,
+        'seconds': elapsed,
+        'fps': total_frames / elapsed if elapsed > 0 else 0.0
+    }
+    print(f"\nReplay selesai: {total_frames} frame dalam {elapsed:.2f} s ({summary['fps']:.0f} frame/s)")
+    if output_path:
+        print(f"- Output: {output_path}")
+    return summary
+
+
+class ReplayViewer:
+    """Tampilkan landmark rekaman dengan Drawer di atas kanvas kosong"""
+
+    def __init__(self, config):
+        from src.visualization.drawer import Drawer
+        self.config = config
+        self.drawer = Drawer(config, Calibrator())
+        self.stopped = False
+        self._canvas = None  # Dipakai ulang setiap frame, dikosongkan dengan fill
+
+    def __call__(self, recording, calibrator, hand_landmarks_list, track_ids, dimensions_list):
+        import cv2
+        import numpy as np
+
+        width, height = recording.header.get('frame_size') or (
+            self.config['camera']['width'], self.config['camera']['height'])
+        if self._canvas is None or self._canvas.shape != (height, width, 3):
+            self._canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        frame = self._canvas
+        frame.fill(0)
+        self.drawer.calibrator = calibrator
+
+        hands = sorted(zip(track_ids, hand_landmarks_list, dimensions_list), key=lambda hand: hand[0])
+        # ReplayLandmarks bisa langsung digambar: Drawer hanya membaca .landmark
+        self.drawer.draw_hands(frame, [(hand_landmarks, dimensions or {}, f"PENGUKURAN TANGAN #{track_id}")
+                                       for track_id, hand_landmarks, dimensions in hands])
+
+        cv2.imshow('Hand Measurement Replay', frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            self.stopped = True
+        return not self.stopped
+
+    def close(self):
+        import cv2
+        cv2.destroyAllWindows()
@@ -1,3 +1,5 @@
+import numpy as np
+
 class Calibrator:
     def __init__(self):
         self.pixel_to_cm_ratio = None
@@ -6,13 +8,16 @@ class Calibrator:
         self.last_reference_pixels = None
         self.camera_distance_cm = 50  # Jarak tetap kamera ke objek
         self.focal_length = None      # Focal length kamera (akan dihitung saat kalibrasi)
+        self.confidence = None        # Confidence deteksi kartu (None jika pixel dimasukkan manual)
         
-    def calibrate(self, reference_pixels, reference_cm=None):
+    def calibrate(self, reference_pixels, reference_cm=None, verbose=True, confidence=None):
         """
         Kalibrasi menggunakan objek referensi dengan jarak tetap
         Args:
             reference_pixels: Panjang dalam pixel
             reference_cm: Panjang dalam cm (opsional, default menggunakan kartu standar)
+            verbose: Cetak ringkasan kalibrasi
+            confidence: Confidence pengukuran pixel 0-1 (opsional, dari CardDetector)
         """
         if reference_cm is None:
             reference_cm = self.reference_object_length_cm
@@ -23,6 +28,7 @@ class Calibrator:
             
         # Simpan referensi pixel terakhir
         self.last_reference_pixels = reference_pixels
+        self.confidence = confidence
         
         # Hitung focal length menggunakan rumus: F = (P x D) / W
         # Dimana: F = focal length, P = ukuran dalam pixel, D = jarak ke objek, W = ukuran sebenarnya
@@ -36,12 +42,17 @@ class Calibrator:
         
         self.is_calibrated = True
         
+        if not verbose:
+            return True
+            
         print(f"Kalibrasi selesai:")
         print(f"- Reference pixels: {reference_pixels}")
         print(f"- Reference cm: {reference_cm}")
         print(f"- Camera distance: {self.camera_distance_cm} cm")
         print(f"- Focal length: {self.focal_length:.2f}")
         print(f"- Ratio: 1 pixel = {self.pixel_to_cm_ratio:.6f} cm at {self.camera_distance_cm}cm distance")
+        if confidence is not None:
+            print(f"- Confidence: {confidence:.2f}")
         return True
         
     def pixels_to_cm(self, pixels, distance_cm=None):
@@ -70,6 +81,48 @@ class Calibrator:
         actual_cm = (pixels * distance_cm) / self.focal_length
         return float(actual_cm)
         
+    def pixels_to_cm_array(self, pixels, distance_cm=None):
+        """
+        Versi vektor dari pixels_to_cm untuk array NumPy
+        Args:
+            pixels: Array ukuran dalam pixel
+            distance_cm: Jarak aktual ke objek (opsional, default menggunakan jarak tetap)
+        """
+        if not self.is_calibrated:
+            return np.zeros(np.shape(pixels))
+            
+        if distance_cm is None:
+            distance_cm = self.camera_distance_cm
+            
+        return np.asarray(pixels, dtype=np.float64) * distance_cm / self.focal_length
+        
+    def to_profile(self):
+        """State kalibrasi sebagai dict untuk disimpan (None jika belum terkalibrasi)"""
+        if not self.is_calibrated:
+            return None
+        return {
+            'reference_pixels': float(self.last_reference_pixels),
+            'reference_cm': self.reference_object_length_cm,
+            'camera_distance_cm': self.camera_distance_cm,
+            'focal_length': self.focal_length,
+            'pixel_to_cm_ratio': self.pixel_to_cm_ratio,
+            'confidence': self.confidence
+        }
+        
+    def apply_profile(self, profile):
+        """
+        Pulihkan state dari profil tersimpan tanpa menghitung ulang
+        Args:
+            profile: Dict dari to_profile()
+        """
+        self.last_reference_pixels = profile['reference_pixels']
+        self.reference_object_length_cm = profile.get('reference_cm', self.reference_object_length_cm)
+        self.camera_distance_cm = profile.get('camera_distance_cm', self.camera_distance_cm)
+        self.focal_length = profile['focal_length']
+        self.pixel_to_cm_ratio = profile['pixel_to_cm_ratio']
+        self.confidence = profile.get('confidence')
+        self.is_calibrated = True
+        
     def get_calibration_status(self):
         """
         Mendapatkan status kalibrasi saat ini
@@ -80,5 +133,6 @@ class Calibrator:
             'last_reference_pixels': self.last_reference_pixels,
             'reference_cm': self.reference_object_length_cm,
             'camera_distance': self.camera_distance_cm,
-            'focal_length': self.focal_length
+            'focal_length': self.focal_length,
+            'confidence': self.confidence
         }
\ No newline at end of file
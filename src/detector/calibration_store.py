@@ -0,0 +1,129 @@
+import json
+import os
+import time
+
+STORE_VERSION = 1
+DEFAULT_PROFILE = 'default'
+
+
+def profile_key(device, width, height):
+    """Kunci profil: kamera dan resolusi dari config.yaml, mis. '0@1920x1080'"""
+    return f"{device}@{width}x{height}"
+
+
+class CalibrationStore:
+    """
+    Profil kalibrasi tersimpan dalam satu file JSON lokal, dikelompokkan per
+    kamera + resolusi. File baru dibaca saat pertama kali dibutuhkan.
+    Resolusi termasuk dalam kunci, sehingga profil otomatis tidak berlaku
+    lagi ketika resolusi di config.yaml diubah.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._data = None
+
+    @classmethod
+    def from_config(cls, config):
+        calibration = config.get('calibration', {})
+        return cls(calibration.get('profile_path', 'data/calibration_profiles.json'))
+
+    def _load(self):
+        if self._data is not None:
+            return self._data
+
+        self._data = {'version': STORE_VERSION, 'active': {}, 'profiles': {}}
+        if not os.path.exists(self.path):
+            return self._data
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Profil kalibrasi tidak dapat dibaca ({self.path}): {e}")
+            return self._data
+
+        if data.get('version') != STORE_VERSION:
+            print(f"Warning: Versi file profil kalibrasi tidak dikenal, diabaikan: {self.path}")
+            return self._data
+
+        self._data['active'] = data.get('active', {})
+        self._data['profiles'] = data.get('profiles', {})
+        return self._data
+
+    def _write(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Tulis ke file sementara lalu rename agar file tidak pernah setengah tertulis
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def names(self, key):
+        """Nama semua profil untuk kunci ini, urut sesuai pertama kali disimpan"""
+        return list(self._load()['profiles'].get(key, {}))
+
+    def active_name(self, key):
+        return self._load()['active'].get(key)
+
+    def load(self, key, name=None):
+        """
+        Ambil profil tersimpan
+        Args:
+            key: Kunci dari profile_key()
+            name: Nama profil (default: profil aktif terakhir)
+        Returns:
+            Dict profil atau None
+        """
+        data = self._load()
+        name = name or data['active'].get(key)
+        profile = data['profiles'].get(key, {}).get(name)
+        if profile is not None and data['active'].get(key) != name:
+            # Profil yang dipilih menjadi profil awal pada start berikutnya
+            data['active'][key] = name
+            self._write()
+        return profile
+
+    def save(self, key, calibrator, name=None):
+        """Simpan state Calibrator sebagai profil dan jadikan profil aktif"""
+        profile = calibrator.to_profile()
+        if profile is None:
+            return None
+
+        data = self._load()
+        name = name or data['active'].get(key) or DEFAULT_PROFILE
+        profile['saved_at'] = time.time()
+        data['profiles'].setdefault(key, {})[name] = profile
+        data['active'][key] = name
+        self._write()
+        return name
+
+    def next_name(self, key, current=None):
+        """Profil berikutnya setelah current (berputar), atau None jika tidak ada"""
+        names = self.names(key)
+        if not names:
+            return None
+        if current not in names:
+            return names[0]
+        return names[(names.index(current) + 1) % len(names)]
+
+    def new_name(self, key):
+        """Nama unik untuk profil baru: profil-2, profil-3, ..."""
+        names = set(self.names(key))
+        index = len(names) + 1
+        while f"profil-{index}" in names:
+            index += 1
+        return f"profil-{index}"
+
+    def delete(self, key, name):
+        data = self._load()
+        profiles = data['profiles'].get(key, {})
+        if name not in profiles:
+            return False
+        del profiles[name]
+        if data['active'].get(key) == name:
+            data['active'].pop(key)
+        self._write()
+        return True
@@ -0,0 +1,226 @@
+import cv2
+import numpy as np
+from src.profiling.metrics import metrics
+
+# Kartu ID-1 (ISO/IEC 7810): kartu kredit, KTP, SIM
+CARD_LENGTH_MM = 85.60
+CARD_WIDTH_MM = 53.98
+CARD_ASPECT = CARD_LENGTH_MM / CARD_WIDTH_MM
+
+# Kotak panduan kalibrasi: 17% lebar frame dengan rasio kartu
+TARGET_WIDTH_RATIO = 0.17
+TARGET_HEIGHT_RATIO = 0.63
+
+# Titik sampel per sisi untuk mengecek dukungan tepi (edge support)
+EDGE_SAMPLES = 24
+
+
+def calibration_target_rect(width, height):
+    """
+    Kotak target kartu di tengah frame, dipakai bersama oleh Drawer dan CardDetector
+    Returns:
+        (x1, y1, x2, y2)
+    """
+    center_x = width // 2
+    card_width = int(width * TARGET_WIDTH_RATIO)
+    card_height = int(card_width * TARGET_HEIGHT_RATIO)
+    return (center_x - (card_width // 2), height // 2 - (card_height // 2),
+            center_x + (card_width // 2), height // 2 + (card_height // 2))
+
+
+def order_corners(points):
+    """
+    Urutkan 4 titik searah jarum jam dengan sisi panjang kartu sebagai sisi pertama
+    Args:
+        points: Array (4, 2)
+    Returns:
+        Array (4, 2) float32
+    """
+    points = np.asarray(points, dtype=np.float32).reshape(4, 2)
+    sums = points.sum(axis=1)
+    diffs = points[:, 1] - points[:, 0]
+    ordered = np.array([
+        points[np.argmin(sums)],   # kiri atas
+        points[np.argmin(diffs)],  # kanan atas
+        points[np.argmax(sums)],   # kanan bawah
+        points[np.argmax(diffs)]   # kiri bawah
+    ], dtype=np.float32)
+
+    # Kartu dipegang vertikal: geser urutan agar sisi pertama tetap sisi panjang
+    if np.linalg.norm(ordered[1] - ordered[0]) < np.linalg.norm(ordered[3] - ordered[0]):
+        ordered = np.roll(ordered, -1, axis=0)
+    return ordered
+
+
+def card_length_pixels(corners):
+    """
+    Panjang kartu dalam pixel diukur sepanjang garis tengah melalui homografi
+    bidang kartu -> gambar, sehingga kemiringan kecil tidak membiaskan hasil
+    """
+    canonical = np.float32([[0, 0], [CARD_LENGTH_MM, 0],
+                            [CARD_LENGTH_MM, CARD_WIDTH_MM], [0, CARD_WIDTH_MM]])
+    homography = cv2.getPerspectiveTransform(canonical, np.float32(corners))
+    midline = np.float32([[[0, CARD_WIDTH_MM / 2], [CARD_LENGTH_MM, CARD_WIDTH_MM / 2]]])
+    start, end = cv2.perspectiveTransform(midline, homography)[0]
+    return float(np.linalg.norm(end - start))
+
+
+class CardMeasurement:
+    """Hasil satu sesi deteksi kartu"""
+
+    __slots__ = ('found', 'length_px', 'confidence', 'samples', 'frames')
+
+    def __init__(self, found, length_px, confidence, samples, frames):
+        self.found = found
+        self.length_px = length_px
+        self.confidence = confidence
+        self.samples = samples
+        self.frames = frames
+
+
+class CardDetector:
+    """
+    Deteksi kartu ID-1 di sekitar kotak panduan (tepi -> kontur -> segiempat),
+    dijalankan bertahap: satu frame ter-downscale per iterasi loop live
+    """
+
+    def __init__(self, config=None, lens=None):
+        card = (config or {}).get('card_detection', {})
+        self.lens = lens  # LensModel opsional: panjang kartu diukur pada sudut terkoreksi distorsi
+        self.search_margin = card.get('search_margin', 1.0)
+        self.max_size = card.get('max_size', 320)
+        self.required_samples = card.get('required_samples', 5)
+        self.max_frames = card.get('max_frames', 45)
+        self.aspect_tolerance = card.get('aspect_tolerance', 0.15)
+        self.min_area_ratio = card.get('min_area_ratio', 0.25)
+        self.max_area_ratio = card.get('max_area_ratio', 4.0)
+        self.max_spread = card.get('max_spread', 0.03)
+        self.min_confidence = card.get('min_confidence', 0.5)
+
+        self.active = False
+        self.frames = 0
+        self.samples = []  # List of (length_px, skor frame)
+        self.last_corners = None  # Sudut kartu terakhir dalam koordinat frame
+
+    def start(self):
+        """Mulai sesi deteksi baru"""
+        self.active = True
+        self.frames = 0
+        self.samples = []
+        self.last_corners = None
+
+    def process(self, frame):
+        """
+        Proses satu frame dari sesi yang sedang berjalan
+        Returns:
+            CardMeasurement saat sesi selesai, selain itu None
+        """
+        if not self.active:
+            return None
+
+        self.frames += 1
+        with metrics.timer('calibration.card'):
+            detection = self.detect(frame)
+
+        if detection is None:
+            self.last_corners = None
+        else:
+            self.last_corners, length_px, score = detection
+            self.samples.append((length_px, score))
+
+        if len(self.samples) >= self.required_samples or self.frames >= self.max_frames:
+            self.active = False
+            return self._finish()
+        return None
+
+    def _finish(self):
+        if not self.samples:
+            return CardMeasurement(False, None, 0.0, 0, self.frames)
+
+        lengths = np.array([length for length, _ in self.samples])
+        scores = np.array([score for _, score in self.samples])
+        length_px = float(np.median(lengths))
+
+        # Confidence: kualitas segiempat x kestabilan antar frame x kelengkapan sampel
+        spread = float(np.median(np.abs(lengths - length_px))) / length_px
+        stability = max(0.0, 1.0 - spread / self.max_spread)
+        coverage = min(1.0, len(self.samples) / self.required_samples)
+        confidence = float(scores.mean()) * stability * coverage
+
+        return CardMeasurement(confidence >= self.min_confidence, length_px, confidence,
+                               len(self.samples), self.frames)
+
+    def detect(self, frame):
+        """
+        Cari kartu pada satu frame
+        Returns:
+            (corners (4, 2) koordinat frame, panjang pixel, skor 0-1) atau None
+        """
+        height, width = frame.shape[:2]
+        x1, y1, x2, y2 = calibration_target_rect(width, height)
+        margin_x = int((x2 - x1) * self.search_margin)
+        margin_y = int((y2 - y1) * self.search_margin)
+        roi_x1, roi_y1 = max(0, x1 - margin_x), max(0, y1 - margin_y)
+        roi_x2, roi_y2 = min(width, x2 + margin_x), min(height, y2 + margin_y)
+
+        gray = cv2.cvtColor(frame[roi_y1:roi_y2, roi_x1:roi_x2], cv2.COLOR_BGR2GRAY)
+        scale = min(1.0, self.max_size / max(gray.shape))
+        small = gray
+        if scale < 1.0:
+            small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        small = cv2.GaussianBlur(small, (5, 5), 0)
+        edges = cv2.dilate(cv2.Canny(small, 50, 150), None)
+        contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+        target_area = (x2 - x1) * (y2 - y1) * scale * scale
+        best = None
+        for contour in contours:
+            area = cv2.contourArea(contour)
+            if not target_area * self.min_area_ratio <= area <= target_area * self.max_area_ratio:
+                continue
+            quad = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+            if len(quad) != 4 or not cv2.isContourConvex(quad):
+                continue
+            corners = order_corners(quad)
+            score = self._score_quad(corners, edges)
+            if score > 0 and (best is None or score > best[0]):
+                best = (score, corners)
+
+        if best is None:
+            return None
+
+        # Perhalus sudut pada resolusi penuh (subpixel)
+        score, corners = best
+        corners = (corners / scale).reshape(-1, 1, 2).astype(np.float32)
+        window = max(3, int(round(1.5 / scale)) + 2)
+        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.01)
+        cv2.cornerSubPix(gray, corners, (window, window), (-1, -1), criteria)
+
+        corners = corners.reshape(4, 2) + np.float32([roi_x1, roi_y1])
+        measured = corners if self.lens is None else self.lens.undistort_pixels(corners, (width, height))
+        return corners, card_length_pixels(measured), score
+
+    def _score_quad(self, corners, edges):
+        """Skor 0-1 dari kecocokan rasio sisi, kesejajaran sisi, dan dukungan tepi"""
+        sides = np.linalg.norm(np.roll(corners, -1, axis=0) - corners, axis=1)
+        if sides.min() <= 0:
+            return 0.0
+
+        aspect = (sides[0] + sides[2]) / (sides[1] + sides[3])
+        aspect_error = abs(aspect / CARD_ASPECT - 1.0)
+        if aspect_error > self.aspect_tolerance:
+            return 0.0
+
+        parallel = (min(sides[0], sides[2]) / max(sides[0], sides[2]) *
+                    min(sides[1], sides[3]) / max(sides[1], sides[3]))
+
+        # Fraksi titik di sepanjang sisi segiempat yang jatuh pada tepi Canny
+        t = np.linspace(0.1, 0.9, EDGE_SAMPLES, dtype=np.float32)[:, None]
+        points = np.concatenate([corners[i] + t * (corners[(i + 1) % 4] - corners[i])
+                                 for i in range(4)])
+        xs = np.clip(np.round(points[:, 0]).astype(int), 0, edges.shape[1] - 1)
+        ys = np.clip(np.round(points[:, 1]).astype(int), 0, edges.shape[0] - 1)
+        support = float(np.count_nonzero(edges[ys, xs])) / len(points)
+
+        return support * parallel * (1.0 - 0.5 * aspect_error / self.aspect_tolerance)
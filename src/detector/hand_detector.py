@@ -1,18 +1,224 @@
-import mediapipe as mp
 import cv2
 import numpy as np
+from src.profiling.metrics import metrics
+
+MIRRORED_LABELS = {'Left': 'Right', 'Right': 'Left'}
+
 
 class HandDetector:
-    def __init__(self, config):
+    def __init__(self, config, static_image_mode=None, recorder=None):
+        detection = config['detection']
+        if static_image_mode is None:
+            static_image_mode = detection.get('static_image_mode', False)
+
+        self.static_image_mode = static_image_mode
+        self.max_num_hands = detection['max_num_hands']
+        self.min_detection_confidence = detection['min_detection_confidence']
+        self.min_tracking_confidence = detection['min_tracking_confidence']
+        # 0: model landmark ringan (lebih cepat), 1: model penuh (lebih akurat)
+        self.model_complexity = detection.get('model_complexity', 1)
+        self.mp_hands = None
+        self._hands = None  # Dibuat saat frame pertama, lihat property hands
+
+        # ROI tracking: deteksi pada crop di sekitar tangan terakhir.
+        # Tidak dipakai pada mode statis karena setiap gambar berdiri sendiri.
+        self.roi_tracking = detection.get('roi_tracking', False) and not static_image_mode
+        self.roi_margin = detection.get('roi_margin', 0.3)
+        self.roi_max_size = detection.get('roi_max_size', 480)
+        self.roi_full_search_interval = detection.get('roi_full_search_interval', 30)
+        self._roi = None  # (x0, y0, x1, y1) dalam pixel frame penuh
+        self._frames_since_full_search = 0
+        # Graph crop terpisah dari graph frame penuh: prior tracking MediaPipe disimpan
+        # dalam koordinat gambar input sebelumnya, jadi tidak boleh berpindah geometri
+        self._roi_hands = None
+        self._roi_needs_reset = False
+        
+        # Skala resolusi inferensi (diatur oleh LatencyController)
+        self.inference_scale = 1.0
+        
+        # LandmarkRecorder opsional: setiap hasil deteksi ikut direkam
+        self.recorder = recorder
+        
+        # True jika frame tidak di-flip sebelum deteksi: hasil dicerminkan di
+        # ruang landmark agar sama dengan deteksi pada frame yang di-flip
+        self.mirror_landmarks = False
+        
+        # Buffer yang dipakai ulang untuk resize dan konversi warna
+        self._buffers = {}
+
+    @property
+    def hands(self):
+        """
+        MediaPipe Hands dibuat saat pertama dipakai: import MediaPipe dan
+        pemuatan model tidak menghambat startup atau proses yang tidak mendeteksi
+        """
+        if self._hands is None:
+            # Dengan ROI tracking, frame penuh hanya dipakai untuk mencari tangan: mode
+            # statis selalu menjalankan palm detection tanpa prior dari crop
+            self._hands = self._create_hands(self.static_image_mode or self.roi_tracking)
+        return self._hands
+
+    @property
+    def roi_hands(self):
+        """Graph mode video khusus crop ROI (lazy, seperti hands)"""
+        if self._roi_hands is None:
+            self._roi_hands = self._create_hands(False)
+        return self._roi_hands
+
+    def _create_hands(self, static_image_mode):
+        import mediapipe as mp
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=config['detection']['max_num_hands'],
-            min_detection_confidence=config['detection']['min_detection_confidence'],
-            min_tracking_confidence=config['detection']['min_tracking_confidence']
+        return self.mp_hands.Hands(
+            static_image_mode=static_image_mode,
+            max_num_hands=self.max_num_hands,
+            model_complexity=self.model_complexity,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
         )
-        
-    def detect(self, frame):
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(frame_rgb)
-        return results
\ No newline at end of file
+
+    def reset_tracking(self):
+        """Lupakan ROI terakhir; deteksi berikutnya mencari di seluruh frame"""
+        self._roi = None
+        self._frames_since_full_search = 0
+        self._roi_needs_reset = True
+
+    def _buffer(self, name, shape):
+        """Buffer uint8 yang dipakai ulang selama ukurannya sama (hasil process disalin MediaPipe)"""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = self._buffers[name] = np.empty(shape, dtype=np.uint8)
+        return buffer
+
+    def _process(self, frame_bgr, scale=1.0, hands=None):
+        with metrics.timer('convert'):
+            # Koordinat landmark ternormalisasi, jadi tidak perlu dipetakan ulang
+            if scale < 1.0:
+                height, width = frame_bgr.shape[:2]
+                size = (max(1, int(width * scale)), max(1, int(height * scale)))
+                frame_bgr = cv2.resize(frame_bgr, size, dst=self._buffer('resize', (size[1], size[0], 3)),
+                                       interpolation=cv2.INTER_AREA)
+            frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=self._buffer('rgb', frame_bgr.shape))
+        with metrics.timer('hands_process'):
+            return (hands or self.hands).process(frame_rgb)
+
+    def detect(self, frame, frame_index=None, timestamp=None):
+        """
+        Deteksi tangan pada satu frame BGR
+        Args:
+            frame_index, timestamp: Dicatat ke rekaman landmark jika recorder aktif
+        """
+        results = self._detect(frame)
+        if self.mirror_landmarks:
+            self._mirror_results(results)
+        if self.recorder is not None:
+            self.recorder.write(results, frame_index, timestamp)
+        return results
+
+    def close(self):
+        if self.recorder is not None:
+            self.recorder.close()
+        if self._hands is not None:
+            self._hands.close()
+            self._hands = None
+        if self._roi_hands is not None:
+            self._roi_hands.close()
+            self._roi_hands = None
+
+    def _detect(self, frame):
+        if not self.roi_tracking:
+            return self._process(frame, self.inference_scale)
+
+        if self._roi is not None and not self._needs_full_search():
+            results = self._detect_roi(frame)
+            if results.multi_hand_landmarks:
+                self._frames_since_full_search += 1
+                self._update_roi(results, frame.shape)
+                return results
+            # Tracking hilang: cari ulang di seluruh frame
+            self._roi = None
+
+        results = self._process(frame, self.inference_scale)
+        self._frames_since_full_search = 0
+        self._update_roi(results, frame.shape)
+        # ROI baru dari pencarian: prior graph crop berasal dari crop lama
+        self._roi_needs_reset = True
+        return results
+
+    def _needs_full_search(self):
+        """Pencarian berkala di seluruh frame jika masih bisa ada tangan lain"""
+        if self.max_num_hands <= 1 or self.roi_full_search_interval <= 0:
+            return False
+        return self._frames_since_full_search >= self.roi_full_search_interval
+
+    def _detect_roi(self, frame):
+        """Deteksi pada crop ROI yang diperkecil, lalu petakan kembali ke frame penuh"""
+        height, width = frame.shape[:2]
+        x0, y0, x1, y1 = self._roi
+        crop = frame[y0:y1, x0:x1]
+        crop_w = x1 - x0
+        crop_h = y1 - y0
+
+        # Downscale sebelum konversi warna agar biaya mengikuti ukuran tangan
+        scale = self.roi_max_size * self.inference_scale / max(crop_w, crop_h)
+        if self._roi_needs_reset:
+            self.roi_hands.reset()
+            self._roi_needs_reset = False
+        results = self._process(crop, scale, self.roi_hands)
+        if results.multi_hand_landmarks:
+            sx = crop_w / width
+            sy = crop_h / height
+            ox = x0 / width
+            oy = y0 / height
+            for hand_landmarks in results.multi_hand_landmarks:
+                for lm in hand_landmarks.landmark:
+                    lm.x = lm.x * sx + ox
+                    lm.y = lm.y * sy + oy
+                    lm.z = lm.z * sx  # z memakai skala yang sama dengan x
+        return results
+
+    @staticmethod
+    def _mirror_results(results):
+        """
+        Cerminkan hasil deteksi secara horizontal (x -> 1 - x) dan tukar label
+        handedness, sama seperti deteksi pada frame yang di-flip
+        """
+        for hand_landmarks in results.multi_hand_landmarks or []:
+            for lm in hand_landmarks.landmark:
+                lm.x = 1.0 - lm.x
+        # World landmarks berpusat di tangan (meter)
+        for hand_world_landmarks in getattr(results, 'multi_hand_world_landmarks', None) or []:
+            for lm in hand_world_landmarks.landmark:
+                lm.x = -lm.x
+        for handedness in results.multi_handedness or []:
+            for classification in handedness.classification:
+                classification.label = MIRRORED_LABELS.get(classification.label, classification.label)
+
+    def _update_roi(self, results, frame_shape):
+        """Hitung ROI persegi di sekitar semua tangan yang terdeteksi"""
+        if not results.multi_hand_landmarks:
+            self._roi = None
+            return
+
+        height, width = frame_shape[:2]
+        xs = [lm.x for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        min_x, max_x = min(xs) * width, max(xs) * width
+        min_y, max_y = min(ys) * height, max(ys) * height
+
+        side = max(max_x - min_x, max_y - min_y) * (1 + 2 * self.roi_margin)
+        center_x = (min_x + max_x) / 2
+        center_y = (min_y + max_y) / 2
+
+        x0 = int(max(0, center_x - side / 2))
+        y0 = int(max(0, center_y - side / 2))
+        x1 = int(min(width, center_x + side / 2))
+        y1 = int(min(height, center_y + side / 2))
+        self._roi = (x0, y0, x1, y1) if x1 - x0 > 1 and y1 - y0 > 1 else None
+
+    @staticmethod
+    def get_handedness(results, hand_index):
+        """Label ('Left'/'Right') dan skor untuk tangan ke-hand_index"""
+        if not results.multi_handedness or hand_index >= len(results.multi_handedness):
+            return None, None
+        classification = results.multi_handedness[hand_index].classification[0]
+        return classification.label, classification.score
@@ -0,0 +1,93 @@
+class HandTrack:
+    __slots__ = ('track_id', 'label', 'centroid', 'missed', 'age')
+
+    def __init__(self, track_id, label, centroid):
+        self.track_id = track_id
+        self.label = label
+        self.centroid = centroid
+        self.missed = 0
+        self.age = 0
+
+
+class HandTracker:
+    """
+    Memberi ID stabil untuk setiap tangan berdasarkan handedness dan
+    asosiasi centroid terdekat antar frame
+    """
+
+    def __init__(self, config=None):
+        tracking = (config or {}).get('tracking', {})
+        self.max_distance = tracking.get('max_distance', 0.25)
+        self.max_missed_frames = tracking.get('max_missed_frames', 15)
+        self.handedness_penalty = tracking.get('handedness_penalty', 0.15)
+        self.tracks = {}
+        self._next_id = 1
+
+    @staticmethod
+    def centroid(hand_landmarks):
+        """Centroid (x, y) ternormalisasi dari semua landmark"""
+        landmarks = hand_landmarks.landmark
+        n = len(landmarks)
+        return (sum(lm.x for lm in landmarks) / n, sum(lm.y for lm in landmarks) / n)
+
+    def update(self, hand_landmarks_list, labels):
+        """
+        Cocokkan tangan di frame ini dengan track yang ada
+        Args:
+            hand_landmarks_list: Landmark setiap tangan yang terdeteksi
+            labels: Handedness setiap tangan ('Left'/'Right' atau None)
+        Returns:
+            (track_ids sesuai urutan input, list ID track yang dihapus)
+        """
+        centroids = [self.centroid(hand_landmarks) for hand_landmarks in hand_landmarks_list]
+
+        # Semua pasangan (biaya, indeks tangan, id track), dicocokkan serakah dari yang termurah
+        candidates = []
+        for i, (cx, cy) in enumerate(centroids):
+            for track in self.tracks.values():
+                tx, ty = track.centroid
+                cost = ((cx - tx) ** 2 + (cy - ty) ** 2) ** 0.5
+                if cost > self.max_distance:
+                    continue
+                if labels[i] is not None and track.label is not None and labels[i] != track.label:
+                    cost += self.handedness_penalty
+                candidates.append((cost, i, track.track_id))
+        candidates.sort()
+
+        track_ids = [None] * len(centroids)
+        matched_tracks = set()
+        for cost, i, track_id in candidates:
+            if track_ids[i] is not None or track_id in matched_tracks:
+                continue
+            track_ids[i] = track_id
+            matched_tracks.add(track_id)
+
+        for i, track_id in enumerate(track_ids):
+            if track_id is None:
+                track_id = self._next_id
+                self._next_id += 1
+                self.tracks[track_id] = HandTrack(track_id, labels[i], centroids[i])
+                track_ids[i] = track_id
+                matched_tracks.add(track_id)
+            track = self.tracks[track_id]
+            track.centroid = centroids[i]
+            track.label = labels[i] or track.label
+            track.missed = 0
+            track.age += 1
+
+        evicted = []
+        for track_id, track in list(self.tracks.items()):
+            if track_id in matched_tracks:
+                continue
+            track.missed += 1
+            if track.missed > self.max_missed_frames:
+                del self.tracks[track_id]
+                evicted.append(track_id)
+
+        return track_ids, evicted
+
+    def reset(self):
+        """Hapus semua track; kembalikan ID yang dihapus"""
+        evicted = list(self.tracks)
+        self.tracks = {}
+        return evicted
@@ -0,0 +1,162 @@
+import json
+import os
+import struct
+import time
+import numpy as np
+from src.measurement.landmark_engine import NUM_LANDMARKS, Point3D
+
+# Format file .hlr (hand landmark recording):
+#   magic (8 byte) + panjang header (uint32 LE) + header JSON, di-pad ke kelipatan 64 byte
+#   lalu record berukuran tetap RECORD_DTYPE, satu per tangan per frame.
+#   Frame tanpa tangan tetap dicatat dengan hand_index = -1 agar jeda waktu ikut terekam.
+MAGIC = b'HLREC\x00\x01\x00'
+HEADER_ALIGN = 64
+FORMAT_VERSION = 1
+
+HANDEDNESS_CODES = {None: 0, 'Left': 1, 'Right': 2}
+HANDEDNESS_LABELS = {code: label for label, code in HANDEDNESS_CODES.items()}
+
+RECORD_DTYPE = np.dtype([
+    ('frame_index', '<i8'),
+    ('timestamp', '<f8'),        # Waktu capture (epoch detik)
+    ('hand_index', '<i1'),       # -1 = frame tanpa tangan
+    ('handedness', '<u1'),       # Kode HANDEDNESS_CODES
+    ('score', '<f4'),
+    ('points', '<f4', (NUM_LANDMARKS, 3))  # Landmark ternormalisasi (x, y, z)
+])
+
+
+class ReplayLandmarks:
+    """Pengganti ringan NormalizedLandmarkList: cukup untuk kalkulator dan tracker"""
+
+    __slots__ = ('landmark',)
+
+    def __init__(self, points):
+        self.landmark = [Point3D(x, y, z) for x, y, z in points.tolist()]
+
+
+class _Classification:
+    __slots__ = ('label', 'score')
+
+    def __init__(self, label, score):
+        self.label = label
+        self.score = score
+
+
+class _ClassificationList:
+    __slots__ = ('classification',)
+
+    def __init__(self, label, score):
+        self.classification = [_Classification(label, score)]
+
+
+class ReplayResults:
+    """Hasil satu frame rekaman dengan atribut yang sama seperti hasil Hands.process"""
+
+    __slots__ = ('multi_hand_landmarks', 'multi_handedness')
+
+    def __init__(self, hand_landmarks, handedness):
+        self.multi_hand_landmarks = hand_landmarks or None
+        self.multi_handedness = handedness or None
+
+
+class LandmarkRecorder:
+    """Tulis hasil deteksi per frame ke file .hlr (append, ter-buffer)"""
+
+    def __init__(self, path, metadata=None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.frames = 0
+        self._file = open(path, 'wb')
+
+        header = dict(metadata or {}, version=FORMAT_VERSION, created=time.time(),
+                      record_size=RECORD_DTYPE.itemsize)
+        header_bytes = json.dumps(header).encode()
+        size = len(MAGIC) + 4 + len(header_bytes)
+        padding = -size % HEADER_ALIGN
+        self._file.write(MAGIC + struct.pack('<I', len(header_bytes) + padding) +
+                         header_bytes + b' ' * padding)
+
+    @classmethod
+    def from_config(cls, config, frame_size=None, mirrored=True):
+        """Buat recorder baru di folder rekaman; None jika perekaman tidak aktif"""
+        recording = config.get('recording', {})
+        if not recording.get('enabled', False):
+            return None
+        name = time.strftime('landmarks-%Y%m%d-%H%M%S.hlr')
+        metadata = {'frame_size': frame_size, 'mirrored': mirrored, 'detection': config.get('detection', {})}
+        return cls(os.path.join(recording.get('directory', 'recordings'), name), metadata)
+
+    def write(self, results, frame_index=None, timestamp=None):
+        """Catat satu frame hasil deteksi"""
+        frame_index = self.frames if frame_index is None else frame_index
+        timestamp = time.time() if timestamp is None else timestamp
+        hands = results.multi_hand_landmarks or []
+
+        rows = np.zeros(max(1, len(hands)), dtype=RECORD_DTYPE)
+        rows['frame_index'] = frame_index
+        rows['timestamp'] = timestamp
+        if not hands:
+            rows['hand_index'] = -1
+        for i, hand_landmarks in enumerate(hands):
+            rows['hand_index'][i] = i
+            rows['points'][i] = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
+            if results.multi_handedness and i < len(results.multi_handedness):
+                classification = results.multi_handedness[i].classification[0]
+                rows['handedness'][i] = HANDEDNESS_CODES.get(classification.label, 0)
+                rows['score'][i] = classification.score
+
+        self._file.write(rows.tobytes())
+        self.frames += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class LandmarkRecording:
+    """Baca file .hlr lewat memory map; tidak ada data yang disalin sampai dipakai"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic = f.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError(f"Bukan file rekaman landmark: {path}")
+            header_length, = struct.unpack('<I', f.read(4))
+            self.header = json.loads(f.read(header_length).decode().rstrip())
+
+        offset = len(MAGIC) + 4 + header_length
+        count = (os.path.getsize(path) - offset) // RECORD_DTYPE.itemsize
+        self.records = (np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=offset, shape=(count,))
+                        if count else np.zeros(0, dtype=RECORD_DTYPE))
+
+        # Batas setiap frame: indeks record pertama per frame
+        frame_index = self.records['frame_index']
+        self._starts = np.zeros(0, dtype=np.intp)
+        if count:
+            self._starts = np.flatnonzero(np.r_[True, frame_index[1:] != frame_index[:-1]])
+
+    def __len__(self):
+        return len(self._starts)
+
+    def frames(self, start=0, stop=None):
+        """
+        Iterasi frame rekaman
+        Yields:
+            (frame_index, timestamp, ReplayResults)
+        """
+        bounds = np.r_[self._starts, len(self.records)]
+        stop = len(self._starts) if stop is None else min(stop, len(self._starts))
+        for i in range(start, stop):
+            rows = self.records[bounds[i]:bounds[i + 1]]
+            first = rows[0]
+            if first['hand_index'] < 0:
+                yield int(first['frame_index']), float(first['timestamp']), ReplayResults(None, None)
+                continue
+            hands = [ReplayLandmarks(points) for points in rows['points']]
+            handedness = [_ClassificationList(HANDEDNESS_LABELS.get(int(code)), float(score))
+                          for code, score in zip(rows['handedness'], rows['score'])]
+            yield int(first['frame_index']), float(first['timestamp']), ReplayResults(hands, handedness)
@@ -0,0 +1,172 @@
+import json
+import os
+import time
+import cv2
+import numpy as np
+
+LENS_MODEL_VERSION = 1
+
+
+def find_checkerboard(frame, pattern):
+    """
+    Cari sudut dalam papan catur pada satu frame
+    Args:
+        frame: Gambar BGR atau grayscale
+        pattern: (kolom, baris) jumlah sudut dalam
+    Returns:
+        Array (N, 1, 2) float32 sudut subpixel atau None
+    """
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    flags = cv2.CALIB_CB_ADAPTIVE_THRESH + cv2.CALIB_CB_NORMALIZE_IMAGE + cv2.CALIB_CB_FAST_CHECK
+    found, corners = cv2.findChessboardCorners(gray, tuple(pattern), flags=flags)
+    if not found:
+        return None
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+    return cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria)
+
+
+def checkerboard_object_points(pattern, square_size_mm):
+    """Koordinat sudut papan catur pada bidang papan (mm), urutan sama dengan findChessboardCorners"""
+    columns, rows = pattern
+    points = np.zeros((columns * rows, 3), dtype=np.float32)
+    points[:, :2] = np.mgrid[0:columns, 0:rows].T.reshape(-1, 2) * square_size_mm
+    return points
+
+
+def calibrate_lens(corner_sets, pattern, square_size_mm, image_size):
+    """
+    Hitung matriks kamera dan koefisien distorsi dari beberapa frame papan catur
+    Args:
+        corner_sets: List sudut dari find_checkerboard
+        pattern: (kolom, baris) jumlah sudut dalam
+        square_size_mm: Ukuran satu kotak papan catur
+        image_size: (width, height) frame yang dipakai
+    Returns:
+        LensModel
+    """
+    object_points = checkerboard_object_points(pattern, square_size_mm)
+    rms, camera_matrix, dist_coeffs, _, _ = cv2.calibrateCamera(
+        [object_points] * len(corner_sets), corner_sets, tuple(image_size), None, None)
+    return LensModel(camera_matrix, dist_coeffs, image_size, rms=rms, frames=len(corner_sets))
+
+
+class LensModel:
+    """
+    Model intrinsik kamera (matriks kamera + koefisien distorsi). Hanya
+    koordinat landmark yang dikoreksi, bukan seluruh frame, sehingga biaya
+    per frame tetap beberapa mikrodetik berapa pun resolusi kamera.
+    """
+
+    def __init__(self, camera_matrix, dist_coeffs, image_size, rms=None, frames=None, mirrored=False):
+        self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64).reshape(3, 3)
+        self.dist_coeffs = np.asarray(dist_coeffs, dtype=np.float64).ravel()
+        self.image_size = (int(image_size[0]), int(image_size[1]))
+        self.rms = rms
+        self.frames = frames
+        # Frame live di-flip horizontal sebelum deteksi; koreksi dilakukan di koordinat sensor
+        self.mirrored = mirrored
+
+        # Skala koordinat ternormalisasi MediaPipe -> pixel pada resolusi kalibrasi
+        self._scale = np.array(self.image_size, dtype=np.float64)
+
+    @classmethod
+    def from_config(cls, config, mirrored=False):
+        """Muat model lensa dari section 'lens'; None jika tidak aktif atau belum dikalibrasi"""
+        lens = config.get('lens', {})
+        path = lens.get('model_path')
+        if not lens.get('enabled', False) or not path or not os.path.exists(path):
+            return None
+        try:
+            model = cls.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Model lensa tidak dapat dibaca ({path}): {e}")
+            return None
+        model.mirrored = mirrored
+        return model
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != LENS_MODEL_VERSION:
+            raise ValueError("versi model lensa tidak dikenal")
+        return cls(data['camera_matrix'], data['dist_coeffs'], data['image_size'],
+                   rms=data.get('rms'), frames=data.get('frames'))
+
+    def to_dict(self):
+        return {
+            'version': LENS_MODEL_VERSION,
+            'created': time.time(),
+            'image_size': list(self.image_size),
+            'camera_matrix': self.camera_matrix.tolist(),
+            'dist_coeffs': self.dist_coeffs.tolist(),
+            'rms': self.rms,
+            'frames': self.frames
+        }
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Tulis ke file sementara lalu rename, sama seperti CalibrationStore
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def matches(self, frame_size):
+        """True jika rasio aspek frame sama dengan frame kalibrasi lensa"""
+        width, height = frame_size
+        return abs(width * self.image_size[1] - height * self.image_size[0]) <= max(width, height) * 0.01
+
+    def undistort_pixels(self, points, frame_size=None):
+        """
+        Koreksi distorsi titik dalam koordinat pixel frame
+        Args:
+            points: Array (..., 2) koordinat pixel
+            frame_size: (width, height) frame asal titik (default: resolusi kalibrasi)
+        Returns:
+            Array baru dengan bentuk yang sama
+        """
+        points = np.asarray(points, dtype=np.float64)
+        width, height = frame_size or self.image_size
+        scale = self._scale / (width, height)
+        flat = points.reshape(-1, 2) * scale
+        if self.mirrored:
+            flat[:, 0] = self._scale[0] - 1 - flat[:, 0]
+
+        undistorted = cv2.undistortPoints(flat.reshape(-1, 1, 2), self.camera_matrix,
+                                          self.dist_coeffs, P=self.camera_matrix).reshape(-1, 2)
+        if self.mirrored:
+            undistorted[:, 0] = self._scale[0] - 1 - undistorted[:, 0]
+        return (undistorted / scale).reshape(points.shape)
+
+    def undistort_normalized(self, points):
+        """
+        Koreksi distorsi landmark ternormalisasi MediaPipe; z tidak diubah
+        Args:
+            points: Array (..., 21, 3) atau (..., 2) dengan x, y dalam 0-1
+        Returns:
+            Array baru dengan bentuk yang sama
+        """
+        undistorted = np.array(points, dtype=np.float64)
+        xy = undistorted[..., :2].reshape(-1, 2)
+        if xy.size == 0:
+            return undistorted
+
+        pixels = xy * self._scale
+        if self.mirrored:
+            pixels[:, 0] = self._scale[0] - pixels[:, 0]
+        # Semua tangan dalam satu panggilan: iterasi inversi distorsi berjalan vektor di OpenCV
+        pixels = cv2.undistortPoints(pixels.reshape(-1, 1, 2), self.camera_matrix,
+                                     self.dist_coeffs, P=self.camera_matrix).reshape(-1, 2)
+        if self.mirrored:
+            pixels[:, 0] = self._scale[0] - pixels[:, 0]
+        undistorted[..., :2] = (pixels / self._scale).reshape(undistorted[..., :2].shape)
+        return undistorted
+
+    def describe(self):
+        fx, fy = self.camera_matrix[0, 0], self.camera_matrix[1, 1]
+        rms = f", RMS {self.rms:.3f} px" if self.rms is not None else ""
+        return (f"{self.image_size[0]}x{self.image_size[1]}, fx {fx:.1f}, fy {fy:.1f}, "
+                f"k1 {self.dist_coeffs[0]:+.4f}{rms}")
@@ -0,0 +1,146 @@
+import queue
+import threading
+import time
+from src.export.record_writer import RotatingRecordWriter, SocketRecordWriter
+from src.profiling.metrics import metrics
+
+
+class MeasurementSink:
+    """
+    Tahap ekspor pengukuran per frame yang berjalan di thread sendiri.
+    submit() tidak pernah menunggu I/O: batch masuk ke antrian terbatas dan
+    dibuang (dihitung) jika antrian penuh, sehingga memori tetap datar.
+    """
+
+    def __init__(self, writers, queue_size=256, batch_size=64, flush_interval_s=1.0):
+        self.writers = writers
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._stop_event = threading.Event()
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed_batches = 0  # Batch yang gagal ditulis minimal oleh satu writer
+        self.failed_records = 0
+        self.last_error = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Buat sink dari section 'export'; None jika ekspor tidak aktif"""
+        export = config.get('export', {})
+        if not export.get('enabled', False):
+            return None
+
+        writers = []
+        if export.get('directory'):
+            writers.append(RotatingRecordWriter(
+                export['directory'],
+                fmt=export.get('format', 'csv'),
+                rotate_records=export.get('rotate_records', 100000),
+                rotate_seconds=export.get('rotate_seconds', 3600),
+                max_files=export.get('max_files', 0)
+            ))
+        if export.get('socket'):
+            writers.append(SocketRecordWriter(export['socket']))
+        if not writers:
+            return None
+
+        return cls(writers,
+                   queue_size=export.get('queue_size', 256),
+                   batch_size=export.get('batch_size', 64),
+                   flush_interval_s=export.get('flush_interval_s', 1.0))
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._writer_loop, name='export', daemon=True)
+        self._thread.start()
+
+    def submit(self, records):
+        """Antrikan record satu frame tanpa menunggu; False jika dibuang karena antrian penuh"""
+        if not records:
+            return True
+        try:
+            self._queue.put_nowait(records)
+        except queue.Full:
+            self.dropped += len(records)
+            return False
+        self.submitted += len(records)
+        return True
+
+    def _writer_loop(self):
+        batch = []
+        next_flush = time.monotonic() + self.flush_interval_s
+        while True:
+            timeout = max(0.0, next_flush - time.monotonic())
+            try:
+                batch.extend(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                if self._stop_event.is_set():
+                    break
+
+            # Tulis per batch: lebih sedikit syscall dan row group Parquet yang lebih besar
+            if len(batch) >= self.batch_size or time.monotonic() >= next_flush:
+                self._write(batch)
+                batch = []
+                next_flush = time.monotonic() + self.flush_interval_s
+
+        self._write(batch)
+
+    def _write(self, batch):
+        if not batch:
+            return
+        failed = False
+        with metrics.timer('export.write'):
+            for writer in self.writers:
+                try:
+                    writer.write(batch)
+                    writer.flush()
+                except Exception as e:
+                    # Semua error ditangkap (bukan hanya OSError, mis. skema Parquet yang berubah):
+                    # thread writer tetap hidup dan batch berikutnya tetap dicoba
+                    failed = True
+                    error = f"{type(writer).__name__}: {type(e).__name__}: {e}"
+                    if error != self.last_error:
+                        print(f"\nWarning: Ekspor pengukuran gagal ({error})")
+                    self.last_error = error
+        if failed:
+            self.failed_batches += 1
+            self.failed_records += len(batch)
+        else:
+            self.written += len(batch)
+
+    def stop(self):
+        """Tulis sisa antrian lalu tutup semua writer"""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        for writer in self.writers:
+            writer.close()
+
+    def get_stats(self):
+        return {
+            'submitted': self.submitted,
+            'written': self.written,
+            'dropped': self.dropped + sum(getattr(writer, 'dropped', 0) for writer in self.writers),
+            'failed_batches': self.failed_batches,
+            'failed_records': self.failed_records,
+            'last_error': self.last_error,
+            'queue': self._queue.qsize(),
+            # False jika thread writer berhenti di luar stop(): antrian tidak lagi dikosongkan
+            'writer_alive': self._thread is not None and self._thread.is_alive()
+        }
+
+    def format_stats(self):
+        stats = self.get_stats()
+        line = (f"- export: {stats['written']}/{stats['submitted']} record ditulis, "
+                f"dibuang {stats['dropped']}, antrian {stats['queue']}")
+        if stats['failed_batches']:
+            line += (f", gagal {stats['failed_records']} record dalam {stats['failed_batches']} batch "
+                     f"(terakhir: {stats['last_error']})")
+        if self._thread is not None and not stats['writer_alive']:
+            line += ", THREAD WRITER BERHENTI"
+        return line
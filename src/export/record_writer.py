@@ -0,0 +1,240 @@
+import csv
+import glob
+import json
+import os
+import socket
+import time
+from src.measurement.dimension_calculator import MEASUREMENT_FIELDS
+
+# Kolom metadata per baris, diikuti semua field pengukuran
+RECORD_FIELDS = (
+    ('source', 'string'),
+    ('frame_index', 'int64'),
+    ('timestamp_ms', 'float64'),
+    ('hand_index', 'int64'),
+    ('hand_id', 'int64'),
+    ('handedness', 'string'),
+    ('handedness_score', 'float64'),
+    ('calibration_confidence', 'float64'),
+    ('distance_cm', 'float64')
+) + tuple((name, 'float64') for name in MEASUREMENT_FIELDS)
+
+RECORD_FIELD_NAMES = tuple(name for name, _ in RECORD_FIELDS)
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+
+
+def dimensions_to_record(dimensions, **metadata):
+    """Ambil field *_cm dari dict dimensi dan gabungkan dengan metadata"""
+    record = dict(metadata)
+    if dimensions:
+        if 'distance_cm' in dimensions:
+            record['distance_cm'] = float(dimensions['distance_cm'])
+        for name in MEASUREMENT_FIELDS:
+            if name in dimensions:
+                record[name] = float(dimensions[name])
+    return record
+
+
+def detect_format(path):
+    """Tentukan format output dari ekstensi file"""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension == 'json':
+        extension = 'jsonl'
+    if extension not in FORMATS:
+        raise ValueError(f"Format output tidak didukung: {path} (gunakan .csv, .jsonl, atau .parquet)")
+    return extension
+
+
+class CsvRecordWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=RECORD_FIELD_NAMES,
+                                     extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, records):
+        self.writer.writerows(records)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlRecordWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w')
+
+    def write(self, records):
+        for record in records:
+            self.file.write(json.dumps(record))
+            self.file.write('\n')
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetRecordWriter:
+    """Setiap panggilan write() ditulis sebagai satu row group"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Output Parquet membutuhkan pyarrow (pip install pyarrow)")
+
+        self.pa = pa
+        self.schema = pa.schema([(name, getattr(pa, dtype)()) for name, dtype in RECORD_FIELDS])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, records):
+        if not records:
+            return
+        columns = {name: [record.get(name) for record in records] for name in RECORD_FIELD_NAMES}
+        self.writer.write_table(self.pa.Table.from_pydict(columns, schema=self.schema))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.writer.close()
+
+
+def open_record_writer(path, fmt=None):
+    """Buka writer sesuai format (csv, jsonl, parquet)"""
+    fmt = fmt or detect_format(path)
+    if fmt == 'csv':
+        return CsvRecordWriter(path)
+    if fmt == 'jsonl':
+        return JsonlRecordWriter(path)
+    return ParquetRecordWriter(path)
+
+
+class RotatingRecordWriter:
+    """
+    Tulis ke file bernomor di satu folder, ganti file setelah N baris atau
+    N detik, dan hapus file terlama di atas batas max_files
+    """
+
+    def __init__(self, directory, fmt='csv', prefix='measurements',
+                 rotate_records=100000, rotate_seconds=3600, max_files=0):
+        if fmt not in FORMATS:
+            raise ValueError(f"Format output tidak didukung: {fmt} (gunakan csv, jsonl, atau parquet)")
+        self.directory = directory
+        self.fmt = fmt
+        self.prefix = prefix
+        self.rotate_records = rotate_records
+        self.rotate_seconds = rotate_seconds
+        self.max_files = max_files
+        self.writer = None
+        self.path = None
+        self.records = 0
+        self.opened_at = 0.0
+        self._sequence = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _open(self):
+        self._sequence += 1
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        self.path = os.path.join(self.directory,
+                                 f"{self.prefix}-{stamp}-{self._sequence:04d}.{self.fmt}")
+        self.writer = open_record_writer(self.path, self.fmt)
+        self.records = 0
+        self.opened_at = time.monotonic()
+        self._prune()
+
+    def _prune(self):
+        if self.max_files <= 0:
+            return
+        paths = sorted(glob.glob(os.path.join(self.directory, f"{self.prefix}-*.{self.fmt}")))
+        for path in paths[:-self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _should_rotate(self):
+        if self.rotate_records and self.records >= self.rotate_records:
+            return True
+        return bool(self.rotate_seconds) and time.monotonic() - self.opened_at >= self.rotate_seconds
+
+    def write(self, records):
+        if not records:
+            return
+        if self.writer is not None and self._should_rotate():
+            self.writer.close()
+            self.writer = None
+        if self.writer is None:
+            self._open()
+        self.writer.write(records)
+        self.records += len(records)
+
+    def flush(self):
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class SocketRecordWriter:
+    """
+    Kirim record sebagai JSON lines ke socket lokal ("host:port" atau "unix:/path").
+    Koneksi dibuka ulang otomatis; batch yang gagal terkirim dibuang dan dihitung.
+    """
+
+    def __init__(self, address, retry_interval_s=2.0, timeout_s=1.0):
+        self.address = address
+        self.retry_interval_s = retry_interval_s
+        self.timeout_s = timeout_s
+        self.sock = None
+        self.dropped = 0
+        self._next_attempt = 0.0
+
+    def _connect(self):
+        if self.address.startswith('unix:'):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout_s)
+            sock.connect(self.address[len('unix:'):])
+        else:
+            host, port = self.address.rsplit(':', 1)
+            sock = socket.create_connection((host, int(port)), timeout=self.timeout_s)
+        return sock
+
+    def write(self, records):
+        if not records:
+            return
+        if self.sock is None:
+            if time.monotonic() < self._next_attempt:
+                self.dropped += len(records)
+                return
+            try:
+                self.sock = self._connect()
+            except OSError:
+                self._next_attempt = time.monotonic() + self.retry_interval_s
+                self.dropped += len(records)
+                return
+
+        payload = ''.join(json.dumps(record) + '\n' for record in records).encode()
+        try:
+            self.sock.sendall(payload)
+        except OSError:
+            self.close()
+            self._next_attempt = time.monotonic() + self.retry_interval_s
+            self.dropped += len(records)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
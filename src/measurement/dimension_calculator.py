@@ -1,43 +1,57 @@
 import math
 import numpy as np
-from statistics import mean, stdev
+from src.measurement.landmark_engine import (
+    FINGERS, FINGER_MCP, FINGER_DIP, FINGER_TIP, WRIST, NUM_LANDMARKS,
+    SEGMENT_INDEX, Point3D, landmarks_to_array, stack_landmarks, segment_lengths,
+    forearm_endpoints
+)
+from src.measurement.smoothing import MeasurementSmoother
+from src.measurement.distance_estimator import DistanceEstimator
+from src.measurement.landmark_filter import LandmarkFilter
+
+# Segmen yang dihaluskan sebelum ditampilkan, urutan baris di ring buffer
+SMOOTHED_SEGMENTS = ('forearm_length',) + tuple(f'{finger}_length' for finger in FINGERS)
+SMOOTHED_INDEX = np.array([SEGMENT_INDEX[name] for name in SMOOTHED_SEGMENTS], dtype=np.intp)
+
+# Semua field *_cm yang dapat dihasilkan get_hand_dimensions
+MEASUREMENT_FIELDS = (
+    ('forearm_length_cm', 'palm_width_cm', 'palm_length_cm') +
+    tuple(f'{finger}_length_cm' for finger in FINGERS) +
+    tuple(f'{finger}_tip_to_dip_cm' for finger in FINGERS)
+)
 
 class DimensionCalculator:
-    def __init__(self, calibrator):
+    def __init__(self, calibrator, config=None, lens=None):
         self.calibrator = calibrator
-        self.measurement_buffer = {
-            'finger_tips': {},
-            'wrist_to_middle': [],
-            'forearm': []
-        }
-        self.buffer_size = 10  # Increased buffer size for better stability
+        self.lens = lens  # LensModel opsional: koreksi distorsi sebelum panjang segmen dihitung
+        self.measurement_config = (config or {}).get('measurement', {})
+        
+        # Filter landmark sebelum pengukuran; landmark yang sudah halus butuh lebih sedikit frame
+        self.landmark_filter = LandmarkFilter(config)
+        if self.landmark_filter.enabled:
+            filter_config = (config or {}).get('landmark_filter', {})
+            self.measurement_config = dict(
+                self.measurement_config,
+                min_samples=filter_config.get('measurement_min_samples', 2))
+        self.buffer_size = self.measurement_config.get('buffer_size', 10)
+        
+        # State smoothing terpisah untuk setiap ID tangan
+        self.smoothers = {}
+        
+        # Jarak kamera per tangan; tanpa estimasi dipakai jarak kalibrasi (50 cm)
+        self.distance = DistanceEstimator(calibrator, config)
         
         # Landmark definitions
-        self.finger_tips = {
-            'thumb': 4,
-            'index': 8,
-            'middle': 12,
-            'ring': 16,
-            'pinky': 20
-        }
-        self.finger_mcp = {  # Base of fingers
-            'thumb': 2,
-            'index': 5,
-            'middle': 9,
-            'ring': 13,
-            'pinky': 17
-        }
-        self.finger_dips = {
-            'thumb': 3,
-            'index': 7,
-            'middle': 11,
-            'ring': 15,
-            'pinky': 19
-        }
+        self.finger_tips = FINGER_TIP
+        self.finger_mcp = FINGER_MCP  # Base of fingers
+        self.finger_dips = FINGER_DIP
         self.wrist_landmarks = {
-            'wrist': 0,
-            'wrist_end': 9
+            'wrist': WRIST,
+            'wrist_end': FINGER_MCP['middle']
         }
+        
+        # Buffer koordinat landmark yang dipakai ulang setiap frame
+        self._points = np.empty((NUM_LANDMARKS, 3), dtype=np.float64)
 
     def calculate_3d_distance(self, p1, p2):
         """Calculate 3D distance between two landmarks"""
@@ -47,26 +61,6 @@ class DimensionCalculator:
             (p1.z - p2.z)**2
         ) * 1000  # Convert to millimeters for better precision
 
-    def get_stable_measurement(self, measurements, threshold=2.0):
-        """Get stable measurement with improved outlier filtering"""
-        if len(measurements) < 5:  # Require more measurements for stability
-            return None
-            
-        # Remove extreme outliers
-        sorted_measurements = sorted(measurements)
-        q1 = np.percentile(sorted_measurements, 25)
-        q3 = np.percentile(sorted_measurements, 75)
-        iqr = q3 - q1
-        lower_bound = q1 - threshold * iqr
-        upper_bound = q3 + threshold * iqr
-        
-        filtered = [m for m in measurements if lower_bound <= m <= upper_bound]
-        
-        if len(filtered) < 3:
-            return None
-            
-        return mean(filtered)
-
     def estimate_forearm_endpoint(self, wrist_point, wrist_ref_point, extension_factor=2.0):
         """
         Memperkirakan titik akhir lengan bawah berdasarkan orientasi pergelangan tangan
@@ -82,86 +76,132 @@ class DimensionCalculator:
         end_point_y = wrist_point.y + (dy * extension_factor)
         end_point_z = wrist_point.z + (dz * extension_factor)
         
-        class Point3D:
-            def __init__(self, x, y, z):
-                self.x = x
-                self.y = y
-                self.z = z
-        
         return Point3D(end_point_x, end_point_y, end_point_z)
 
-    def get_hand_dimensions(self, landmarks):
+    def get_raw_dimensions(self, points):
+        """
+        Hitung semua segmen dalam cm tanpa smoothing
+        Args:
+            points: Array (21, 3) atau (N_hands, 21, 3)
+        Returns:
+            Array (..., n_segments) dalam cm dengan urutan SEGMENT_NAMES
+        """
+        return self.calibrator.pixels_to_cm_array(segment_lengths(self.undistort(points)))
+
+    def undistort(self, points):
+        """Landmark terkoreksi distorsi lensa untuk pengukuran (tanpa model lensa: apa adanya)"""
+        if self.lens is None:
+            return points
+        return self.lens.undistort_normalized(points)
+
+    def get_smoother(self, track_id=0):
+        smoother = self.smoothers.get(track_id)
+        if smoother is None:
+            smoother = MeasurementSmoother.from_config(len(SMOOTHED_SEGMENTS), self.measurement_config)
+            self.smoothers[track_id] = smoother
+        return smoother
+
+    def drop_track(self, track_id):
+        """Hapus state smoothing untuk tangan yang sudah tidak terlihat"""
+        self.smoothers.pop(track_id, None)
+        self.distance.drop_track(track_id)
+        self.landmark_filter.drop_track(track_id)
+
+    def reset(self):
+        """Kosongkan semua buffer smoothing"""
+        self.smoothers = {}
+        self.distance.reset()
+        self.landmark_filter.reset()
+
+    def estimate_distances(self, lengths, track_ids, world_landmarks_list=None, points=None):
+        """
+        Jarak kamera per tangan untuk konversi pixel -> cm
+        Args:
+            points: Array (N_hands, 21, 3) landmark terkoreksi (dipakai acuan jarak 'world')
+        Returns:
+            (array (N_hands, 1) jarak cm, list jarak terestimasi atau None)
+        """
+        estimates = []
+        for i, track_id in enumerate(track_ids):
+            world_points = None
+            if world_landmarks_list is not None and i < len(world_landmarks_list):
+                world_points = landmarks_to_array(world_landmarks_list[i])
+            estimates.append(self.distance.estimate(track_id, lengths[i], world_points,
+                                                    None if points is None else points[i]))
+        distances = np.array([self.calibrator.camera_distance_cm if estimate is None else estimate
+                              for estimate in estimates], dtype=np.float64)
+        return distances[:, None], estimates
+
+    def get_hand_dimensions(self, landmarks, track_id=0, world_landmarks=None):
         """Calculate hand dimensions with improved accuracy"""
         if not landmarks or not self.calibrator.is_calibrated:
             return None
             
-        dimensions = {}
-        
-        # Get wrist point and reference points
-        wrist = landmarks.landmark[self.wrist_landmarks['wrist']]
-        wrist_ref = landmarks.landmark[self.wrist_landmarks['wrist_end']]
-        
-        # Calculate and add forearm measurement
-        forearm_end = self.estimate_forearm_endpoint(wrist, wrist_ref)
-        forearm_length = self.calculate_3d_distance(wrist, forearm_end)
-        forearm_length_cm = self.calibrator.pixels_to_cm(forearm_length)
+        points = landmarks_to_array(landmarks, out=self._points)
+        undistorted = self.undistort(points)
+        lengths = segment_lengths(undistorted)
+        distances, estimates = self.estimate_distances(
+            lengths[None], [track_id], None if world_landmarks is None else [world_landmarks], undistorted[None])
+        lengths_cm = self.calibrator.pixels_to_cm_array(lengths, distances[0])
+        return self._build_dimensions(landmarks, points, lengths, lengths_cm,
+                                      self.get_smoother(track_id), estimates[0])
+
+    def get_multi_hand_dimensions(self, hand_landmarks_list, track_ids, world_landmarks_list=None):
+        """
+        Ukur semua tangan dalam satu pass vektor
+        Args:
+            hand_landmarks_list: Landmark setiap tangan
+            track_ids: ID stabil setiap tangan (dari HandTracker)
+            world_landmarks_list: World landmarks MediaPipe per tangan (opsional, untuk estimasi jarak)
+        Returns:
+            List dict dimensi sesuai urutan input
+        """
+        if not hand_landmarks_list or not self.calibrator.is_calibrated:
+            return [None] * len(hand_landmarks_list)
+            
+        points = stack_landmarks(hand_landmarks_list)
+        undistorted = self.undistort(points)
+        lengths = segment_lengths(undistorted)
+        distances, estimates = self.estimate_distances(lengths, track_ids, world_landmarks_list, undistorted)
+        lengths_cm = self.calibrator.pixels_to_cm_array(lengths, distances)
+        return [
+            self._build_dimensions(landmarks, points[i], lengths[i], lengths_cm[i],
+                                   self.get_smoother(track_id), estimates[i])
+            for i, (landmarks, track_id) in enumerate(zip(hand_landmarks_list, track_ids))
+        ]
+
+    def _build_dimensions(self, landmarks, points, lengths, lengths_cm, smoother, distance_cm=None):
+        stable = smoother.update(lengths_cm[SMOOTHED_INDEX])
         
-        # Add to buffer for stability
-        if len(self.measurement_buffer['forearm']) >= self.buffer_size:
-            self.measurement_buffer['forearm'].pop(0)
-        self.measurement_buffer['forearm'].append(forearm_length_cm)
+        dimensions = {}
+        if distance_cm is not None:
+            dimensions['distance_cm'] = float(distance_cm)
         
         # Get stable forearm measurement
-        stable_forearm = self.get_stable_measurement(self.measurement_buffer['forearm'])
-        if stable_forearm:
-            dimensions['forearm_length'] = forearm_length
-            dimensions['forearm_length_cm'] = stable_forearm
+        stable_forearm = stable[0]
+        if not np.isnan(stable_forearm):
+            dimensions['forearm_length'] = float(lengths[SEGMENT_INDEX['forearm_length']])
+            dimensions['forearm_length_cm'] = float(stable_forearm)
             dimensions['forearm_points'] = {
-                'wrist': wrist,
-                'end': forearm_end
+                'wrist': landmarks.landmark[WRIST],
+                'end': Point3D(*forearm_endpoints(points).tolist())
             }
         
-        # Calculate palm width (distance between index and pinky MCP)
-        index_mcp = landmarks.landmark[self.finger_mcp['index']]
-        pinky_mcp = landmarks.landmark[self.finger_mcp['pinky']]
-        palm_width = self.calculate_3d_distance(index_mcp, pinky_mcp)
-        palm_width_cm = self.calibrator.pixels_to_cm(palm_width)
-        dimensions['palm_width_cm'] = palm_width_cm
+        # Palm width (distance between index and pinky MCP)
+        dimensions['palm_width_cm'] = float(lengths_cm[SEGMENT_INDEX['palm_width']])
         
         # Calculate finger lengths
-        for finger_name in self.finger_tips.keys():
+        for i, finger_name in enumerate(FINGERS, start=1):
             # Full finger length (MCP to tip)
-            mcp = landmarks.landmark[self.finger_mcp[finger_name]]
-            tip = landmarks.landmark[self.finger_tips[finger_name]]
-            
-            finger_length = self.calculate_3d_distance(mcp, tip)
-            finger_length_cm = self.calibrator.pixels_to_cm(finger_length)
-            
-            # Store measurement in buffer
-            if finger_name not in self.measurement_buffer['finger_tips']:
-                self.measurement_buffer['finger_tips'][finger_name] = []
-            
-            buffer = self.measurement_buffer['finger_tips'][finger_name]
-            if len(buffer) >= self.buffer_size:
-                buffer.pop(0)
-            buffer.append(finger_length_cm)
-            
-            # Get stable measurement
-            stable_length = self.get_stable_measurement(buffer)
-            if stable_length:
-                dimensions[f'{finger_name}_length_cm'] = stable_length
+            stable_length = stable[i]
+            if not np.isnan(stable_length):
+                dimensions[f'{finger_name}_length_cm'] = float(stable_length)
             
             # Tip to DIP (last segment) length
-            dip = landmarks.landmark[self.finger_dips[finger_name]]
-            tip_to_dip = self.calculate_3d_distance(tip, dip)
-            tip_to_dip_cm = self.calibrator.pixels_to_cm(tip_to_dip)
-            
-            dimensions[f'{finger_name}_tip_to_dip_cm'] = tip_to_dip_cm
+            dimensions[f'{finger_name}_tip_to_dip_cm'] = float(
+                lengths_cm[SEGMENT_INDEX[f'{finger_name}_tip_to_dip']])
         
-        # Calculate palm length (wrist to middle finger MCP)
-        middle_mcp = landmarks.landmark[self.finger_mcp['middle']]
-        palm_length = self.calculate_3d_distance(wrist, middle_mcp)
-        palm_length_cm = self.calibrator.pixels_to_cm(palm_length)
-        dimensions['palm_length_cm'] = palm_length_cm
+        # Palm length (wrist to middle finger MCP)
+        dimensions['palm_length_cm'] = float(lengths_cm[SEGMENT_INDEX['palm_length']])
         
-        return dimensions
\ No newline at end of file
+        return dimensions
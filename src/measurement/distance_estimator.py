@@ -0,0 +1,116 @@
+import numpy as np
+from src.measurement.landmark_engine import SEGMENT_INDEX, segment_lengths
+
+# Segmen telapak yang kaku (tidak berubah saat jari ditekuk) sebagai acuan ukuran tangan
+REFERENCE_SEGMENTS = np.array([SEGMENT_INDEX['palm_width'], SEGMENT_INDEX['palm_length']], dtype=np.intp)
+REFERENCE_MODES = ('palm', 'world')
+# Panjang segmen dari segment_lengths: koordinat ternormalisasi x 1000
+LANDMARK_UNITS = 1000.0
+
+
+class HandDistance:
+    """State estimasi jarak satu tangan"""
+
+    __slots__ = ('reference_cm', 'reference_samples', 'distance_cm')
+
+    def __init__(self):
+        self.reference_cm = None  # Ukuran telapak sebenarnya (cm)
+        self.reference_samples = []
+        self.distance_cm = None  # Jarak kamera ke tangan setelah smoothing
+
+
+class DistanceEstimator:
+    """
+    Estimasi jarak kamera ke setiap tangan per frame dari ukuran telapak:
+    jarak = focal_length x ukuran sebenarnya / ukuran pixel.
+    Ukuran sebenarnya diambil dari beberapa frame pertama tangan tersebut
+    pada jarak kalibrasi ('palm') atau dari world landmarks MediaPipe ('world').
+    """
+
+    def __init__(self, calibrator, config=None):
+        depth = (config or {}).get('depth', {})
+        self.calibrator = calibrator
+        self.enabled = depth.get('enabled', False)
+        self.reference = depth.get('reference', 'palm')
+        if self.reference not in REFERENCE_MODES:
+            raise ValueError(f"Referensi jarak tidak dikenal: {self.reference} (pilihan: {', '.join(REFERENCE_MODES)})")
+        self.reference_frames = depth.get('reference_frames', 10)
+        self.alpha = depth.get('alpha', 0.3)
+        self.max_step = depth.get('max_step', 0.25)
+        # Ukuran frame (pixel) tempat kalibrasi diukur; focal length dalam pixel frame ini.
+        # Pemilik kalkulator menimpanya jika resolusi sumber berbeda dari config kamera.
+        camera = (config or {}).get('camera', {})
+        self.frame_size = (camera.get('width', LANDMARK_UNITS), camera.get('height', LANDMARK_UNITS))
+
+        self.hands = {}  # track_id -> HandDistance
+        self._focal_length = None
+
+    def palm_size_pixels(self, points):
+        """
+        Ukuran telapak acuan dalam pixel frame. Landmark x ternormalisasi terhadap
+        lebar frame dan y terhadap tinggi, jadi dikonversi per sumbu (z memakai skala x).
+        """
+        width, height = self.frame_size
+        scale = np.array([width, height, width], dtype=np.float64)
+        return float(segment_lengths(points * scale)[REFERENCE_SEGMENTS].sum()) / LANDMARK_UNITS
+
+    def estimate(self, track_id, lengths, world_points=None, points=None):
+        """
+        Estimasi jarak satu tangan pada frame ini
+        Args:
+            track_id: ID tangan dari HandTracker
+            lengths: Panjang segmen dalam pixel (urutan SEGMENT_NAMES)
+            world_points: Array (21, 3) world landmarks dalam meter (opsional)
+            points: Array (21, 3) landmark ternormalisasi, wajib untuk acuan 'world'
+        Returns:
+            Jarak dalam cm, atau None selama acuan ukuran belum tersedia
+        """
+        if not self.enabled or not self.calibrator.is_calibrated:
+            return None
+        # Kalibrasi baru: acuan lama diukur dengan focal length lama
+        if self.calibrator.focal_length != self._focal_length:
+            self.reset()
+            self._focal_length = self.calibrator.focal_length
+
+        hand = self.hands.get(track_id)
+        if hand is None:
+            hand = self.hands[track_id] = HandDistance()
+
+        size_px = float(lengths[REFERENCE_SEGMENTS].sum())
+        if size_px <= 0:
+            return hand.distance_cm
+
+        if self.reference == 'world' and world_points is not None and points is not None:
+            # World landmarks dalam meter -> cm
+            reference_cm = float(segment_lengths(world_points * 100.0)[REFERENCE_SEGMENTS].sum()) / 1000
+            # Focal length dalam pixel frame: ukuran telapak juga dalam pixel frame
+            size_px = self.palm_size_pixels(points)
+        else:
+            reference_cm = self._palm_reference(hand, size_px)
+            if reference_cm is None:
+                return None
+
+        distance = self.calibrator.focal_length * reference_cm / size_px
+        if hand.distance_cm is None:
+            hand.distance_cm = distance
+        else:
+            # Batasi perubahan per frame agar satu frame landmark yang meleset tidak ikut terbawa
+            ratio = min(max(distance / hand.distance_cm, 1.0 - self.max_step), 1.0 + self.max_step)
+            hand.distance_cm += self.alpha * (hand.distance_cm * ratio - hand.distance_cm)
+        return hand.distance_cm
+
+    def _palm_reference(self, hand, size_px):
+        """Ukuran telapak dari frame pertama tangan, diasumsikan pada jarak kalibrasi"""
+        if hand.reference_cm is None:
+            hand.reference_samples.append(size_px)
+            if len(hand.reference_samples) < self.reference_frames:
+                return None
+            hand.reference_cm = float(self.calibrator.pixels_to_cm_array(np.median(hand.reference_samples)))
+            hand.reference_samples = []
+        return hand.reference_cm
+
+    def drop_track(self, track_id):
+        self.hands.pop(track_id, None)
+
+    def reset(self):
+        self.hands = {}
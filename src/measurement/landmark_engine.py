@@ -0,0 +1,108 @@
+import collections
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+FINGERS = ('thumb', 'index', 'middle', 'ring', 'pinky')
+
+# Indeks landmark MediaPipe Hands
+WRIST = 0
+FINGER_MCP = {'thumb': 2, 'index': 5, 'middle': 9, 'ring': 13, 'pinky': 17}
+FINGER_DIP = {'thumb': 3, 'index': 7, 'middle': 11, 'ring': 15, 'pinky': 19}
+FINGER_TIP = {'thumb': 4, 'index': 8, 'middle': 12, 'ring': 16, 'pinky': 20}
+
+# Topologi tangan MediaPipe (mp.solutions.hands.HAND_CONNECTIONS) tanpa perlu import MediaPipe
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20)
+)
+
+FOREARM_EXTENSION = 2.0  # Faktor ekstensi lengan bawah dari vektor wrist_end -> wrist
+
+# Tabel segmen: (nama, landmark awal, landmark akhir, skala)
+# Panjang lengan bawah = |wrist - wrist_end| * faktor ekstensi, sehingga bisa
+# dihitung dari pasangan yang sama dengan palm_length.
+SEGMENTS = (
+    [(f'{finger}_length', FINGER_MCP[finger], FINGER_TIP[finger], 1.0) for finger in FINGERS] +
+    [(f'{finger}_tip_to_dip', FINGER_TIP[finger], FINGER_DIP[finger], 1.0) for finger in FINGERS] +
+    [
+        ('palm_width', FINGER_MCP['index'], FINGER_MCP['pinky'], 1.0),
+        ('palm_length', WRIST, FINGER_MCP['middle'], 1.0),
+        ('forearm_length', WRIST, FINGER_MCP['middle'], FOREARM_EXTENSION)
+    ]
+)
+
+SEGMENT_NAMES = tuple(name for name, _, _, _ in SEGMENTS)
+SEGMENT_INDEX = {name: i for i, name in enumerate(SEGMENT_NAMES)}
+SEGMENT_START = np.array([start for _, start, _, _ in SEGMENTS], dtype=np.intp)
+SEGMENT_END = np.array([end for _, _, end, _ in SEGMENTS], dtype=np.intp)
+# Skala * 1000: jarak dikonversi ke "milimeter" seperti calculate_3d_distance
+SEGMENT_SCALE = np.array([scale for _, _, _, scale in SEGMENTS], dtype=np.float64) * 1000
+
+Point3D = collections.namedtuple('Point3D', ['x', 'y', 'z'])
+
+
+def landmarks_to_array(landmarks, out=None):
+    """Ubah NormalizedLandmarkList menjadi array (21, 3) float"""
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 3), dtype=np.float64)
+    for i, lm in enumerate(landmarks.landmark):
+        out[i, 0] = lm.x
+        out[i, 1] = lm.y
+        out[i, 2] = lm.z
+    return out
+
+
+def stack_landmarks(hand_landmarks_list):
+    """Gabungkan beberapa tangan menjadi array (N_hands, 21, 3)"""
+    points = np.empty((len(hand_landmarks_list), NUM_LANDMARKS, 3), dtype=np.float64)
+    for i, landmarks in enumerate(hand_landmarks_list):
+        landmarks_to_array(landmarks, out=points[i])
+    return points
+
+
+def write_landmarks(landmarks, points):
+    """Tulis array (21, 3) kembali ke landmark (protobuf MediaPipe atau ReplayLandmarks) in-place"""
+    if isinstance(landmarks.landmark, list):
+        # Point3D immutable: ganti seluruh list
+        landmarks.landmark = [Point3D(x, y, z) for x, y, z in points.tolist()]
+        return
+    for lm, (x, y, z) in zip(landmarks.landmark, points.tolist()):
+        lm.x = x
+        lm.y = y
+        lm.z = z
+
+
+def segment_lengths(points):
+    """
+    Hitung semua panjang segmen sekaligus
+    Args:
+        points: Array (..., 21, 3), misalnya (21, 3) atau (N_hands, 21, 3)
+    Returns:
+        Array (..., n_segments) dengan urutan SEGMENT_NAMES
+    """
+    diff = points[..., SEGMENT_END, :] - points[..., SEGMENT_START, :]
+    return np.sqrt(np.einsum('...ij,...ij->...i', diff, diff)) * SEGMENT_SCALE
+
+
+def forearm_endpoints(points, extension_factor=FOREARM_EXTENSION):
+    """Perkirakan titik akhir lengan bawah untuk array (..., 21, 3)"""
+    wrist = points[..., WRIST, :]
+    direction = wrist - points[..., FINGER_MCP['middle'], :]
+    return wrist + direction * extension_factor
+
+
+def array_to_landmarks(points):
+    """Ubah array (21, 3) menjadi NormalizedLandmarkList MediaPipe"""
+    from mediapipe.framework.formats import landmark_pb2
+
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in np.asarray(points, dtype=np.float64).tolist():
+        landmark = landmarks.landmark.add()
+        landmark.x = x
+        landmark.y = y
+        landmark.z = z
+    return landmarks
@@ -0,0 +1,121 @@
+import math
+import numpy as np
+from src.measurement.landmark_engine import stack_landmarks, write_landmarks
+
+MIN_HAND_SCALE = 1e-3  # Ukuran tangan minimum (koordinat ternormalisasi) untuk normalisasi kecepatan
+
+
+def smoothing_factor(dt, cutoff):
+    """Faktor low-pass orde satu untuk selang waktu dt (s) dan frekuensi cutoff (Hz)"""
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class FilteredHand:
+    """State filter satu tangan"""
+
+    __slots__ = ('points', 'velocity', 'timestamp')
+
+    def __init__(self, points, timestamp):
+        self.points = points  # Landmark hasil filter (21, 3)
+        self.velocity = np.zeros_like(points)  # Kecepatan per detik setelah low-pass
+        self.timestamp = timestamp
+
+
+class LandmarkFilter:
+    """
+    Filter One-Euro pada koordinat landmark (21, 3) setiap tangan, sebelum
+    panjang segmen dihitung. Cutoff naik bersama kecepatan tangan: saat diam
+    jitter ditekan kuat, saat bergerak cepat landmark mengikuti tanpa lag.
+    Kecepatan yang sama dipakai untuk memprediksi posisi tangan pada frame
+    yang tidak dideteksi (stride deteksi).
+    """
+
+    def __init__(self, config=None):
+        section = (config or {}).get('landmark_filter', {})
+        self.enabled = section.get('enabled', False)
+        self.min_cutoff = section.get('min_cutoff', 1.0)
+        self.beta = section.get('beta', 20.0)
+        self.derivative_cutoff = section.get('derivative_cutoff', 2.0)
+        self.max_gap_s = section.get('max_gap_s', 0.5)
+        self.max_prediction_s = section.get('max_prediction_ms', 100) / 1000.0
+        # Tanpa timestamp: anggap frame datang sesuai FPS kamera
+        self.frame_interval = 1.0 / (config or {}).get('camera', {}).get('fps', 30)
+
+        self.hands = {}  # track_id -> FilteredHand
+        self._clock = 0.0
+
+    def update(self, track_ids, points, timestamp=None):
+        """
+        Filter landmark semua tangan pada satu frame dalam satu pass vektor
+        Args:
+            track_ids: ID tangan dari HandTracker
+            points: Array (N_hands, 21, 3) landmark mentah
+            timestamp: Waktu frame dalam detik (opsional)
+        Returns:
+            Array (N_hands, 21, 3) landmark hasil filter
+        """
+        points = np.asarray(points, dtype=np.float64)
+        if timestamp is None:
+            self._clock += self.frame_interval
+            timestamp = self._clock
+        filtered = points.copy()
+
+        # Tangan baru atau lama tidak terlihat: mulai dari posisi mentah
+        rows = []
+        for i, track_id in enumerate(track_ids):
+            hand = self.hands.get(track_id)
+            if hand is None or not 0.0 < timestamp - hand.timestamp <= self.max_gap_s:
+                self.hands[track_id] = FilteredHand(points[i].copy(), timestamp)
+            else:
+                rows.append(i)
+        if not rows:
+            return filtered
+
+        states = [self.hands[track_ids[i]] for i in rows]
+        raw = points[rows]
+        previous = np.stack([hand.points for hand in states])
+        previous_velocity = np.stack([hand.velocity for hand in states])
+        dt = np.array([timestamp - hand.timestamp for hand in states])[:, None, None]
+
+        velocity = (raw - previous) / dt
+        velocity = previous_velocity + smoothing_factor(dt, self.derivative_cutoff) * (velocity - previous_velocity)
+
+        # Kecepatan relatif terhadap ukuran tangan, agar beta tidak bergantung pada jarak ke kamera
+        scale = np.maximum(np.ptp(raw[..., :2], axis=1).max(axis=1), MIN_HAND_SCALE)[:, None, None]
+        cutoff = self.min_cutoff + self.beta * np.abs(velocity) / scale
+        result = previous + smoothing_factor(dt, cutoff) * (raw - previous)
+
+        filtered[rows] = result
+        for hand, hand_points, hand_velocity in zip(states, result, velocity):
+            hand.points = hand_points
+            hand.velocity = hand_velocity
+            hand.timestamp = timestamp
+        return filtered
+
+    def apply(self, hand_landmarks_list, track_ids, timestamp=None):
+        """Filter landmark dan tulis hasilnya kembali ke objek landmark (in-place)"""
+        if not self.enabled or not hand_landmarks_list:
+            return
+        filtered = self.update(track_ids, stack_landmarks(hand_landmarks_list), timestamp)
+        for landmarks, points in zip(hand_landmarks_list, filtered):
+            write_landmarks(landmarks, points)
+
+    def predict(self, track_id, timestamp):
+        """
+        Perkirakan landmark satu tangan pada waktu tertentu dari kecepatan terakhir
+        Returns:
+            Array (21, 3), atau None jika tangan belum punya state
+        """
+        hand = self.hands.get(track_id)
+        if hand is None:
+            return None
+        # Horizon dibatasi: ekstrapolasi jauh lebih buruk daripada menahan posisi
+        horizon = min(max(timestamp - hand.timestamp, 0.0), self.max_prediction_s)
+        return hand.points + hand.velocity * horizon
+
+    def drop_track(self, track_id):
+        self.hands.pop(track_id, None)
+
+    def reset(self):
+        self.hands = {}
@@ -0,0 +1,185 @@
+import json
+import os
+import time
+import numpy as np
+from src.measurement.dimension_calculator import MEASUREMENT_FIELDS
+
+
+class RunningStats:
+    """Mean dan varians streaming (Welford) untuk beberapa seri sekaligus; NaN dilewati"""
+
+    def __init__(self, size):
+        self.count = np.zeros(size, dtype=np.int64)
+        self.mean = np.zeros(size, dtype=np.float64)
+        self.m2 = np.zeros(size, dtype=np.float64)
+
+    def update(self, values):
+        mask = ~np.isnan(values)
+        if not mask.any():
+            return
+        self.count[mask] += 1
+        delta = values[mask] - self.mean[mask]
+        self.mean[mask] += delta / self.count[mask]
+        self.m2[mask] += delta * (values[mask] - self.mean[mask])
+
+    def variance(self):
+        """Varians sampel per seri (NaN jika kurang dari 2 sampel)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 1, self.m2 / np.maximum(self.count - 1, 1), np.nan)
+
+    def ci_half_width(self, z=1.96):
+        """Setengah lebar confidence interval mean per seri"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return z * np.sqrt(self.variance() / self.count)
+
+
+class MeasurementSession:
+    """Statistik pengukuran satu tangan dari muncul sampai konvergen"""
+
+    def __init__(self, track_id, started_at):
+        self.track_id = track_id
+        self.started_at = started_at
+        self.stats = RunningStats(len(MEASUREMENT_FIELDS))
+        self.samples = 0
+        self.missed = 0  # Frame deteksi berturut-turut tanpa tangan ini
+        self.converged = False
+        self.final = None  # Record akhir setelah konvergen
+        self._values = np.empty(len(MEASUREMENT_FIELDS), dtype=np.float64)
+
+    def update(self, dimensions):
+        for i, name in enumerate(MEASUREMENT_FIELDS):
+            self._values[i] = dimensions.get(name, np.nan)
+        self.stats.update(self._values)
+        self.samples += 1
+
+    def means(self):
+        """Mean setiap field yang pernah terukur, format sama dengan dict dimensi"""
+        return {name: float(self.stats.mean[i]) for i, name in enumerate(MEASUREMENT_FIELDS)
+                if self.stats.count[i] > 0}
+
+
+class SessionAggregator:
+    """
+    Agregasi pengukuran per ID tangan selama satu sesi pelanggan. Sesi
+    dinyatakan selesai saat CI setiap dimensi di bawah toleransi; setelah itu
+    deteksi dijalankan jarang sampai tangan baru (belum konvergen) muncul.
+    """
+
+    def __init__(self, config=None, source=None):
+        session = (config or {}).get('session', {})
+        self.source = source  # Nama sumber/stasiun di record akhir (mode multi-kamera)
+        self.tolerance_cm = session.get('tolerance_cm', 0.1)
+        self.confidence_z = session.get('confidence_z', 1.96)
+        self.min_samples = session.get('min_samples', 15)
+        self.idle_detection_interval = session.get('idle_detection_interval', 10)
+        self.end_after_missed = session.get('end_after_missed', 3)
+        self.output_path = session.get('output_path')
+
+        self.sessions = {}  # track_id -> MeasurementSession
+        self.active_ids = []  # ID tangan pada frame deteksi terakhir
+        self.completed = 0
+        self._frames_since_detect = 0
+
+    def update(self, track_ids, dimensions_list, timestamp=None):
+        """
+        Tambahkan pengukuran satu frame deteksi
+        Args:
+            track_ids: ID tangan sesuai urutan dimensions_list
+            dimensions_list: Dict dimensi per tangan (None jika belum terkalibrasi)
+            timestamp: Waktu capture (epoch detik)
+        Returns:
+            List record akhir untuk sesi yang baru saja konvergen
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        self.active_ids = list(track_ids)
+        
+        # Sesi ditutup setelah tangannya hilang beberapa frame deteksi, sehingga
+        # tangan berikutnya di posisi yang sama tetap memulai sesi baru
+        for track_id, session in list(self.sessions.items()):
+            if track_id in self.active_ids:
+                session.missed = 0
+                continue
+            session.missed += 1
+            if session.missed >= self.end_after_missed:
+                del self.sessions[track_id]
+                
+        finished = []
+        for track_id, dimensions in zip(track_ids, dimensions_list):
+            if not dimensions:
+                continue
+            session = self.sessions.get(track_id)
+            if session is None:
+                session = self.sessions[track_id] = MeasurementSession(track_id, timestamp)
+            if session.converged:
+                continue
+
+            session.update(dimensions)
+            if self._is_converged(session):
+                session.converged = True
+                session.final = self._final_record(session, timestamp)
+                self.completed += 1
+                finished.append(session.final)
+                self._write(session.final)
+        return finished
+
+    def _is_converged(self, session):
+        if session.samples < self.min_samples:
+            return False
+        # Hanya field yang pernah terukur; semuanya harus punya cukup sampel
+        measured = session.stats.count > 0
+        if (session.stats.count[measured] < self.min_samples).any():
+            return False
+        half_width = session.stats.ci_half_width(self.confidence_z)[measured]
+        return bool((half_width < self.tolerance_cm).all())
+
+    def _final_record(self, session, timestamp):
+        half_width = session.stats.ci_half_width(self.confidence_z)
+        record = {
+            'hand_id': session.track_id,
+            'started_at': session.started_at,
+            'finished_at': timestamp,
+            'duration_s': timestamp - session.started_at,
+            'samples': session.samples
+        }
+        if self.source is not None:
+            record['source'] = self.source
+        record.update(session.means())
+        for i, name in enumerate(MEASUREMENT_FIELDS):
+            if session.stats.count[i] > 0:
+                record[f'{name}_ci'] = float(half_width[i])
+        return record
+
+    def _write(self, record):
+        if not self.output_path:
+            return
+        directory = os.path.dirname(self.output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Satu baris per pelanggan, cukup jarang untuk ditulis langsung
+        with open(self.output_path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+    def drop(self, track_id):
+        """Tangan sudah pergi: sesinya ditutup"""
+        self.sessions.pop(track_id, None)
+
+    def get(self, track_id):
+        return self.sessions.get(track_id)
+
+    def is_idle(self):
+        """True jika sudah ada sesi selesai dan tidak ada tangan yang sedang diukur"""
+        if self.completed == 0:
+            return False
+        for track_id in self.active_ids:
+            session = self.sessions.get(track_id)
+            if session is None or not session.converged:
+                return False
+        return True
+
+    def should_detect(self):
+        """Dipanggil sekali per frame di tahap inferensi, seperti LatencyController"""
+        if not self.is_idle() or self._frames_since_detect + 1 >= self.idle_detection_interval:
+            self._frames_since_detect = 0
+            return True
+        self._frames_since_detect += 1
+        return False
@@ -0,0 +1,152 @@
+import bisect
+import math
+import numpy as np
+
+
+def sorted_quantile(ordered, q):
+    """Kuantil list terurut dengan interpolasi linear (sama dengan np.percentile default)"""
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class MeasurementSmoother:
+    """
+    Ring buffer (series, window) untuk smoothing semua seri pengukuran sekaligus.
+    Metode:
+        median_iqr: rata-rata setelah membuang outlier di luar IQR; list terurut per seri
+                    diperbarui inkremental (bisect), O(log window) per frame
+        ewma: exponentially weighted moving average, O(1) per frame
+        kalman: filter Kalman 1D per seri, O(1) per frame
+        none: nilai mentah tanpa smoothing
+    """
+
+    METHODS = ('median_iqr', 'ewma', 'kalman', 'none')
+
+    def __init__(self, num_series, window=10, method='median_iqr', min_samples=5,
+                 iqr_threshold=2.0, ewma_alpha=0.3, process_noise=1e-3,
+                 measurement_noise=1e-1):
+        if method not in self.METHODS:
+            raise ValueError(f"Metode smoothing tidak dikenal: {method}")
+
+        self.num_series = num_series
+        self.window = max(1, int(window))
+        self.method = method
+        self.min_samples = min(min_samples, self.window)
+        self.iqr_threshold = iqr_threshold
+        self.ewma_alpha = ewma_alpha
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+
+        self.buffer = np.zeros((num_series, self.window), dtype=np.float64)
+        self.state = np.zeros(num_series, dtype=np.float64)
+        self.variance = np.ones(num_series, dtype=np.float64)
+        # median_iqr: isi ring buffer per seri dalam urutan naik, beserta jumlahnya
+        self.ordered = [[] for _ in range(num_series)]
+        self.sums = [0.0] * num_series
+        self.head = 0
+        self.count = 0    # Jumlah slot terisi di ring buffer
+        self.samples = 0  # Jumlah frame sejak reset
+
+    @classmethod
+    def from_config(cls, num_series, config):
+        """Buat smoother dari bagian 'measurement' di config.yaml"""
+        return cls(
+            num_series,
+            window=config.get('buffer_size', 10),
+            method=config.get('smoothing', 'median_iqr'),
+            min_samples=config.get('min_samples', 5),
+            iqr_threshold=config.get('iqr_threshold', 2.0),
+            ewma_alpha=config.get('ewma_alpha', 0.3),
+            process_noise=config.get('kalman_process_noise', 1e-3),
+            measurement_noise=config.get('kalman_measurement_noise', 1e-1)
+        )
+
+    def reset(self):
+        self.head = 0
+        self.count = 0
+        self.samples = 0
+        self.variance.fill(1.0)
+        self.ordered = [[] for _ in range(self.num_series)]
+        self.sums = [0.0] * self.num_series
+
+    def get_window(self):
+        """Nilai yang valid dalam buffer, shape (series, n)"""
+        if self.count < self.window:
+            return self.buffer[:, :self.count]
+        return self.buffer
+
+    def update(self, values):
+        """
+        Tambahkan satu frame pengukuran dan kembalikan nilai stabil
+        Args:
+            values: Array (series,) untuk frame ini
+        Returns:
+            Array (series,), NaN untuk seri yang belum stabil
+        """
+        # Nilai tertua yang tertimpa harus keluar dari list terurut median_iqr
+        evicted = self.buffer[:, self.head].tolist() if self.count == self.window else None
+        self.buffer[:, self.head] = values
+        self.head = (self.head + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+        self.samples += 1
+
+        if self.method == 'none':
+            return np.array(values, dtype=np.float64)
+        if self.method == 'ewma':
+            return self._update_ewma(values)
+        if self.method == 'kalman':
+            return self._update_kalman(values)
+        return self._robust_mean(values, evicted)
+
+    def _not_ready(self):
+        return np.full(self.num_series, np.nan)
+
+    def _robust_mean(self, values, evicted):
+        for i, value in enumerate(np.asarray(values, dtype=np.float64).tolist()):
+            ordered = self.ordered[i]
+            if evicted is not None:
+                del ordered[bisect.bisect_left(ordered, evicted[i])]
+                self.sums[i] -= evicted[i]
+            bisect.insort(ordered, value)
+            self.sums[i] += value
+        if self.samples % self.window == 0:
+            # Hitung ulang jumlah sesekali agar error pembulatan tidak menumpuk (amortisasi O(1))
+            self.sums = [math.fsum(ordered) for ordered in self.ordered]
+
+        if self.count < self.min_samples:
+            return self._not_ready()
+
+        result = np.full(self.num_series, np.nan)
+        for i, ordered in enumerate(self.ordered):
+            q1 = sorted_quantile(ordered, 0.25)
+            q3 = sorted_quantile(ordered, 0.75)
+            iqr = q3 - q1
+            low = bisect.bisect_left(ordered, q1 - self.iqr_threshold * iqr)
+            high = bisect.bisect_right(ordered, q3 + self.iqr_threshold * iqr)
+            kept = high - low
+            if kept >= 3:
+                # Outlier ada di kedua ujung list dan biasanya sedikit: kurangi dari jumlah total
+                total = self.sums[i] - sum(ordered[:low]) - sum(ordered[high:])
+                result[i] = total / kept
+        return result
+
+    def _update_ewma(self, values):
+        if self.samples == 1:
+            self.state[:] = values
+        else:
+            self.state += self.ewma_alpha * (values - self.state)
+        return self.state.copy() if self.samples >= self.min_samples else self._not_ready()
+
+    def _update_kalman(self, values):
+        if self.samples == 1:
+            self.state[:] = values
+            self.variance.fill(self.measurement_noise)
+        else:
+            # Model konstan: prediksi lalu koreksi
+            self.variance += self.process_noise
+            gain = self.variance / (self.variance + self.measurement_noise)
+            self.state += gain * (values - self.state)
+            self.variance *= (1.0 - gain)
+        return self.state.copy() if self.samples >= self.min_samples else self._not_ready()
@@ -0,0 +1,351 @@
+import collections
+import threading
+import time
+import cv2
+from src.detector.hand_tracker import HandTracker
+from src.detector.landmark_recording import ReplayLandmarks
+from src.export.record_writer import dimensions_to_record
+from src.measurement.landmark_engine import WRIST, Point3D, forearm_endpoints
+from src.profiling.metrics import metrics
+
+MIRROR_MODES = ('pixels', 'landmarks')
+
+
+class DropOldestQueue:
+    """Antrian terbatas yang membuang item tertua saat penuh"""
+
+    def __init__(self, maxsize=2, on_drop=None):
+        self.maxsize = max(1, int(maxsize))
+        self.on_drop = on_drop  # Dipanggil dengan item yang dibuang
+        self._items = collections.deque()
+        self._cond = threading.Condition()
+        self.put_count = 0
+        self.dropped = 0
+
+    def put(self, item):
+        """Masukkan item, buang item tertua jika antrian penuh"""
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                dropped = self._items.popleft()
+                self.dropped += 1
+                if self.on_drop is not None:
+                    self.on_drop(dropped)
+            self._items.append(item)
+            self.put_count += 1
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Ambil item tertua, kembalikan None jika timeout"""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def qsize(self):
+        with self._cond:
+            return len(self._items)
+
+
+class FramePacket:
+    """Data satu frame yang mengalir dari capture ke render"""
+
+    __slots__ = ('index', 'timestamp', 'wall_time', 'frame', 'results', 'hands', 'held')
+
+    def __init__(self, index, timestamp, frame):
+        self.index = index
+        self.timestamp = timestamp
+        self.wall_time = time.time()  # Waktu capture (epoch) untuk ekspor
+        self.frame = frame
+        self.results = None
+        self.hands = []  # List of (track_id, hand_landmarks, dimensions)
+        self.held = False  # True jika hasil deteksi frame sebelumnya dipakai ulang
+
+
+class FramePipeline:
+    """
+    Runtime bertahap: thread capture, worker inferensi, dan tahap render
+    yang dihubungkan dengan antrian terbatas (frame tertua dibuang).
+    Tahap render dijalankan oleh pemanggil di main thread karena
+    cv2.imshow/waitKey harus berjalan di sana.
+    """
+
+    def __init__(self, cap, detector, calculator, queue_size=2, mirror=True, controller=None,
+                 tracker=None, sink=None, aggregator=None, presence_gate=None,
+                 mirror_mode='pixels', frame_pool=None):
+        self.cap = cap
+        self.detector = detector
+        self.calculator = calculator
+        self.tracker = tracker or HandTracker()
+        self.mirror = mirror
+        # 'landmarks': deteksi pada frame asli, koordinat landmark yang dicerminkan;
+        # frame baru di-flip in-place saat akan ditampilkan (display_frame)
+        if mirror_mode not in MIRROR_MODES:
+            raise ValueError(f"Mode mirror tidak dikenal: {mirror_mode} (pilihan: {', '.join(MIRROR_MODES)})")
+        self.mirror_landmarks = mirror and mirror_mode == 'landmarks'
+        self.detector.mirror_landmarks = self.mirror_landmarks
+        self.frame_pool = frame_pool  # FramePool opsional
+        self.controller = controller
+        self.sink = sink  # MeasurementSink opsional, diisi dari thread inferensi
+        self.aggregator = aggregator  # SessionAggregator opsional
+        self.presence_gate = presence_gate  # PresenceGate opsional
+
+        self.capture_queue = DropOldestQueue(queue_size, on_drop=self.release)
+        self.result_queue = DropOldestQueue(queue_size, on_drop=self.release)
+
+        self._stop_event = threading.Event()
+        self._capture_done = threading.Event()
+        self._inference_done = threading.Event()
+        self._threads = []
+        self._start_time = None
+        self.frame_counts = {
+            'capture': 0,
+            'inference': 0,
+            'render': 0
+        }
+
+    def start(self):
+        """Jalankan thread capture dan inferensi"""
+        self._stop_event.clear()
+        self._capture_done.clear()
+        self._inference_done.clear()
+        self._start_time = time.perf_counter()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name='capture', daemon=True),
+            threading.Thread(target=self._inference_loop, name='inference', daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Hentikan semua thread dan tunggu sampai selesai"""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+
+    def is_running(self):
+        if self._stop_event.is_set():
+            return False
+        if not self._inference_done.is_set():
+            return True
+        # Sumber sudah habis, tapi masih ada hasil yang belum dirender
+        return self.result_queue.qsize() > 0
+
+    def _capture_loop(self):
+        index = 0
+        pool = self.frame_pool
+        while not self._stop_event.is_set():
+            buffer = pool.acquire() if pool is not None else None
+            with metrics.timer('capture'):
+                # Dengan buffer dari pool, frame ditulis ke buffer tersebut tanpa alokasi
+                success, frame = self.cap.read(buffer)
+            if not success:
+                break
+
+            # Flip frame horizontally for mirror effect (in-place, tanpa frame baru)
+            if self.mirror and not self.mirror_landmarks:
+                with metrics.timer('flip'):
+                    cv2.flip(frame, 1, dst=frame)
+
+            self.capture_queue.put(FramePacket(index, time.perf_counter(), frame))
+            self.frame_counts['capture'] += 1
+            index += 1
+
+        self._capture_done.set()
+
+    def _inference_loop(self):
+        last_packet = None
+        while not self._stop_event.is_set():
+            packet = self.capture_queue.get(timeout=0.1)
+            if packet is None:
+                if self._capture_done.is_set():
+                    break
+                continue
+
+            gate = self.presence_gate
+            if gate is not None:
+                was_awake = gate.awake
+                if gate.update(packet.frame) != was_awake:
+                    print(f"\nPresence: {'aktif, deteksi tangan dilanjutkan' if gate.awake else 'idle, deteksi tangan dihentikan'}")
+                    if gate.awake:
+                        # Posisi tangan lama tidak berlaku lagi setelah idle
+                        self.detector.reset_tracking()
+                if not gate.awake:
+                    # Tidak ada aktivitas: MediaPipe dilewati sepenuhnya
+                    last_packet = None
+                    self.result_queue.put(packet)
+                    self.frame_counts['inference'] += 1
+                    continue
+
+            controller = self.controller
+            # Setiap pengatur stride dipanggil sekali per frame agar penghitungnya tetap maju
+            allow_detect = [stage.should_detect() for stage in (controller, self.aggregator)
+                            if stage is not None]
+            if last_packet is not None and not all(allow_detect):
+                # Di antara frame deteksi, tahan pengukuran terakhir; landmark diprediksi ke waktu frame ini
+                packet.results = last_packet.results
+                packet.hands = self._predict_hands(last_packet.hands, packet.timestamp)
+                packet.held = True
+            else:
+                self._detect_and_measure(packet)
+                last_packet = packet
+
+            if controller is not None and controller.update():
+                self.detector.inference_scale = controller.inference_scale
+                print(f"\nTitik operasi: {controller.describe()}")
+
+            self.result_queue.put(packet)
+            self.frame_counts['inference'] += 1
+
+        self._inference_done.set()
+
+    def _detect_and_measure(self, packet):
+        start = time.perf_counter()
+        packet.results = self.detector.detect(packet.frame, packet.index, packet.wall_time)
+        detected = time.perf_counter()
+        
+        hand_landmarks_list = list(packet.results.multi_hand_landmarks or [])
+        if self.presence_gate is not None:
+            self.presence_gate.report(bool(hand_landmarks_list))
+        track_ids, dimensions_list = [], []
+        if hand_landmarks_list or self.tracker.tracks:
+            labels = [self.detector.get_handedness(packet.results, i)[0]
+                      for i in range(len(hand_landmarks_list))]
+            track_ids, evicted = self.tracker.update(hand_landmarks_list, labels)
+            for track_id in evicted:
+                self.calculator.drop_track(track_id)
+                if self.aggregator is not None:
+                    self.aggregator.drop(track_id)
+            self.calculator.landmark_filter.apply(hand_landmarks_list, track_ids, packet.timestamp)
+            
+            # Semua tangan diukur dalam satu pass
+            dimensions_list = self.calculator.get_multi_hand_dimensions(
+                hand_landmarks_list, track_ids, getattr(packet.results, 'multi_hand_world_landmarks', None))
+            packet.hands = list(zip(track_ids, hand_landmarks_list, dimensions_list))
+            if self.sink is not None:
+                self._export(packet, track_ids, dimensions_list)
+                
+        if self.aggregator is not None:
+            for record in self.aggregator.update(track_ids, dimensions_list, packet.wall_time):
+                self._finish_session(record)
+
+        detect_ms = (detected - start) * 1000
+        measure_ms = (time.perf_counter() - detected) * 1000
+        metrics.record('detect', detect_ms)
+        metrics.record('measure', measure_ms)
+        if self.controller is not None:
+            self.controller.record('detect', detect_ms)
+            self.controller.record('measure', measure_ms)
+
+    def _predict_hands(self, hands, timestamp):
+        """Landmark tangan yang ditahan, digeser ke posisi perkiraan filter pada waktu frame ini"""
+        landmark_filter = self.calculator.landmark_filter
+        if not landmark_filter.enabled:
+            return hands
+        predicted = []
+        for track_id, hand_landmarks, dimensions in hands:
+            points = landmark_filter.predict(track_id, timestamp)
+            if points is not None:
+                hand_landmarks = ReplayLandmarks(points)
+                if dimensions and 'forearm_points' in dimensions:
+                    dimensions = dict(dimensions, forearm_points={
+                        'wrist': hand_landmarks.landmark[WRIST],
+                        'end': Point3D(*forearm_endpoints(points).tolist())
+                    })
+            predicted.append((track_id, hand_landmarks, dimensions))
+        return predicted
+
+    def _export(self, packet, track_ids, dimensions_list):
+        """Kirim pengukuran frame ini ke sink (tidak pernah menunggu I/O)"""
+        confidence = self.calculator.calibrator.confidence
+        records = []
+        for hand_index, (track_id, dimensions) in enumerate(zip(track_ids, dimensions_list)):
+            if not dimensions:
+                continue
+            label, score = self.detector.get_handedness(packet.results, hand_index)
+            records.append(dimensions_to_record(
+                dimensions,
+                source='live',
+                frame_index=packet.index,
+                timestamp_ms=packet.wall_time * 1000,
+                hand_index=hand_index,
+                hand_id=track_id,
+                handedness=label,
+                handedness_score=score,
+                calibration_confidence=confidence
+            ))
+        self.sink.submit(records)
+
+    def _finish_session(self, record):
+        """Sesi satu tangan konvergen: cetak ringkasan dan kirim record akhir"""
+        print(f"\nPengukuran tangan #{record['hand_id']} selesai: "
+              f"{record['samples']} sampel dalam {record['duration_s']:.1f} s")
+        if self.sink is not None:
+            self.sink.submit([dict(record, source='session',
+                                   timestamp_ms=record['finished_at'] * 1000,
+                                   calibration_confidence=self.calculator.calibrator.confidence)])
+
+    def get_result(self, timeout=0.1):
+        """Ambil frame yang siap dirender (dipanggil dari tahap render)"""
+        return self.result_queue.get(timeout)
+
+    def display_frame(self, packet):
+        """Frame untuk tahap render; pada mode mirror 'landmarks' di-flip in-place di sini"""
+        if self.mirror_landmarks:
+            with metrics.timer('flip'):
+                cv2.flip(packet.frame, 1, dst=packet.frame)
+        return packet.frame
+
+    def release(self, packet):
+        """Kembalikan buffer frame ke pool setelah frame selesai dirender atau dibuang"""
+        if self.frame_pool is not None:
+            self.frame_pool.release(packet.frame)
+            packet.frame = None
+
+    def mark_rendered(self, draw_ms=None):
+        """Dipanggil tahap render setelah frame ditampilkan"""
+        self.frame_counts['render'] += 1
+        if draw_ms is not None and self.controller is not None:
+            self.controller.record('draw', draw_ms)
+
+    def get_stats(self):
+        """Statistik per tahap: kedalaman antrian, frame dibuang, dan FPS"""
+        elapsed = time.perf_counter() - self._start_time if self._start_time else 0.0
+        stats = {}
+        for stage, count in self.frame_counts.items():
+            stats[stage] = {
+                'frames': count,
+                'fps': count / elapsed if elapsed > 0 else 0.0
+            }
+        # Antrian masuk ke tiap tahap
+        stats['inference']['queue_depth'] = self.capture_queue.qsize()
+        stats['inference']['dropped'] = self.capture_queue.dropped
+        stats['render']['queue_depth'] = self.result_queue.qsize()
+        stats['render']['dropped'] = self.result_queue.dropped
+        if self.controller is not None:
+            stats['operating_point'] = self.controller.get_stats()
+        return stats
+
+    def format_stats(self):
+        lines = []
+        stats = self.get_stats()
+        operating_point = stats.pop('operating_point', None)
+        for stage, values in stats.items():
+            line = f"- {stage}: {values['frames']} frame, {values['fps']:.1f} fps"
+            if 'queue_depth' in values:
+                line += f", antrian {values['queue_depth']}, dibuang {values['dropped']}"
+            lines.append(line)
+        if operating_point is not None and operating_point['enabled']:
+            lines.append(f"- titik operasi: {self.controller.describe()}")
+        if self.presence_gate is not None:
+            lines.append(self.presence_gate.format_stats())
+        if self.aggregator is not None:
+            lines.append(f"- sesi: {self.aggregator.completed} pengukuran selesai"
+                         f"{', deteksi idle' if self.aggregator.is_idle() else ''}")
+        if self.sink is not None:
+            lines.append(self.sink.format_stats())
+        if self.frame_pool is not None:
+            lines.append(self.frame_pool.format_stats())
+        return "\n".join(lines)
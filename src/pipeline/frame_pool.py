@@ -0,0 +1,43 @@
+import collections
+import threading
+
+
+class FramePool:
+    """
+    Buffer frame yang dipakai ulang antar tahap pipeline. Frame yang selesai
+    dirender atau dibuang antrian dikembalikan ke pool, sehingga dalam keadaan
+    stabil capture menulis langsung ke buffer lama (cap.read(buffer)) tanpa
+    alokasi frame baru.
+    """
+
+    def __init__(self, max_buffers=8):
+        self.max_buffers = max_buffers
+        self._free = collections.deque()
+        self._lock = threading.Lock()
+        self.allocated = 0  # Pool kosong: pembaca mengalokasikan buffer baru
+        self.reused = 0
+
+    def acquire(self):
+        """Buffer bebas, atau None jika pool kosong"""
+        with self._lock:
+            if self._free:
+                self.reused += 1
+                return self._free.pop()
+            self.allocated += 1
+            return None
+
+    def release(self, frame):
+        """Kembalikan frame ke pool; frame dengan ukuran berbeda dari buffer lain dibuang"""
+        if frame is None:
+            return
+        with self._lock:
+            if self._free and self._free[-1].shape != frame.shape:
+                # Resolusi berubah: buffer lama tidak bisa dipakai lagi
+                self._free.clear()
+            if len(self._free) < self.max_buffers:
+                self._free.append(frame)
+
+    def format_stats(self):
+        total = self.allocated + self.reused
+        reuse = self.reused / total * 100 if total else 0.0
+        return f"- frame pool: {self.allocated} buffer dialokasikan, {reuse:.0f}% frame memakai ulang buffer"
@@ -0,0 +1,142 @@
+class LatencyController:
+    """
+    Memilih resolusi inferensi dan stride deteksi agar target FPS dan
+    latensi end-to-end terpenuhi. Titik operasi diurutkan dari kualitas
+    tertinggi: resolusi diturunkan dulu, lalu deteksi dijalankan setiap N frame.
+    """
+
+    STAGES = ('detect', 'measure', 'draw')
+
+    def __init__(self, config):
+        latency = config.get('latency', {})
+        self.enabled = latency.get('enabled', False)
+        self.target_fps = latency.get('target_fps', config['camera']['fps'])
+        self.max_latency_ms = latency.get('max_latency_ms', 120)
+        self.headroom = latency.get('headroom', 0.7)
+        self.settle_frames = latency.get('settle_frames', 30)
+        self.smoothing = latency.get('smoothing', 0.1)
+        # Biaya terukur per level dilupakan setelah sekian frame agar level dicoba lagi
+        self.probe_interval = latency.get('probe_interval', self.settle_frames * 10)
+
+        scales = sorted(latency.get('inference_scales', [1.0]), reverse=True)
+        max_stride = max(1, latency.get('max_detection_stride', 1))
+        self.operating_points = [(scale, 1) for scale in scales]
+        self.operating_points += [(scales[-1], stride) for stride in range(2, max_stride + 1)]
+
+        self.level = 0
+        self.timings = {stage: None for stage in self.STAGES}
+        self._frames_since_change = 0
+        self._frames_since_detect = 0
+        self._level_cost = {}  # level -> (detect_ms, frame saat diukur)
+        self._frame_count = 0
+        self.changes = 0
+
+    @property
+    def frame_budget_ms(self):
+        return 1000.0 / self.target_fps
+
+    @property
+    def inference_scale(self):
+        return self.operating_points[self.level][0]
+
+    @property
+    def detection_stride(self):
+        return self.operating_points[self.level][1]
+
+    def record(self, stage, elapsed_ms):
+        """Catat waktu satu tahap (EWMA)"""
+        previous = self.timings[stage]
+        if previous is None:
+            self.timings[stage] = elapsed_ms
+        else:
+            self.timings[stage] = previous + self.smoothing * (elapsed_ms - previous)
+
+    def should_detect(self):
+        """Dipanggil sekali per frame di tahap inferensi"""
+        if not self.enabled or self._frames_since_detect + 1 >= self.detection_stride:
+            self._frames_since_detect = 0
+            return True
+        self._frames_since_detect += 1
+        return False
+
+    def estimate(self, level=None, detect_ms=None):
+        """
+        Perkiraan biaya titik operasi (default: titik operasi saat ini)
+        Returns:
+            (ms per frame pada tahap paling lambat, latensi end-to-end ms) atau None
+        """
+        if detect_ms is None:
+            detect_ms = self.timings['detect']
+        if detect_ms is None or self.timings['measure'] is None or self.timings['draw'] is None:
+            return None
+        stride = self.operating_points[self.level if level is None else level][1]
+        inference_ms = detect_ms / stride + self.timings['measure']
+        stage_ms = max(inference_ms, self.timings['draw'])
+        latency_ms = detect_ms + self.timings['measure'] + self.timings['draw']
+        return stage_ms, latency_ms
+
+    def update(self):
+        """
+        Evaluasi anggaran latensi dan pindah titik operasi jika perlu
+        Returns:
+            True jika titik operasi berubah
+        """
+        if not self.enabled:
+            return False
+
+        self._frames_since_change += 1
+        self._frame_count += 1
+        estimate = self.estimate()
+        if estimate is None or self._frames_since_change < self.settle_frames:
+            return False
+
+        self._level_cost[self.level] = (self.timings['detect'], self._frame_count)
+        if not self._fits(estimate, 1.0):
+            if self.level < len(self.operating_points) - 1:
+                self._set_level(self.level + 1)
+                return True
+            return False
+
+        if self.level > 0 and self._fits(estimate, self.headroom) and self._level_fits(self.level - 1):
+            self._set_level(self.level - 1)
+            return True
+        return False
+
+    def _fits(self, estimate, fraction):
+        stage_ms, latency_ms = estimate
+        return (stage_ms <= self.frame_budget_ms * fraction and
+                latency_ms <= self.max_latency_ms * fraction)
+
+    def _level_fits(self, level):
+        """Apakah level yang pernah diukur diperkirakan masuk anggaran"""
+        if level not in self._level_cost:
+            return True
+        detect_ms, measured_at = self._level_cost[level]
+        if self._frame_count - measured_at > self.probe_interval:
+            return True
+        return self._fits(self.estimate(level, detect_ms), 1.0)
+
+    def _set_level(self, level):
+        self.level = level
+        self._frames_since_change = 0
+        self.changes += 1
+        # Waktu deteksi bergantung pada skala, ukur ulang di titik operasi baru
+        self.timings['detect'] = None
+
+    def describe(self):
+        scale, stride = self.operating_points[self.level]
+        return (f"skala inferensi {scale:.2f}, deteksi setiap {stride} frame "
+                f"(level {self.level + 1}/{len(self.operating_points)})")
+
+    def get_stats(self):
+        estimate = self.estimate()
+        return {
+            'enabled': self.enabled,
+            'inference_scale': self.inference_scale,
+            'detection_stride': self.detection_stride,
+            'level': self.level,
+            'changes': self.changes,
+            'timings_ms': dict(self.timings),
+            'stage_ms': estimate[0] if estimate else None,
+            'latency_ms': estimate[1] if estimate else None
+        }
@@ -0,0 +1,477 @@
+import collections
+import math
+import threading
+import time
+import cv2
+import numpy as np
+from src.detector.hand_detector import HandDetector
+from src.detector.calibration import Calibrator
+from src.detector.calibration_store import CalibrationStore, profile_key
+from src.detector.card_detector import TARGET_WIDTH_RATIO
+from src.detector.hand_tracker import HandTracker
+from src.detector.lens_model import LensModel
+from src.measurement.dimension_calculator import DimensionCalculator
+from src.measurement.session_aggregator import SessionAggregator
+from src.export.measurement_sink import MeasurementSink
+from src.export.record_writer import dimensions_to_record
+from src.pipeline.frame_pipeline import DropOldestQueue, FramePacket
+from src.pipeline.frame_pool import FramePool
+from src.profiling.metrics import metrics
+
+PREVIEW_MODES = ('tiled', 'none')
+
+
+def parse_sources(config, overrides=None):
+    """
+    Daftar sumber dari multi_source.sources atau argumen --source
+    Args:
+        overrides: List string dari command line; angka = indeks kamera, selain itu file video
+    Returns:
+        List dict {'name', 'device' atau 'path', ...}
+    """
+    entries = overrides or config.get('multi_source', {}).get('sources') or []
+    sources = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            entry = {'device': int(entry)} if str(entry).isdigit() else {'path': str(entry)}
+        entry = dict(entry)
+        if 'device' not in entry and 'path' not in entry:
+            raise ValueError(f"Sumber #{i + 1} membutuhkan 'device' atau 'path'")
+        entry.setdefault('name', f"stasiun-{i + 1}")
+        sources.append(entry)
+    return sources
+
+
+class Station:
+    """
+    Satu sumber (kamera atau file video) dengan state sendiri: graph MediaPipe
+    dan ROI, tracker, kalibrasi, kalkulator, dan sesi. Diproses oleh paling
+    banyak satu worker pada satu waktu sehingga state tidak perlu dikunci.
+    """
+
+    def __init__(self, spec, config, sink=None):
+        self.spec = spec
+        self.name = spec['name']
+        self.device = spec.get('device')
+        self.path = spec.get('path')
+        # Kamera di-flip seperti mode live, file video tidak
+        self.mirror = spec.get('mirror', self.path is None)
+        # Mode 'landmarks': hanya tile preview yang di-flip, bukan frame penuh
+        self.mirror_landmarks = self.mirror and config.get('pipeline', {}).get('mirror_mode') == 'landmarks'
+        self.config = config
+        self.sink = sink
+
+        self.detector = HandDetector(config)
+        self.detector.mirror_landmarks = self.mirror_landmarks
+        self.tracker = HandTracker(config)
+        self.calibrator = Calibrator()
+        lens = LensModel.load(spec['lens_model']) if spec.get('lens_model') else None
+        if lens is not None:
+            lens.mirrored = self.mirror
+        self.calculator = DimensionCalculator(self.calibrator, config, lens=lens)
+        self.aggregator = None
+        if config.get('session', {}).get('enabled', False):
+            self.aggregator = SessionAggregator(config, source=self.name)
+
+        self.cap = None
+        # Frame yang dibuang sebelum sempat diproses dipakai ulang oleh capture
+        self.frame_pool = FramePool(max_buffers=2) if config.get('pipeline', {}).get('frame_pool', False) else None
+        self.pending = DropOldestQueue(1, on_drop=self._release)  # Hanya frame terbaru yang menunggu worker
+        self.latest = None  # Packet terakhir yang selesai diproses (untuk preview)
+        self._previewing = None  # Packet yang sedang digambar preview, belum boleh dipakai ulang
+        self._latest_lock = threading.Lock()
+        self.ended = False
+        self.queued = False  # Sedang menunggu di antrian scheduler
+        self.busy = False  # Sedang diproses worker
+        self.captured = 0
+        self.processed = 0
+        self.busy_ms = 0.0
+
+    def open(self):
+        """Buka sumber dan terapkan kalibrasi awal"""
+        self.cap = cv2.VideoCapture(self.device if self.path is None else self.path)
+        if self.path is None:
+            camera = self.config['camera']
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.spec.get('width', camera['width']))
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.spec.get('height', camera['height']))
+            self.cap.set(cv2.CAP_PROP_FPS, camera['fps'])
+        if not self.cap.isOpened():
+            raise OSError(f"Sumber '{self.name}' tidak dapat dibuka: {self.path or self.device}")
+
+    def _release(self, packet):
+        if self.frame_pool is not None:
+            self.frame_pool.release(packet.frame)
+
+    def acquire_latest(self):
+        """Packet terbaru untuk preview; frame-nya tidak dikembalikan ke pool sampai release_latest"""
+        with self._latest_lock:
+            self._previewing = self.latest
+            return self._previewing
+
+    def release_latest(self, packet):
+        """Preview selesai membaca packet: kembalikan ke pool jika sudah diganti packet baru"""
+        with self._latest_lock:
+            self._previewing = None
+            if packet is None or packet is self.latest:
+                return
+        self._release(packet)
+
+    def _set_latest(self, packet):
+        with self._latest_lock:
+            previous, self.latest = self.latest, packet
+            if previous is None or previous is self._previewing:
+                return
+        self._release(previous)
+
+    def read(self):
+        """Baca frame berikutnya, ke buffer dari pool jika ada"""
+        buffer = self.frame_pool.acquire() if self.frame_pool is not None else None
+        success, frame = self.cap.read(buffer)
+        if success and self.mirror and not self.mirror_landmarks:
+            cv2.flip(frame, 1, dst=frame)
+        return success, frame
+
+    def calibrate(self, frame_size):
+        """
+        Kalibrasi stasiun: reference_pixels di config sumber, lalu profil aktif
+        kamera (dari 'main.py live'), lalu 17% lebar frame seperti mode batch
+        """
+        self.calculator.distance.frame_size = tuple(frame_size)
+        if self.spec.get('reference_pixels'):
+            self.calibrator.calibrate(self.spec['reference_pixels'], verbose=False)
+            return 'reference_pixels'
+        if self.device is not None:
+            store = CalibrationStore.from_config(self.config)
+            profile = store.load(profile_key(self.device, *frame_size), self.spec.get('profile'))
+            if profile is not None:
+                self.calibrator.apply_profile(profile)
+                return f"profil '{store.active_name(profile_key(self.device, *frame_size))}'"
+        self.calibrator.calibrate(int(frame_size[0] * TARGET_WIDTH_RATIO), verbose=False)
+        return "default 17% lebar frame"
+
+    def process(self, packet):
+        """Deteksi dan ukur satu frame (dipanggil dari thread worker)"""
+        if not self.calibrator.is_calibrated:
+            height, width = packet.frame.shape[:2]
+            print(f"\n[{self.name}] Kalibrasi: {self.calibrate((width, height))}")
+
+        start = time.perf_counter()
+        packet.results = self.detector.detect(packet.frame, packet.index, packet.wall_time)
+        hand_landmarks_list = list(packet.results.multi_hand_landmarks or [])
+        track_ids, dimensions_list = [], []
+        if hand_landmarks_list or self.tracker.tracks:
+            labels = [self.detector.get_handedness(packet.results, i)[0]
+                      for i in range(len(hand_landmarks_list))]
+            track_ids, evicted = self.tracker.update(hand_landmarks_list, labels)
+            for track_id in evicted:
+                self.calculator.drop_track(track_id)
+                if self.aggregator is not None:
+                    self.aggregator.drop(track_id)
+            self.calculator.landmark_filter.apply(hand_landmarks_list, track_ids, packet.timestamp)
+            dimensions_list = self.calculator.get_multi_hand_dimensions(
+                hand_landmarks_list, track_ids, getattr(packet.results, 'multi_hand_world_landmarks', None))
+            packet.hands = list(zip(track_ids, hand_landmarks_list, dimensions_list))
+            if self.sink is not None:
+                self._export(packet, track_ids, dimensions_list)
+
+        if self.aggregator is not None:
+            for record in self.aggregator.update(track_ids, dimensions_list, packet.wall_time):
+                print(f"\n[{self.name}] Pengukuran tangan #{record['hand_id']} selesai: "
+                      f"{record['samples']} sampel dalam {record['duration_s']:.1f} s")
+                if self.sink is not None:
+                    self.sink.submit([dict(record, timestamp_ms=record['finished_at'] * 1000,
+                                           calibration_confidence=self.calibrator.confidence)])
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        metrics.record('multi.process', elapsed_ms)
+        self.busy_ms += elapsed_ms
+        self.processed += 1
+        self._set_latest(packet)
+
+    def _export(self, packet, track_ids, dimensions_list):
+        records = []
+        for hand_index, (track_id, dimensions) in enumerate(zip(track_ids, dimensions_list)):
+            if not dimensions:
+                continue
+            label, score = self.detector.get_handedness(packet.results, hand_index)
+            records.append(dimensions_to_record(
+                dimensions,
+                source=self.name,
+                frame_index=packet.index,
+                timestamp_ms=packet.wall_time * 1000,
+                hand_index=hand_index,
+                hand_id=track_id,
+                handedness=label,
+                handedness_score=score,
+                calibration_confidence=self.calibrator.confidence
+            ))
+        self.sink.submit(records)
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+        self.detector.close()
+
+
+class MultiSourceScheduler:
+    """
+    Satu thread capture per sumber dan pool worker bersama. Sumber dengan
+    frame baru masuk antrian FIFO (adil antar stasiun); worker yang bebas
+    mengambil sumber berikutnya dan memproses frame terbarunya.
+    """
+
+    def __init__(self, stations, workers=2):
+        self.stations = stations
+        self.workers = max(1, int(workers))
+        self._ready = collections.deque()
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._start_time = None
+
+    def start(self):
+        self._stop_event.clear()
+        self._start_time = time.perf_counter()
+        self._threads = [threading.Thread(target=self._capture_loop, args=(station,),
+                                          name=f'capture-{station.name}', daemon=True)
+                         for station in self.stations]
+        self._threads += [threading.Thread(target=self._worker_loop, name=f'worker-{i}', daemon=True)
+                          for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+
+    def is_running(self):
+        """False setelah semua sumber habis dan semua frame sudah diproses"""
+        if self._stop_event.is_set():
+            return False
+        with self._cond:
+            return not all(station.ended and not station.busy and not station.pending.qsize()
+                           for station in self.stations)
+
+    def _capture_loop(self, station):
+        # File video diputar sesuai FPS-nya, seperti kamera
+        interval = 0.0
+        if station.path is not None:
+            fps = station.cap.get(cv2.CAP_PROP_FPS)
+            interval = 1.0 / fps if fps and fps > 0 else 1.0 / 30
+        next_frame = time.perf_counter()
+        index = 0
+        while not self._stop_event.is_set():
+            success, frame = station.read()
+            if not success:
+                break
+            station.pending.put(FramePacket(index, time.perf_counter(), frame))
+            station.captured += 1
+            index += 1
+            self._schedule(station)
+
+            if interval:
+                next_frame += interval
+                delay = next_frame - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        with self._cond:
+            station.ended = True
+            self._cond.notify_all()
+
+    def _schedule(self, station):
+        with self._cond:
+            if not station.queued and not station.busy:
+                station.queued = True
+                self._ready.append(station)
+                self._cond.notify()
+
+    def _worker_loop(self):
+        while not self._stop_event.is_set():
+            with self._cond:
+                while not self._ready and not self._stop_event.is_set():
+                    self._cond.wait(0.1)
+                if self._stop_event.is_set():
+                    break
+                station = self._ready.popleft()
+                station.queued = False
+                station.busy = True
+
+            packet = station.pending.get(timeout=0)
+            if packet is not None:
+                station.process(packet)
+
+            with self._cond:
+                station.busy = False
+                # Frame yang datang selama diproses: jadwalkan lagi di belakang antrian
+                if station.pending.qsize() and not station.queued:
+                    station.queued = True
+                    self._ready.append(station)
+                    self._cond.notify()
+
+    def get_stats(self):
+        elapsed = time.perf_counter() - self._start_time if self._start_time else 0.0
+        stations = {}
+        for station in self.stations:
+            stations[station.name] = {
+                'captured': station.captured,
+                'processed': station.processed,
+                'dropped': station.pending.dropped,
+                'fps': station.processed / elapsed if elapsed > 0 else 0.0,
+                'busy_ms': station.busy_ms
+            }
+        total_busy = sum(station.busy_ms for station in self.stations) / 1000
+        return {
+            'workers': self.workers,
+            'utilization': total_busy / (elapsed * self.workers) if elapsed > 0 else 0.0,
+            'stations': stations
+        }
+
+    def format_stats(self):
+        stats = self.get_stats()
+        lines = [f"- worker: {stats['workers']}, utilisasi {stats['utilization']:.0%}"]
+        for name, values in stats['stations'].items():
+            lines.append(f"- {name}: {values['processed']}/{values['captured']} frame, "
+                         f"{values['fps']:.1f} fps, dibuang {values['dropped']}")
+        return "\n".join(lines)
+
+
+class TiledPreview:
+    """Satu jendela berisi tile setiap stasiun (frame diperkecil dulu, lalu digambar)"""
+
+    def __init__(self, config, stations, tile_width=800):
+        from src.visualization.drawer import Drawer
+        self.stations = stations
+        self.drawers = [Drawer(config, station.calibrator) for station in stations]
+        self.tile_width = tile_width
+        self.columns = math.ceil(math.sqrt(len(stations)))
+        self.rows = math.ceil(len(stations) / self.columns)
+        self.window_title = config.get('visualization', {}).get('window_title', 'Hand Measurement System')
+
+    def render(self):
+        tiles = []
+        tile_height = None
+        for station, drawer in zip(self.stations, self.drawers):
+            packet = station.acquire_latest()
+            if packet is None:
+                tiles.append(None)
+                continue
+            try:
+                tile, tile_height = self._render_tile(station, drawer, packet)
+            finally:
+                station.release_latest(packet)
+            tiles.append(tile)
+
+        tile_height = tile_height or int(self.tile_width * 9 / 16)
+        canvas = np.zeros((tile_height * self.rows, self.tile_width * self.columns, 3), dtype=np.uint8)
+        for i, tile in enumerate(tiles):
+            if tile is None:
+                continue
+            # Tile dengan rasio aspek berbeda dipotong ke ukuran slot
+            tile = tile[:tile_height]
+            row, column = divmod(i, self.columns)
+            y, x = row * tile_height, column * self.tile_width
+            canvas[y:y + tile.shape[0], x:x + self.tile_width] = tile
+
+        cv2.imshow(self.window_title, canvas)
+        return cv2.waitKey(1) & 0xFF
+
+    def _render_tile(self, station, drawer, packet):
+        """Tile satu stasiun dari packet terbaru"""
+        height, width = packet.frame.shape[:2]
+        tile_height = int(height * self.tile_width / width)
+        tile = cv2.resize(packet.frame, (self.tile_width, tile_height), interpolation=cv2.INTER_AREA)
+        if station.mirror_landmarks:
+            # Landmark sudah dicerminkan detektor, flip tile kecil saja
+            cv2.flip(tile, 1, dst=tile)
+        overlays = []
+        for track_id, hand_landmarks, dimensions in sorted(packet.hands, key=lambda hand: hand[0]):
+            session = station.aggregator.get(track_id) if station.aggregator is not None else None
+            title = f"{station.name} #{track_id}"
+            if session is not None and session.converged:
+                dimensions = dict(dimensions or {}, **session.means())
+                title = f"{station.name} #{track_id} SELESAI"
+            overlays.append((hand_landmarks, dimensions or {}, title))
+        tile = drawer.draw_hands(tile, overlays)
+        cv2.putText(tile, station.name, (10, tile_height - 15),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        return tile, tile_height
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+def run_multi_source(config, sources=None, workers=None, preview=None):
+    """
+    Layani beberapa stasiun dalam satu proses
+    Args:
+        sources: Override daftar sumber (list string dari command line)
+        workers: Jumlah worker deteksi (default: multi_source.workers)
+        preview: 'tiled' atau 'none' (default: multi_source.preview)
+    """
+    multi = config.get('multi_source', {})
+    workers = workers or multi.get('workers', 2)
+    preview = preview or multi.get('preview', 'tiled')
+    if preview not in PREVIEW_MODES:
+        raise ValueError(f"Mode preview tidak dikenal: {preview} (pilihan: {', '.join(PREVIEW_MODES)})")
+
+    specs = parse_sources(config, sources)
+    if not specs:
+        print("Error: Tidak ada sumber; isi multi_source.sources di config atau gunakan --source")
+        return
+
+    sink = MeasurementSink.from_config(config)
+    stations = [Station(spec, config, sink) for spec in specs]
+    try:
+        for station in stations:
+            station.open()
+    except OSError as e:
+        print(f"Error: {e}")
+        for station in stations:
+            station.close()
+        return
+
+    print(f"\n=== Hand Measurement System: {len(stations)} stasiun, {workers} worker ===")
+    for station in stations:
+        print(f"- {station.name}: {station.path or f'kamera {station.device}'}")
+    print("Tekan 'q' untuk keluar, 'i' untuk statistik" if preview == 'tiled' else "Tekan Ctrl+C untuk keluar")
+
+    if sink is not None:
+        sink.start()
+    scheduler = MultiSourceScheduler(stations, workers)
+    viewer = TiledPreview(config, stations, multi.get('tile_width', 800)) if preview == 'tiled' else None
+    stats_interval = multi.get('stats_interval_s', 10)
+    next_stats = time.perf_counter() + stats_interval
+    scheduler.start()
+    try:
+        while scheduler.is_running():
+            if viewer is not None:
+                key = viewer.render()
+                if key == ord('q'):
+                    break
+                if key == ord('i'):
+                    print("\nStatistik stasiun:")
+                    print(scheduler.format_stats())
+            else:
+                time.sleep(0.1)
+                if stats_interval and time.perf_counter() >= next_stats:
+                    print("\nStatistik stasiun:")
+                    print(scheduler.format_stats())
+                    next_stats = time.perf_counter() + stats_interval
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+        for station in stations:
+            station.close()
+        if viewer is not None:
+            viewer.close()
+        if sink is not None:
+            sink.stop()
+
+    print("\nStatistik stasiun:")
+    print(scheduler.format_stats())
@@ -0,0 +1,112 @@
+import collections
+import time
+import cv2
+import numpy as np
+from src.profiling.metrics import metrics
+
+
+class PresenceGate:
+    """
+    Gerbang kehadiran: selisih frame pada gambar grayscale kecil menentukan
+    kapan MediaPipe perlu dijalankan. Ambang bangun lebih tinggi dari ambang
+    tetap-bangun (hysteresis) agar tidak berkedip di antara dua keadaan.
+    """
+
+    def __init__(self, config=None):
+        presence = (config or {}).get('presence', {})
+        self.enabled = presence.get('enabled', False)
+        self.size = presence.get('size', 64)
+        self.pixel_threshold = presence.get('pixel_threshold', 15)
+        self.wake_threshold = presence.get('wake_threshold', 0.02)
+        self.stay_threshold = presence.get('stay_threshold', 0.005)
+        self.wake_frames = presence.get('wake_frames', 2)
+        self.sleep_after_s = presence.get('sleep_after_s', 5.0)
+        self.background_alpha = presence.get('background_alpha', 0.05)
+
+        self.awake = True
+        self.motion = 0.0  # Fraksi piksel yang berubah pada frame terakhir
+        self._background = None
+        self._motion_frames = 0
+        self._last_activity = time.monotonic()
+
+        # Duty cycle: total dan untuk jendela frame terakhir
+        self.frames = 0
+        self.awake_frames = 0
+        self.wakeups = 0
+        self._recent = collections.deque(maxlen=presence.get('duty_cycle_window', 300))
+        self._recent_awake = 0
+
+    def _motion_score(self, frame):
+        height, width = frame.shape[:2]
+        # Subsample dulu agar biaya resize tidak bergantung pada resolusi kamera
+        step = max(1, width // (self.size * 4))
+        small_height = max(1, round(height * self.size / width))
+        small = cv2.resize(frame[::step, ::step], (self.size, small_height),
+                           interpolation=cv2.INTER_AREA)
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.float32)
+
+        if self._background is None or self._background.shape != small.shape:
+            self._background = small
+            return 0.0
+
+        diff = cv2.absdiff(small, self._background)
+        cv2.accumulateWeighted(small, self._background, self.background_alpha)
+        return float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+
+    def update(self, frame, now=None):
+        """
+        Evaluasi satu frame (dipanggil sekali per frame di tahap inferensi)
+        Returns:
+            True jika deteksi tangan perlu dijalankan untuk frame ini
+        """
+        now = time.monotonic() if now is None else now
+        with metrics.timer('presence'):
+            self.motion = self._motion_score(frame)
+
+        if self.awake:
+            if self.motion >= self.stay_threshold:
+                self._last_activity = now
+            elif now - self._last_activity >= self.sleep_after_s:
+                self.awake = False
+                self._motion_frames = 0
+        else:
+            # Bangun setelah beberapa frame bergerak berturut-turut (latensi bangun)
+            self._motion_frames = self._motion_frames + 1 if self.motion >= self.wake_threshold else 0
+            if self._motion_frames >= self.wake_frames:
+                self.awake = True
+                self.wakeups += 1
+                self._last_activity = now
+
+        self.frames += 1
+        self.awake_frames += self.awake
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_awake -= self._recent[0]
+        self._recent.append(self.awake)
+        self._recent_awake += self.awake
+        return self.awake
+
+    def report(self, hands_present, now=None):
+        """Tangan yang terdeteksi menahan gerbang tetap terbuka walau tanpa gerakan"""
+        if hands_present:
+            self._last_activity = time.monotonic() if now is None else now
+
+    def duty_cycle(self, recent=False):
+        """Fraksi frame yang menjalankan deteksi tangan"""
+        if recent:
+            return self._recent_awake / len(self._recent) if self._recent else 1.0
+        return self.awake_frames / self.frames if self.frames else 1.0
+
+    def get_stats(self):
+        return {
+            'awake': self.awake,
+            'duty_cycle': self.duty_cycle(),
+            'recent_duty_cycle': self.duty_cycle(recent=True),
+            'wakeups': self.wakeups,
+            'motion': self.motion
+        }
+
+    def format_stats(self):
+        stats = self.get_stats()
+        return (f"- presence: duty cycle {stats['duty_cycle']:.1%} "
+                f"({stats['recent_duty_cycle']:.1%} terakhir), bangun {stats['wakeups']}x, "
+                f"{'aktif' if stats['awake'] else 'idle'}")
@@ -0,0 +1,237 @@
+import http.server
+import json
+import os
+import threading
+import time
+import numpy as np
+
+QUANTILES = (50, 95, 99)
+
+
+class StageStats:
+    """Ring buffer durasi (ms) untuk satu tahap"""
+
+    def __init__(self, window):
+        self.samples = np.zeros(window, dtype=np.float64)
+        self.head = 0
+        self.count = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+
+    def add(self, elapsed_ms):
+        self.samples[self.head] = elapsed_ms
+        self.head = (self.head + 1) % len(self.samples)
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+
+    def summary(self):
+        window = self.samples[:min(self.count, len(self.samples))]
+        p50, p95, p99 = np.percentile(window, QUANTILES) if window.size else (0.0, 0.0, 0.0)
+        return {
+            'count': self.count,
+            'mean_ms': float(window.mean()) if window.size else 0.0,
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'last_ms': self.last_ms,
+            'total_ms': self.total_ms
+        }
+
+
+class _StageTimer:
+    __slots__ = ('stats', 'start')
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add((time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """Kumpulan timer per tahap dengan persentil bergulir dan FPS"""
+
+    def __init__(self, window=600):
+        self.enabled = False
+        self.window = window
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._frame_times = np.zeros(window, dtype=np.float64)
+        self._frame_head = 0
+        self._frame_count = 0
+
+    def configure(self, config):
+        """Atur dari bagian 'profiling' di config.yaml"""
+        self.enabled = config.get('enabled', False)
+        self.window = config.get('window', self.window)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+            self._frame_times = np.zeros(self.window, dtype=np.float64)
+            self._frame_head = 0
+            self._frame_count = 0
+
+    def _get_stage(self, stage):
+        stats = self._stages.get(stage)
+        if stats is None:
+            with self._lock:
+                stats = self._stages.setdefault(stage, StageStats(self.window))
+        return stats
+
+    def timer(self, stage):
+        """Context manager untuk mengukur satu tahap"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self._get_stage(stage))
+
+    def record(self, stage, elapsed_ms):
+        if self.enabled:
+            self._get_stage(stage).add(elapsed_ms)
+
+    def tick_frame(self):
+        """Tandai satu frame selesai ditampilkan (untuk FPS)"""
+        if not self.enabled:
+            return
+        self._frame_times[self._frame_head] = time.perf_counter()
+        self._frame_head = (self._frame_head + 1) % len(self._frame_times)
+        self._frame_count += 1
+
+    def fps(self):
+        n = min(self._frame_count, len(self._frame_times))
+        if n < 2:
+            return 0.0
+        newest = self._frame_times[(self._frame_head - 1) % len(self._frame_times)]
+        oldest = self._frame_times[(self._frame_head - n) % len(self._frame_times)]
+        return (n - 1) / (newest - oldest) if newest > oldest else 0.0
+
+    def snapshot(self):
+        with self._lock:
+            stages = list(self._stages.items())
+        return {
+            'timestamp': time.time(),
+            'fps': self.fps(),
+            'frames': self._frame_count,
+            'stages': {name: stats.summary() for name, stats in stages}
+        }
+
+    def to_json(self, snapshot=None):
+        return json.dumps(snapshot or self.snapshot())
+
+    def to_prometheus(self, snapshot=None):
+        """Format teks eksposisi Prometheus"""
+        snapshot = snapshot or self.snapshot()
+        lines = [
+            "# HELP hand_measurement_fps Rendered frames per second",
+            "# TYPE hand_measurement_fps gauge",
+            f"hand_measurement_fps {snapshot['fps']:.3f}",
+            "# HELP hand_measurement_frames_total Rendered frames",
+            "# TYPE hand_measurement_frames_total counter",
+            f"hand_measurement_frames_total {snapshot['frames']}",
+            "# HELP hand_measurement_stage_latency_ms Stage latency over the rolling window",
+            "# TYPE hand_measurement_stage_latency_ms summary"
+        ]
+        for stage, summary in sorted(snapshot['stages'].items()):
+            for quantile in QUANTILES:
+                lines.append(
+                    f'hand_measurement_stage_latency_ms{{stage="{stage}",quantile="{quantile / 100}"}} '
+                    f"{summary[f'p{quantile}_ms']:.4f}")
+            lines.append(f'hand_measurement_stage_latency_ms_sum{{stage="{stage}"}} {summary["total_ms"]:.4f}')
+            lines.append(f'hand_measurement_stage_latency_ms_count{{stage="{stage}"}} {summary["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+# Registry bersama untuk satu proses; nonaktif sampai dikonfigurasi
+metrics = MetricsRegistry()
+
+
+class MetricsExporter:
+    """Dump JSON berkala, file Prometheus, dan endpoint HTTP /metrics (opsional)"""
+
+    def __init__(self, registry, config):
+        self.registry = registry
+        self.interval_s = config.get('log_interval_s', 10)
+        self.json_log_path = config.get('json_log_path')
+        self.prometheus_path = config.get('prometheus_path')
+        self.prometheus_port = config.get('prometheus_port')
+        self._next_export = time.monotonic() + self.interval_s
+        self._server = None
+
+        if self.registry.enabled and self.prometheus_port:
+            self._start_server()
+
+    def _start_server(self):
+        registry = self.registry
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', self.prometheus_port), Handler)
+        threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True).start()
+        print(f"Metrics Prometheus: http://127.0.0.1:{self.prometheus_port}/metrics")
+
+    def maybe_export(self):
+        """Dipanggil sekali per frame; ekspor hanya jika interval sudah lewat"""
+        if not self.registry.enabled or time.monotonic() < self._next_export:
+            return
+        self._next_export = time.monotonic() + self.interval_s
+        self.export()
+
+    def export(self):
+        snapshot = self.registry.snapshot()
+        if self.json_log_path:
+            _ensure_parent(self.json_log_path)
+            with open(self.json_log_path, 'a') as f:
+                f.write(self.registry.to_json(snapshot) + "\n")
+        if self.prometheus_path:
+            # Tulis atomik agar collector tidak membaca file setengah jadi
+            _ensure_parent(self.prometheus_path)
+            tmp_path = self.prometheus_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(self.registry.to_prometheus(snapshot))
+            os.replace(tmp_path, self.prometheus_path)
+
+    def close(self):
+        if self.registry.enabled:
+            self.export()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+def _ensure_parent(path):
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
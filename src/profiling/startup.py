@@ -0,0 +1,35 @@
+import time
+
+
+class StartupReport:
+    """Durasi setiap fase startup, dihitung sejak modul ini diimport"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []  # List of (nama fase, ms)
+        self.done = False
+
+    def mark(self, phase):
+        """Tutup fase yang sedang berjalan dan mulai fase berikutnya"""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def finish(self, phase):
+        """Tandai fase terakhir; fase setelah ini tidak lagi dicatat"""
+        if not self.done:
+            self.mark(phase)
+            self.done = True
+
+    def total_ms(self):
+        return (self.last - self.start) * 1000
+
+    def format(self):
+        lines = [f"- {phase}: {ms:.0f} ms" for phase, ms in self.phases]
+        lines.append(f"- total: {self.total_ms():.0f} ms")
+        return "\n".join(lines)
+
+
+# Satu instance per proses, dibuat saat import pertama
+startup = StartupReport()
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import signal
+from src.service.measurement_service import (
+    MeasurementRequest, MeasurementService, ServiceBusy, parse_reference_pixels
+)
+from src.service.protocol import (
+    WS_BINARY, WS_CLOSE, WS_TEXT, HttpError,
+    encode_frame, encode_response, read_frame, read_request, websocket_accept
+)
+
+IMAGE_CONTENT_TYPES = ('image/jpeg', 'image/png', 'application/octet-stream')
+
+
+def latency_headers(result):
+    """Header latensi per request dari hasil MeasurementService"""
+    latency = result['latency_ms']
+    return {
+        'X-Queue-Ms': f"{latency['queue']:.3f}",
+        'X-Process-Ms': f"{latency['process']:.3f}",
+        'X-Total-Ms': f"{latency['total']:.3f}",
+        'X-Batch-Size': str(result['batch_size']),
+        'Server-Timing': f"queue;dur={latency['queue']:.3f}, process;dur={latency['process']:.3f}"
+    }
+
+
+class MeasurementServer:
+    """
+    Layanan HTTP/WebSocket lokal di atas asyncio:
+        POST /measure  body JPEG/PNG, atau JSON {'landmarks': ..., 'frame_size': ..., 'reference_pixels': ...}
+        GET  /ws       WebSocket: pesan biner = gambar, pesan teks = JSON landmark
+        GET  /health, GET /stats
+    Parameter query: reference_pixels (kalibrasi), landmarks=1 (sertakan landmark hasil deteksi).
+    """
+
+    def __init__(self, service, host='127.0.0.1', port=8765, max_body_bytes=8 * 1024 * 1024):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.max_body_bytes = max_body_bytes
+        self._server = None
+
+    async def start(self):
+        await self.service.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Port 0: pakai port yang dipilih sistem
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.service.stop()
+
+    def _parse(self, content_type, body, query):
+        """MeasurementRequest dari body HTTP atau pesan WebSocket"""
+        try:
+            reference_pixels = parse_reference_pixels(query.get('reference_pixels') or None)
+        except ValueError as e:
+            raise HttpError(400, str(e))
+        include_landmarks = query.get('landmarks') in ('1', 'true')
+        if content_type in IMAGE_CONTENT_TYPES:
+            if not body:
+                raise HttpError(400, "Body gambar kosong")
+            return MeasurementRequest('image', body, reference_pixels=reference_pixels,
+                                      include_landmarks=include_landmarks)
+        if content_type == 'application/json':
+            try:
+                request = MeasurementRequest.from_landmarks(json.loads(body))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                raise HttpError(400, "JSON tidak valid")
+            except (ValueError, AttributeError) as e:
+                raise HttpError(400, str(e))
+            if request.reference_pixels is None:
+                request.reference_pixels = reference_pixels
+            return request
+        raise HttpError(400, f"Content-Type tidak didukung: {content_type or '-'} "
+                             f"(gunakan image/jpeg, image/png, atau application/json)")
+
+    async def _measure(self, request):
+        try:
+            return await self.service.measure(request)
+        except ServiceBusy as e:
+            raise HttpError(503, str(e))
+        except ValueError as e:
+            raise HttpError(400, str(e))
+        except Exception as e:
+            print(f"Error: Request gagal diproses: {e!r}")
+            raise HttpError(500, "Request gagal diproses")
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader, self.max_body_bytes)
+                    if request is None:
+                        break
+                    if request.path == '/ws' and request.is_websocket:
+                        await self._handle_websocket(request, reader, writer)
+                        break
+                    status, body, headers = await self._route(request)
+                except HttpError as e:
+                    # Body mungkin belum terbaca: koneksi ditutup setelah respons error
+                    writer.write(encode_response(e.status, {'error': e.message}, keep_alive=False))
+                    await writer.drain()
+                    break
+                writer.write(encode_response(status, body, headers=headers, keep_alive=request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, request):
+        if request.path == '/measure':
+            if request.method != 'POST':
+                return 405, {'error': "Gunakan POST"}, None
+            try:
+                result = await self._measure(self._parse(request.content_type, request.body, request.query))
+            except HttpError as e:
+                # Body sudah terbaca penuh, koneksi tetap bisa dipakai
+                return e.status, {'error': e.message}, None
+            return 200, result, latency_headers(result)
+        if request.method != 'GET':
+            return 405, {'error': "Gunakan GET"}, None
+        if request.path == '/health':
+            return 200, {'status': 'ok'}, None
+        if request.path == '/stats':
+            return 200, self.service.get_stats(), None
+        return 404, {'error': f"Path tidak dikenal: {request.path}"}, None
+
+    async def _handle_websocket(self, request, reader, writer):
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {websocket_accept(request.headers['sec-websocket-key'])}\r\n\r\n"
+        ).encode('latin-1'))
+        await writer.drain()
+
+        while True:
+            try:
+                # Ping dijawab di dalam read_frame agar pesan terfragmentasi tetap utuh
+                opcode, payload = await read_frame(reader, self.max_body_bytes, writer)
+            except HttpError as e:
+                # 1009: pesan terlalu besar, 1002: pelanggaran protokol
+                code = 1009 if e.status == 413 else 1002
+                writer.write(encode_frame(WS_CLOSE, code.to_bytes(2, 'big')))
+                await writer.drain()
+                return
+            if opcode == WS_CLOSE:
+                writer.write(encode_frame(WS_CLOSE, payload[:2]))
+                await writer.drain()
+                return
+            if opcode not in (WS_TEXT, WS_BINARY):
+                continue
+
+            # Pesan dijawab berurutan; latensi ada di body karena WebSocket tidak punya header per pesan
+            content_type = 'image/jpeg' if opcode == WS_BINARY else 'application/json'
+            try:
+                result = await self._measure(self._parse(content_type, payload, request.query))
+            except HttpError as e:
+                result = {'error': e.message, 'status': e.status}
+            writer.write(encode_frame(WS_TEXT, json.dumps(result)))
+            await writer.drain()
+
+
+async def serve(config, host=None, port=None, workers=None):
+    service_config = config.get('service', {})
+    service = MeasurementService(config, workers=workers)
+    server = MeasurementServer(service,
+                               host=host or service_config.get('host', '127.0.0.1'),
+                               port=port if port is not None else service_config.get('port', 8765),
+                               max_body_bytes=int(service_config.get('max_body_mb', 8) * 1024 * 1024))
+    await server.start()
+    print("\n=== Hand Measurement Service ===")
+    print(f"- Alamat: http://{server.host}:{server.port} (WebSocket: ws://{server.host}:{server.port}/ws)")
+    print(f"- Worker: {service.workers}, batch maksimum {service.max_batch}, "
+          f"jendela batch {service.batch_window_s * 1000:.1f} ms")
+    print(f"- Kalibrasi default: {service.describe_calibration()}")
+    if service.lens is not None:
+        print(f"- Model lensa: {service.lens.describe()}")
+    print("Tekan Ctrl+C untuk berhenti\n")
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows: Ctrl+C tetap menghentikan loop lewat KeyboardInterrupt
+            pass
+    try:
+        await stop_event.wait()
+    finally:
+        await server.stop()
+        print("\nStatistik layanan:")
+        print(service.format_stats())
+
+
+def run_service(config, host=None, port=None, workers=None):
+    try:
+        asyncio.run(serve(config, host, port, workers))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,374 @@
+import asyncio
+import concurrent.futures
+import math
+import time
+import cv2
+import numpy as np
+from src.detector.calibration import Calibrator
+from src.detector.calibration_store import CalibrationStore, profile_key
+from src.detector.hand_detector import HandDetector
+from src.detector.lens_model import LensModel
+from src.detector.landmark_recording import ReplayLandmarks
+from src.measurement.dimension_calculator import DimensionCalculator
+from src.measurement.landmark_engine import NUM_LANDMARKS, landmarks_to_array
+from src.export.record_writer import dimensions_to_record
+from src.profiling.metrics import metrics
+
+REQUEST_KINDS = ('image', 'landmarks')
+
+# Rasio kartu referensi terhadap lebar frame, sama dengan mode batch
+REFERENCE_WIDTH_RATIO = 0.17
+
+# Kalkulator yang disimpan per worker (satu per nilai kalibrasi)
+MAX_CALIBRATIONS = 32
+
+
+class ServiceBusy(Exception):
+    """Antrian layanan penuh"""
+
+
+def parse_reference_pixels(value):
+    """reference_pixels dari klien sebagai float positif, None jika tidak diisi; ValueError jika tidak valid"""
+    if value is None:
+        return None
+    try:
+        reference_pixels = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("reference_pixels harus berupa angka")
+    if not math.isfinite(reference_pixels) or reference_pixels <= 0:
+        raise ValueError("reference_pixels harus lebih besar dari 0")
+    return reference_pixels
+
+
+def parse_frame_size(value):
+    """frame_size dari klien sebagai (width, height) positif, None jika tidak diisi"""
+    if value is None:
+        return None
+    try:
+        width, height = (int(n) for n in value)
+    except (TypeError, ValueError):
+        raise ValueError("frame_size harus berupa [width, height]")
+    if width <= 0 or height <= 0:
+        raise ValueError("frame_size harus lebih besar dari 0")
+    return width, height
+
+
+class MeasurementRequest:
+    """Satu request pengukuran: gambar (JPEG/PNG) atau array landmark"""
+
+    __slots__ = ('kind', 'payload', 'frame_size', 'reference_pixels', 'include_landmarks',
+                 'future', 'received')
+
+    def __init__(self, kind, payload, frame_size=None, reference_pixels=None, include_landmarks=False):
+        if kind not in REQUEST_KINDS:
+            raise ValueError(f"Jenis request tidak dikenal: {kind}")
+        self.kind = kind
+        self.payload = payload  # Bytes gambar atau array (N_hands, 21, 3)
+        self.frame_size = frame_size  # (width, height); untuk gambar diisi setelah decode
+        self.reference_pixels = parse_reference_pixels(reference_pixels)
+        self.include_landmarks = include_landmarks
+        self.future = None
+        self.received = time.perf_counter()
+
+    @classmethod
+    def from_landmarks(cls, data):
+        """
+        Request dari JSON {'landmarks': [[[x, y, z] x 21], ...], 'frame_size': [w, h],
+        'reference_pixels': n}; satu tangan (21, 3) juga diterima
+        """
+        try:
+            points = np.asarray(data['landmarks'], dtype=np.float64)
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Field 'landmarks' harus berupa array angka (N, 21, 3)")
+        if points.ndim == 2:
+            points = points[None]
+        if points.ndim != 3 or points.shape[1:] != (NUM_LANDMARKS, 3):
+            raise ValueError(f"Bentuk landmarks {points.shape} tidak valid, harus (N, 21, 3)")
+        if not np.isfinite(points).all():
+            raise ValueError("Landmarks berisi NaN/inf")
+        return cls('landmarks', points, parse_frame_size(data.get('frame_size')),
+                   parse_reference_pixels(data.get('reference_pixels')))
+
+
+class ServiceWorker:
+    """
+    State satu worker: HandDetector mode statis dan satu kalkulator per
+    kalibrasi. Dipakai paling banyak satu thread pada satu waktu.
+    """
+
+    def __init__(self, config, default_reference, profile, default_frame_size, lens=None):
+        self.config = config
+        self.detector = HandDetector(config, static_image_mode=True)
+        self.default_reference = default_reference
+        self.profile = profile
+        self.default_frame_size = default_frame_size
+        self.lens = lens
+        self.calculators = {}  # (kunci kalibrasi, pakai lensa) -> DimensionCalculator
+
+    def _calculator(self, group_key):
+        calculator = self.calculators.get(group_key)
+        if calculator is None:
+            if len(self.calculators) >= MAX_CALIBRATIONS:
+                # reference_pixels dari klien bisa bermacam-macam, buang yang paling lama
+                self.calculators.pop(next(iter(self.calculators)))
+            key, use_lens = group_key
+            calibrator = Calibrator()
+            if key == 'profile':
+                calibrator.apply_profile(self.profile)
+            elif not calibrator.calibrate(key, verbose=False):
+                # Kalkulator tanpa kalibrasi tidak disimpan: hasilnya hanya dimensi nol
+                raise ValueError(f"Kalibrasi gagal untuk reference_pixels {key}")
+            calculator = self.calculators[group_key] = DimensionCalculator(
+                calibrator, self.config, lens=self.lens if use_lens else None)
+        return calculator
+
+    def _uses_lens(self, request):
+        """Model lensa hanya berlaku untuk frame dengan rasio aspek yang sama"""
+        return self.lens is not None and self.lens.matches(request.frame_size or self.default_frame_size)
+
+    def _calibration_key(self, request):
+        """Kalibrasi: reference_pixels request, lalu config, lalu profil aktif, lalu 17% lebar frame"""
+        reference = request.reference_pixels if request.reference_pixels is not None else self.default_reference
+        if reference is not None:
+            return float(reference)
+        if self.profile is not None:
+            return 'profile'
+        width = (request.frame_size or self.default_frame_size)[0]
+        return float(int(width * REFERENCE_WIDTH_RATIO))
+
+    def run_batch(self, requests):
+        """
+        Proses satu micro-batch (dipanggil dari thread worker)
+        Returns:
+            List hasil (dict) atau exception per request, urutan sama dengan input
+        """
+        outcomes = [None] * len(requests)
+        hands = []  # (indeks request, landmarks, handedness, skor)
+        for i, request in enumerate(requests):
+            try:
+                if request.kind == 'image':
+                    hands.extend(self._detect(i, request))
+                else:
+                    hands.extend((i, ReplayLandmarks(points), None, None) for points in request.payload)
+            except ValueError as e:
+                outcomes[i] = e
+
+        # Semua tangan dengan kalibrasi yang sama diukur dalam satu pass vektor
+        groups = {}
+        for hand in hands:
+            request = requests[hand[0]]
+            groups.setdefault((self._calibration_key(request), self._uses_lens(request)), []).append(hand)
+        results = {i: [] for i in range(len(requests)) if outcomes[i] is None}
+        for key, group in groups.items():
+            try:
+                calculator = self._calculator(key)
+            except ValueError as e:
+                for index, _, _, _ in group:
+                    outcomes[index] = e
+                continue
+            # Request saling independen: tanpa smoothing, ID tangan hanya urutan dalam batch
+            dimensions_list = calculator.get_multi_hand_dimensions(
+                [landmarks for _, landmarks, _, _ in group], list(range(len(group))))
+            confidence = calculator.calibrator.confidence
+            for (index, landmarks, label, score), dimensions in zip(group, dimensions_list):
+                record = dimensions_to_record(
+                    dimensions,
+                    source='service',
+                    hand_index=len(results[index]),
+                    handedness=label,
+                    handedness_score=score,
+                    calibration_confidence=confidence
+                )
+                if requests[index].include_landmarks:
+                    record['landmarks'] = landmarks_to_array(landmarks).round(5).tolist()
+                results[index].append(record)
+
+        for i, request in enumerate(requests):
+            if outcomes[i] is None:
+                outcomes[i] = {
+                    'hands': results[i],
+                    'frame_size': list(request.frame_size or self.default_frame_size)
+                }
+        return outcomes
+
+    def _detect(self, index, request):
+        frame = cv2.imdecode(np.frombuffer(request.payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError("Gambar tidak dapat di-decode (kirim JPEG atau PNG)")
+        request.frame_size = (frame.shape[1], frame.shape[0])
+        results = self.detector.detect(frame)
+        return [(index, hand_landmarks) + HandDetector.get_handedness(results, hand_index)
+                for hand_index, hand_landmarks in enumerate(results.multi_hand_landmarks or [])]
+
+    def close(self):
+        self.detector.close()
+
+
+class MeasurementService:
+    """
+    Antrian request asyncio yang digabung menjadi micro-batch untuk pool
+    worker. Batch baru dibentuk saat ada worker yang bebas: selama semua
+    worker sibuk request menumpuk di antrian, sehingga ukuran batch naik
+    mengikuti beban tanpa menambah latensi saat sepi.
+    """
+
+    def __init__(self, config, workers=None, max_batch=None, batch_window_ms=None, max_pending=None):
+        service = config.get('service', {})
+        self.workers = workers or service.get('workers', 2)
+        self.max_batch = max_batch or service.get('max_batch', 8)
+        self.batch_window_s = (batch_window_ms if batch_window_ms is not None
+                               else service.get('batch_window_ms', 2.0)) / 1000.0
+        self.max_pending = max_pending or service.get('max_pending', 64)
+
+        # Request saling independen: tanpa smoothing/filter landmark antar frame dan tanpa estimasi jarak per track
+        self.config = dict(config,
+                           measurement=dict(config.get('measurement', {}), smoothing='none'),
+                           depth=dict(config.get('depth', {}), enabled=False),
+                           landmark_filter=dict(config.get('landmark_filter', {}), enabled=False))
+        camera = config['camera']
+        self.default_frame_size = (camera['width'], camera['height'])
+        # Nilai config tidak valid gagal saat start, bukan per request
+        self.default_reference = parse_reference_pixels(service.get('reference_pixels') or None)
+        self.profile = None
+        if not self.default_reference:
+            store = CalibrationStore.from_config(config)
+            self.profile = store.load(profile_key(camera.get('device', 0), camera['width'], camera['height']))
+        # Frame dari klien diproses apa adanya (tidak di-flip seperti preview live)
+        self.lens = LensModel.from_config(config, mirrored=False)
+
+        self._queue = None
+        self._idle = None
+        self._executor = None
+        self._batch_task = None
+        self._workers = []
+        self._running = set()
+
+        self.started = None
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_requests = 0
+
+    def describe_calibration(self):
+        if self.default_reference:
+            return f"reference_pixels {self.default_reference}"
+        if self.profile is not None:
+            return "profil kalibrasi aktif kamera"
+        return "17% lebar frame (tanpa profil kalibrasi)"
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._idle = asyncio.Queue()
+        self._executor = concurrent.futures.ThreadPoolExecutor(self.workers, thread_name_prefix='service')
+        for _ in range(self.workers):
+            worker = ServiceWorker(self.config, self.default_reference, self.profile, self.default_frame_size,
+                                   lens=self.lens)
+            self._workers.append(worker)
+            self._idle.put_nowait(worker)
+        self.started = time.perf_counter()
+        self._batch_task = asyncio.get_running_loop().create_task(self._batch_loop())
+
+    async def stop(self):
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            try:
+                await self._batch_task
+            except asyncio.CancelledError:
+                pass
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+        for worker in self._workers:
+            worker.close()
+
+    async def measure(self, request):
+        """
+        Masukkan request ke antrian dan tunggu hasilnya
+        Returns:
+            Dict hasil dengan 'latency_ms' dan 'batch_size'
+        Raises:
+            ServiceBusy jika antrian penuh, ValueError jika input tidak valid
+        """
+        if self._queue.qsize() >= self.max_pending:
+            self.rejected += 1
+            raise ServiceBusy(f"Antrian penuh ({self.max_pending} request)")
+        request.future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(request)
+        return await request.future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            worker = await self._idle.get()
+            batch = [await self._queue.get()]
+            # Request yang sudah menunggu langsung ikut; sisanya ditunggu sebentar
+            deadline = loop.time() + self.batch_window_s
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0 or not self._running:
+                    # Tidak ada batch lain yang berjalan: layanan sepi, kirim langsung
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = loop.create_task(self._run_batch(worker, batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, worker, batch):
+        dispatched = time.perf_counter()
+        try:
+            outcomes = await asyncio.get_running_loop().run_in_executor(
+                self._executor, worker.run_batch, batch)
+        except Exception as e:
+            outcomes = [e] * len(batch)
+        finally:
+            self._idle.put_nowait(worker)
+        finished = time.perf_counter()
+
+        self.batches += 1
+        self.batched_requests += len(batch)
+        metrics.record('service.batch', (finished - dispatched) * 1000)
+        for request, outcome in zip(batch, outcomes):
+            queue_ms = (dispatched - request.received) * 1000
+            metrics.record('service.queue', queue_ms)
+            if request.future.done():
+                # Klien sudah putus
+                continue
+            if isinstance(outcome, Exception):
+                self.failed += 1
+                request.future.set_exception(outcome)
+                continue
+            self.completed += 1
+            outcome['batch_size'] = len(batch)
+            outcome['latency_ms'] = {
+                'queue': round(queue_ms, 3),
+                'process': round((finished - dispatched) * 1000, 3),
+                'total': round((finished - request.received) * 1000, 3)
+            }
+            request.future.set_result(outcome)
+
+    def get_stats(self):
+        elapsed = time.perf_counter() - self.started if self.started else 0.0
+        return {
+            'workers': self.workers,
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'batches': self.batches,
+            'mean_batch_size': self.batched_requests / self.batches if self.batches else 0.0,
+            'requests_per_s': self.completed / elapsed if elapsed > 0 else 0.0
+        }
+
+    def format_stats(self):
+        stats = self.get_stats()
+        return (f"- request: {stats['completed']} selesai, {stats['failed']} gagal, "
+                f"{stats['rejected']} ditolak, {stats['requests_per_s']:.1f} request/s\n"
+                f"- batch: {stats['batches']}, rata-rata {stats['mean_batch_size']:.2f} request per batch, "
+                f"{stats['workers']} worker")
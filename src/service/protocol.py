@@ -0,0 +1,202 @@
+import base64
+import hashlib
+import json
+import os
+import struct
+import urllib.parse
+
+# Status HTTP yang dipakai layanan
+STATUS_TEXT = {
+    101: 'Switching Protocols',
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    411: 'Length Required',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable'
+}
+
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+# Opcode frame WebSocket (RFC 6455)
+WS_TEXT = 0x1
+WS_BINARY = 0x2
+WS_CLOSE = 0x8
+WS_PING = 0x9
+WS_PONG = 0xA
+
+MAX_HEADER_LINES = 100
+MAX_CONTROL_PAYLOAD = 125
+
+
+class HttpError(Exception):
+    """Error yang dikirim ke klien sebagai respons JSON dengan status tertentu"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class HttpRequest:
+    __slots__ = ('method', 'path', 'query', 'headers', 'body')
+
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query  # Dict nilai terakhir per parameter
+        self.headers = headers  # Nama header huruf kecil
+        self.body = body
+
+    @property
+    def keep_alive(self):
+        return self.headers.get('connection', '').lower() != 'close'
+
+    @property
+    def content_type(self):
+        return self.headers.get('content-type', '').split(';')[0].strip().lower()
+
+    @property
+    def is_websocket(self):
+        return (self.headers.get('upgrade', '').lower() == 'websocket' and
+                'sec-websocket-key' in self.headers)
+
+
+async def read_request(reader, max_body_bytes):
+    """
+    Baca satu request HTTP/1.1 dari stream (body dengan Content-Length)
+    Returns:
+        HttpRequest, atau None jika koneksi ditutup sebelum request baru
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+    except ValueError:
+        raise HttpError(400, "Baris request tidak valid")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HttpError(400, "Header terlalu banyak")
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise HttpError(411, "Transfer-Encoding chunked tidak didukung, kirim Content-Length")
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise HttpError(400, "Content-Length harus bilangan bulat")
+    if length < 0:
+        raise HttpError(400, "Content-Length tidak boleh negatif")
+    if length > max_body_bytes:
+        raise HttpError(413, f"Body melebihi {max_body_bytes} byte")
+    body = await reader.readexactly(length) if length else b''
+
+    url = urllib.parse.urlsplit(target)
+    query = dict(urllib.parse.parse_qsl(url.query))
+    return HttpRequest(method.upper(), url.path, query, headers, body)
+
+
+def encode_response(status, body=b'', content_type='application/json', headers=None, keep_alive=True):
+    """Bytes respons HTTP/1.1 lengkap"""
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body).encode()
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+             f"Content-Type: {content_type}",
+             f"Content-Length: {len(body)}",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+def websocket_accept(key):
+    """Nilai Sec-WebSocket-Accept untuk Sec-WebSocket-Key klien"""
+    digest = hashlib.sha1((key + WEBSOCKET_GUID).encode('latin-1')).digest()
+    return base64.b64encode(digest).decode('latin-1')
+
+
+def encode_frame(opcode, payload, mask=False):
+    """
+    Satu frame WebSocket final. Klien wajib memakai mask, server tidak.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode()
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack('!H', length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack('!Q', length)
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = _apply_mask(payload, key)
+    return bytes(header) + payload
+
+
+async def read_frame(reader, max_payload_bytes, writer=None):
+    """
+    Baca satu pesan WebSocket (frame lanjutan digabung)
+    Ping di antara frame lanjutan dijawab langsung lewat writer (jika ada) dan pong
+    diabaikan, sehingga potongan pesan yang sedang dibaca tidak hilang.
+    Returns:
+        (opcode, payload bytes)
+    """
+    message_opcode = None
+    chunks = []
+    size = 0
+    while True:
+        first, second = await reader.readexactly(2)
+        final = first & 0x80
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', await reader.readexactly(8))[0]
+        if opcode >= WS_CLOSE:
+            # Frame kontrol tidak dihitung dalam ukuran pesan, tetapi dibatasi RFC 6455
+            if length > MAX_CONTROL_PAYLOAD:
+                raise HttpError(400, f"Frame kontrol melebihi {MAX_CONTROL_PAYLOAD} byte")
+        else:
+            size += length
+            if size > max_payload_bytes:
+                raise HttpError(413, f"Pesan melebihi {max_payload_bytes} byte")
+        key = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+        if key is not None:
+            payload = _apply_mask(payload, key)
+
+        if opcode == WS_PING and writer is not None:
+            writer.write(encode_frame(WS_PONG, payload))
+            await writer.drain()
+            continue
+        if opcode in (WS_PING, WS_PONG):
+            continue
+        if opcode >= WS_CLOSE:
+            return opcode, payload
+        if opcode != 0:
+            message_opcode = opcode
+        chunks.append(payload)
+        if final:
+            return message_opcode, b''.join(chunks)
+
+
+def _apply_mask(payload, key):
+    # XOR dengan kunci 4 byte, dihitung sebagai satu integer besar agar tidak per byte di Python
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, 'little') ^ int.from_bytes(repeated, 'little')).to_bytes(len(payload), 'little')
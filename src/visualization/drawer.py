@@ -1,14 +1,72 @@
 import cv2
-import mediapipe as mp
 import numpy as np
-import math
+from src.detector.card_detector import calibration_target_rect
+from src.measurement.landmark_engine import (
+    FINGERS, FINGER_DIP, FINGER_TIP, HAND_CONNECTIONS, WRIST, landmarks_to_array, stack_landmarks
+)
+from src.profiling.metrics import metrics
+from src.visualization.overlay import OverlayBatch, dashed_rectangle_segments, dashed_segments
+
+PANEL_WIDTH = 330
+PANEL_HEIGHT = 410
+PANEL_HEADER_HEIGHT = 35
+PANEL_COLOR = 40
+PANEL_ALPHA = 0.85
+PANEL_GAP = 10  # Jarak antar panel saat beberapa tangan ditampilkan
+PANEL_TITLE = "PENGUKURAN TANGAN & LENGAN"
+
+# Gaya landmark seperti mp_draw.draw_landmarks dengan DrawingSpec sebelumnya
+LANDMARK_COLOR = (180, 180, 180)
+CONNECTION_COLOR = (140, 140, 140)
+LANDMARK_BORDER_COLOR = (224, 224, 224)  # WHITE_COLOR MediaPipe
+LANDMARK_RADIUS = 1
+
+CONNECTION_START = np.array([start for start, _ in HAND_CONNECTIONS], dtype=np.intp)
+CONNECTION_END = np.array([end for _, end in HAND_CONNECTIONS], dtype=np.intp)
+TIP_INDEX = np.array([FINGER_TIP[finger] for finger in FINGERS], dtype=np.intp)
+DIP_INDEX = np.array([FINGER_DIP[finger] for finger in FINGERS], dtype=np.intp)
+
+GRADIENT_STEPS = 50
+
+
+def render_layer(shape, draw):
+    """
+    Render fungsi gambar menjadi layer piksel + alpha.
+    Digambar di atas hitam dan putih sehingga alpha teks antialias ikut terhitung.
+    Returns:
+        (ys, xs, color, inv_alpha) hanya untuk piksel yang tersentuh, atau None
+    """
+    black = np.zeros(shape, dtype=np.uint8)
+    white = np.full(shape, 255, dtype=np.uint8)
+    draw(black)
+    draw(white)
+    
+    # Di atas hitam: warna * a, di atas putih: warna * a + 255 * (1 - a)
+    coverage = 255 - (white.astype(np.int16) - black).min(axis=2)
+    ys, xs = np.nonzero(coverage)
+    if ys.size == 0:
+        return None
+    color = black[ys, xs].astype(np.float32) + 0.5  # +0.5 untuk pembulatan
+    inv_alpha = ((255 - coverage[ys, xs]) / 255.0).astype(np.float32)[:, None]
+    return (ys, xs, color, inv_alpha)
+
+
+def blit_layer(frame, layer, origin=(0, 0)):
+    """Komposisikan layer ke frame, hanya pada piksel yang tersentuh layer"""
+    ys, xs, color, inv_alpha = layer
+    if origin != (0, 0):
+        ys = ys + origin[1]
+        xs = xs + origin[0]
+    if ys[-1] >= frame.shape[0] or xs.max() >= frame.shape[1]:
+        # Layer melewati tepi frame
+        inside = (ys < frame.shape[0]) & (xs < frame.shape[1])
+        ys, xs, color, inv_alpha = ys[inside], xs[inside], color[inside], inv_alpha[inside]
+    frame[ys, xs] = frame[ys, xs] * inv_alpha + color
 
 class Drawer:
     def __init__(self, config, calibrator):
         self.config = config
         self.calibrator = calibrator
-        self.mp_draw = mp.solutions.drawing_utils
-        self.mp_hands = mp.solutions.hands
         self.colors = {
             'thumb': (0, 120, 255),     # Biru
             'index': (0, 255, 0),       # Hijau
@@ -25,110 +83,64 @@ class Drawer:
             'pinky': 'Kelingking',
             'forearm': 'Lengan Bawah'
         }
+        
+        # Layer statis yang dirender sekali lalu dipakai ulang setiap frame
+        self._guide_layers = {}      # (width, height) -> layer
+        self._panel_cache = {}       # slot panel -> (teks yang dirender, layer)
 
     def draw_dashed_rectangle(self, frame, start_point, end_point, color, thickness=2, dash_length=10):
-        """Helper function to draw dashed rectangle"""
-        x1, y1 = start_point
-        x2, y2 = end_point
+        """Helper function to draw dashed rectangle (semua dash dalam satu cv2.polylines)"""
+        cv2.polylines(frame, dashed_rectangle_segments(start_point, end_point, dash_length),
+                      False, color, thickness)
+
+    def _render_calibration_guide(self, width, height):
+        """Render panduan kalibrasi sekali per resolusi menjadi layer"""
+        center_x = width // 2
+        
+        # Gambar area target untuk kartu (17% lebar frame, rasio kartu kredit standar)
+        card_x1, card_y1, card_x2, card_y2 = calibration_target_rect(width, height)
         
-        # Draw horizontal dashed lines
-        for x in range(x1, x2, dash_length * 2):
-            x_end = min(x + dash_length, x2)
-            # Top line
-            cv2.line(frame, (x, y1), (x_end, y1), color, thickness)
-            # Bottom line
-            cv2.line(frame, (x, y2), (x_end, y2), color, thickness)
+        def draw(canvas):
+            # Gambar kotak panduan dengan garis putus-putus
+            self.draw_dashed_rectangle(canvas, 
+                                     (card_x1, card_y1),
+                                     (card_x2, card_y2),
+                                     (0, 255, 0), 2)
             
-        # Draw vertical dashed lines
-        for y in range(y1, y2, dash_length * 2):
-            y_end = min(y + dash_length, y2)
-            # Left line
-            cv2.line(frame, (x1, y), (x1, y_end), color, thickness)
-            # Right line
-            cv2.line(frame, (x2, y), (x2, y_end), color, thickness)
+            # Tambahkan teks panduan
+            cv2.putText(canvas, "Posisikan kartu di dalam kotak",
+                        (card_x1, card_y1 - 20),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            
+            # Tambahkan indikator jarak
+            cv2.line(canvas, (center_x, height - 50), (center_x, height - 30),
+                    (0, 255, 0), 2)
+            cv2.putText(canvas, "50cm", (center_x - 20, height - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        
+        return render_layer((height, width, 3), draw)
 
     def draw_calibration_guide(self, frame):
         """Menambahkan panduan visual untuk kalibrasi kartu"""
         height, width, _ = frame.shape
-        center_x = width // 2
-        
-        # Gambar area target untuk kartu
-        card_width = int(width * 0.17)  # 17% dari lebar frame
-        card_height = int(card_width * 0.63)  # Rasio kartu kredit standar
-        
-        card_x1 = center_x - (card_width // 2)
-        card_x2 = center_x + (card_width // 2)
-        card_y1 = height // 2 - (card_height // 2)
-        card_y2 = height // 2 + (card_height // 2)
-        
-        # Gambar kotak panduan dengan garis putus-putus
-        self.draw_dashed_rectangle(frame, 
-                                 (card_x1, card_y1),
-                                 (card_x2, card_y2),
-                                 (0, 255, 0), 2)
-        
-        # Tambahkan teks panduan
-        cv2.putText(frame, "Posisikan kartu di dalam kotak",
-                    (card_x1, card_y1 - 20),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-        
-        # Tambahkan indikator jarak
-        cv2.line(frame, (center_x, height - 50), (center_x, height - 30),
-                (0, 255, 0), 2)
-        cv2.putText(frame, "50cm", (center_x - 20, height - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        key = (width, height)
+        if key not in self._guide_layers:
+            self._guide_layers[key] = self._render_calibration_guide(width, height)
+            
+        if self._guide_layers[key] is not None:
+            blit_layer(frame, self._guide_layers[key])
         
         return frame
 
-    def create_info_panel(self, frame, dimensions):
-        """Membuat panel informasi dengan gaya Windows"""
-        if dimensions is None:
-            return frame
-            
-        height, width, _ = frame.shape
-        panel_width = 330
-        
-        # Buat panel semi-transparan dengan warna abu-abu gelap
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), 
-                     (panel_width, 410), (40, 40, 40), -1)
-        
-        # Tambahkan transparansi
-        alpha = 0.85
-        frame = cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0)
-
-        # Header panel
-        cv2.rectangle(frame, (0, 0), (panel_width, 35), (60, 60, 60), -1)
-        cv2.putText(frame, "PENGUKURAN TANGAN & LENGAN", 
-                   (10, 25),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-
-        # Tampilkan hasil pengukuran
-        y_position = 50
+    def _get_panel_rows(self, dimensions):
+        """Teks setiap baris panel; juga dipakai sebagai kunci cache"""
+        rows = []
         
         # Tampilkan pengukuran lengan bawah terlebih dahulu
         if 'forearm_length_cm' in dimensions:
-            color = self.colors['forearm']
             length_cm = dimensions['forearm_length_cm']
-            
-            cv2.rectangle(frame, 
-                        (10, y_position - 2),
-                        (20, y_position + 8),
-                        color, -1)
-            
-            text1 = "Lengan Bawah"
-            text2 = f"Panjang: {length_cm:.1f} cm"
-            
-            cv2.putText(frame, text1,
-                       (30, y_position + 8),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5,
-                       (200, 200, 200), 1)
-            cv2.putText(frame, text2,
-                       (30, y_position + 28),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5,
-                       (180, 180, 180), 1)
-                       
-            y_position += 55
+            rows.append(('forearm', "Lengan Bawah",
+                         f"Panjang: {length_cm:.1f} cm"))
 
         # Tampilkan pengukuran jari-jari
         for finger_name, indo_name in self.finger_names.items():
@@ -139,165 +151,264 @@ class Drawer:
                 if length_key in dimensions and tip_dip_key in dimensions:
                     length_cm = dimensions[length_key]
                     tip_to_dip_cm = dimensions[tip_dip_key]
-                    color = self.colors[finger_name]
-                    
-                    cv2.rectangle(frame, 
-                                (10, y_position - 2),
-                                (20, y_position + 8),
-                                color, -1)
-                    
-                    text1 = f"{indo_name}"
-                    text2 = f"Ke pergelangan: {length_cm:.1f} cm"
-                    text3 = f"Ke ruas pertama: {tip_to_dip_cm:.1f} cm"
-                    
-                    cv2.putText(frame, text1,
-                               (30, y_position + 8),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5,
-                               (200, 200, 200), 1)
-                    cv2.putText(frame, text2,
-                               (30, y_position + 28),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5,
-                               (180, 180, 180), 1)
-                    cv2.putText(frame, text3,
-                               (30, y_position + 48),
+                    rows.append((finger_name, f"{indo_name}",
+                                 f"Ke pergelangan: {length_cm:.1f} cm",
+                                 f"Ke ruas pertama: {tip_to_dip_cm:.1f} cm"))
+        
+        return tuple(rows)
+
+    def _render_panel(self, rows, title):
+        """Render header dan baris teks panel menjadi layer"""
+        def draw(canvas):
+            # Header panel
+            cv2.rectangle(canvas, (0, 0), (PANEL_WIDTH, PANEL_HEADER_HEIGHT), (60, 60, 60), -1)
+            cv2.putText(canvas, title, 
+                       (10, 25),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+            
+            y_position = 50
+            for finger_name, *texts in rows:
+                cv2.rectangle(canvas, 
+                            (10, y_position - 2),
+                            (20, y_position + 8),
+                            self.colors[finger_name], -1)
+                
+                for i, text in enumerate(texts):
+                    cv2.putText(canvas, text,
+                               (30, y_position + 8 + 20 * i),
                                cv2.FONT_HERSHEY_SIMPLEX, 0.5,
-                               (180, 180, 180), 1)
+                               (200, 200, 200) if i == 0 else (180, 180, 180), 1)
                                
-                    y_position += 55
+                y_position += 55
+        
+        # +1 karena cv2.rectangle menyertakan titik akhirnya
+        return render_layer((PANEL_HEIGHT + 1, PANEL_WIDTH + 1, 3), draw)
+
+    def create_info_panel(self, frame, dimensions, panel_index=0, title=None):
+        """
+        Membuat panel informasi dengan gaya Windows
+        Args:
+            panel_index: Slot panel dari kiri, satu slot per tangan
+            title: Judul header (default: PANEL_TITLE)
+        """
+        if dimensions is None:
+            return frame
+            
+        height, width, _ = frame.shape
+        origin_x = panel_index * (PANEL_WIDTH + 1 + PANEL_GAP)
+        if origin_x >= width:
+            return frame
+        panel_h = min(PANEL_HEIGHT + 1, height)
+        panel_w = min(PANEL_WIDTH + 1, width - origin_x)
+        
+        # Panel semi-transparan abu-abu gelap, hanya pada area panel:
+        # alpha * warna_panel + (1 - alpha) * frame, ditulis langsung ke frame
+        roi = frame[:panel_h, origin_x:origin_x + panel_w]
+        cv2.convertScaleAbs(roi, dst=roi, alpha=1 - PANEL_ALPHA,
+                            beta=PANEL_ALPHA * PANEL_COLOR)
+        
+        # Teks dirender ulang hanya jika nilai yang ditampilkan berubah
+        key = (title or PANEL_TITLE, self._get_panel_rows(dimensions))
+        cached = self._panel_cache.get(panel_index)
+        if cached is None or cached[0] != key:
+            cached = (key, self._render_panel(key[1], key[0]))
+            self._panel_cache[panel_index] = cached
+            
+        blit_layer(frame, cached[1], origin=(origin_x, 0))
 
         return frame
 
+    def _add_landmarks(self, batch, points, width, height):
+        """
+        Koneksi dan titik landmark semua tangan; titik di luar frame dilewati seperti mp_draw
+        Args:
+            points: Array (N_hands, 21, 3) landmark ternormalisasi
+        """
+        valid = ((points[..., 0] >= 0) & (points[..., 0] <= 1) &
+                 (points[..., 1] >= 0) & (points[..., 1] <= 1))
+        pixels = np.empty(points.shape[:-1] + (2,), dtype=np.int32)
+        pixels[..., 0] = np.minimum(np.floor(points[..., 0] * width), width - 1)
+        pixels[..., 1] = np.minimum(np.floor(points[..., 1] * height), height - 1)
+
+        connected = valid[:, CONNECTION_START] & valid[:, CONNECTION_END]
+        segments = np.stack([pixels[:, CONNECTION_START], pixels[:, CONNECTION_END]], axis=2)
+        batch.lines(segments[connected], CONNECTION_COLOR)
+        # Lingkaran tepi putih lalu isi, sama seperti DrawingSpec(circle_radius=1, thickness=1)
+        batch.circles(pixels[valid], LANDMARK_RADIUS + 1, LANDMARK_BORDER_COLOR, 1)
+        batch.circles(pixels[valid], LANDMARK_RADIUS, LANDMARK_COLOR, 1)
+
+    def _add_gradient_lines(self, batch, start_points, end_points, color, thickness):
+        """Garis gradien: GRADIENT_STEPS lingkaran dengan intensitas menurun per garis"""
+        start_points = np.asarray(start_points, dtype=np.float64).reshape(-1, 1, 2)
+        end_points = np.asarray(end_points, dtype=np.float64).reshape(-1, 1, 2)
+        alpha = (np.arange(GRADIENT_STEPS) / float(GRADIENT_STEPS))[:, None]
+        centers = np.trunc(start_points * (1 - alpha) + end_points * alpha).astype(np.int64)
+
+        intensity = np.trunc(255 * (1 - alpha * 0.3))
+        colors = np.minimum(np.asarray(color) + 30, intensity)
+        batch.gradient_circles(centers, np.tile(colors, (len(start_points), 1)), thickness)
+
+    def _add_measurement_lines(self, batch, points, dimensions_list, width, height):
+        """
+        Garis lengan bawah dan garis pengukuran jari semua tangan sekaligus
+        Args:
+            points: Array (N_hands, 21, 3) landmark ternormalisasi
+            dimensions_list: Dict dimensi per tangan
+        """
+        # Gambar garis lengan bawah
+        forearms = [dimensions['forearm_points'] for dimensions in dimensions_list
+                    if 'forearm_points' in dimensions]
+        if forearms:
+            ends = np.array([[(p['wrist'].x, p['wrist'].y), (p['end'].x, p['end'].y)]
+                             for p in forearms]) * (width, height)
+            ends = np.trunc(ends).astype(np.int64)
+            self._add_gradient_lines(batch, ends[:, 0], ends[:, 1], self.colors['forearm'], 2)
+            batch.circles(ends.reshape(-1, 2), 4, self.colors['forearm'])
+
+        # Koordinat pixel dibulatkan ke nol seperti int()
+        pixels = np.trunc(points[..., :2] * (width, height)).astype(np.int32)
+        wrists = pixels[:, WRIST]
+        tips = pixels[:, TIP_INDEX]
+        dips = pixels[:, DIP_INDEX]
+        dashes, dash_pair, short = dashed_segments(tips.reshape(-1, 2), dips.reshape(-1, 2),
+                                                   5, (height, width))
+        dash_finger = dash_pair % len(FINGERS)
+        
+        # Semua garis dulu lalu semua titik: titik ujung/ruas tidak tertimpa garis jari lain
+        # dan seluruh titik menjadi satu penulisan piksel
+        for i, finger_name in enumerate(FINGERS):
+            color = self.colors[finger_name]
+            # Garis pergelangan -> ujung jari, lalu garis putus-putus ujung -> ruas pertama
+            batch.lines(np.stack([wrists, tips[:, i]], axis=1), color)
+            batch.lines(dashes[dash_finger == i], color)
+        for i, finger_name in enumerate(FINGERS):
+            color = self.colors[finger_name]
+            batch.circles(tips.reshape(-1, 2)[short[short % len(FINGERS) == i]], 1, color)
+            batch.circles(np.stack([tips[:, i], dips[:, i]], axis=1), 3, color)
+
     def draw_measurement_lines(self, frame, hand_landmarks, dimensions):
         """Menggambar garis pengukuran"""
         if hand_landmarks and dimensions:
             height, width, _ = frame.shape
-            
-            # Gambar garis lengan bawah
-            if 'forearm_points' in dimensions:
-                wrist = dimensions['forearm_points']['wrist']
-                forearm_end = dimensions['forearm_points']['end']
-                
-                wrist_px = (int(wrist.x * width), int(wrist.y * height))
-                forearm_end_px = (int(forearm_end.x * width), int(forearm_end.y * height))
-                
-                self.draw_gradient_line(frame, wrist_px, forearm_end_px, self.colors['forearm'], 2)
-                cv2.circle(frame, wrist_px, 4, self.colors['forearm'], -1)
-                cv2.circle(frame, forearm_end_px, 4, self.colors['forearm'], -1)
-            
-            wrist = hand_landmarks.landmark[0]
-            wrist_px = (int(wrist.x * width), int(wrist.y * height))
-            
-            finger_tips = {
-                'thumb': 4,
-                'index': 8,
-                'middle': 12,
-                'ring': 16,
-                'pinky': 20
-            }
-            
-            finger_dips = {
-                'thumb': 3,
-                'index': 7,
-                'middle': 11,
-                'ring': 15,
-                'pinky': 19
-            }
-            
-            for finger_name in finger_tips.keys():
-                tip = hand_landmarks.landmark[finger_tips[finger_name]]
-                dip = hand_landmarks.landmark[finger_dips[finger_name]]
-                
-                tip_px = (int(tip.x * width), int(tip.y * height))
-                dip_px = (int(dip.x * width), int(dip.y * height))
-                color = self.colors[finger_name]
-                
-                cv2.line(frame, wrist_px, tip_px, color, 1)
-                self.draw_dashed_line(frame, tip_px, dip_px, color)
-                
-                cv2.circle(frame, tip_px, 3, color, -1)
-                cv2.circle(frame, dip_px, 3, color, -1)
+            batch = OverlayBatch()
+            self._add_measurement_lines(batch, landmarks_to_array(hand_landmarks)[None], [dimensions],
+                                        width, height)
+            batch.draw(frame)
 
     def draw_gradient_line(self, frame, start_point, end_point, color, thickness):
         """Menggambar garis dengan efek gradien"""
-        num_steps = 50
-        for i in range(num_steps):
-            alpha = i / float(num_steps)
-            x = int(start_point[0] * (1 - alpha) + end_point[0] * alpha)
-            y = int(start_point[1] * (1 - alpha) + end_point[1] * alpha)
-            
-            intensity = int(255 * (1 - alpha * 0.3))
-            current_color = (
-                min(color[0] + 30, intensity),
-                min(color[1] + 30, intensity),
-                min(color[2] + 30, intensity)
-            )
-            
-            cv2.circle(frame, (x, y), thickness, current_color, -1)
+        batch = OverlayBatch()
+        self._add_gradient_lines(batch, start_point, end_point, color, thickness)
+        batch.draw(frame)
 
     def draw_dashed_line(self, frame, p1, p2, color, dash_length=5):
         """Menggambar garis putus-putus dengan penanganan kasus khusus"""
-        dx = p2[0] - p1[0]
-        dy = p2[1] - p1[1]
-        dist = math.sqrt(dx * dx + dy * dy)
-        
+        segments, _, short = dashed_segments([p1], [p2], dash_length, frame.shape)
         # Jika jarak terlalu kecil, gambar titik saja
-        if dist < 1:
-            cv2.circle(frame, p1, 1, color, -1)
+        if len(short):
+            cv2.circle(frame, tuple(p1), 1, color, -1)
             return
-        
-        # Normalisasi vektor arah
-        dx = dx / dist
-        dy = dy / dist
-        
-        curr_x = p1[0]
-        curr_y = p1[1]
-        step = dash_length * 2
-        
-        for i in range(0, int(dist), step):
-            x1 = int(curr_x)
-            y1 = int(curr_y)
-            x2 = int(curr_x + dx * dash_length)
-            y2 = int(curr_y + dy * dash_length)
-            
-            # Pastikan koordinat valid
-            x2 = min(max(x2, 0), frame.shape[1] - 1)
-            y2 = min(max(y2, 0), frame.shape[0] - 1)
-            
-            cv2.line(frame, (x1, y1), (x2, y2), color, 1)
-            curr_x += dx * step
-            curr_y += dy * step
+        cv2.polylines(frame, segments, False, color, 1)
 
     def draw_landmarks(self, frame, hand_landmarks):
         """Gambar landmark dengan tampilan minimal"""
-        self.mp_draw.draw_landmarks(
-            frame,
-            hand_landmarks,
-            self.mp_hands.HAND_CONNECTIONS,
-            self.mp_draw.DrawingSpec(
-                color=(180, 180, 180),
-                thickness=1,
-                circle_radius=1
-            ),
-            self.mp_draw.DrawingSpec(
-                color=(140, 140, 140),
-                thickness=1
-            )
-        )
-
-    def draw_frame(self, frame, hand_landmarks, dimensions):
-        """Fungsi utama untuk menggambar semua elemen"""
-        # Tambahkan panduan kalibrasi jika belum terkalibrasi
-        if not self.calibrator.is_calibrated:
-            frame = self.draw_calibration_guide(frame)
+        height, width, _ = frame.shape
+        batch = OverlayBatch()
+        self._add_landmarks(batch, landmarks_to_array(hand_landmarks)[None], width, height)
+        batch.draw(frame)
+
+    def draw_overlays(self, frame, hands):
+        """
+        Landmark dan garis pengukuran semua tangan dalam satu batch
+        Args:
+            hands: List of (hand_landmarks, dimensions)
+        """
+        hands = [(hand_landmarks, dimensions) for hand_landmarks, dimensions in hands if hand_landmarks]
+        if not hands:
+            return frame
+        height, width, _ = frame.shape
+        points = stack_landmarks([hand_landmarks for hand_landmarks, _ in hands])
+        measured = [i for i, (_, dimensions) in enumerate(hands) if dimensions]
+
+        batch = OverlayBatch()
+        self._add_landmarks(batch, points, width, height)
+        if measured:
+            self._add_measurement_lines(batch, points[measured], [hands[i][1] for i in measured],
+                                        width, height)
+        batch.draw(frame)
+        return frame
+
+    def draw_hands(self, frame, hands):
+        """
+        Gambar semua tangan dalam satu frame: overlay semua tangan dikirim
+        sekaligus, lalu panel informasi per tangan
+        Args:
+            hands: List of (hand_landmarks, dimensions, title); urutan = slot panel
+        """
+        # Tambahkan panduan kalibrasi jika belum terkalibrasi (sekali per frame)
+        if hands and not self.calibrator.is_calibrated:
+            with metrics.timer('draw.guide'):
+                frame = self.draw_calibration_guide(frame)
             
-        if hand_landmarks:
-            # Gambar landmark
-            self.draw_landmarks(frame, hand_landmarks)
+        with metrics.timer('draw.overlay'):
+            self.draw_overlays(frame, [(hand_landmarks, dimensions) for hand_landmarks, dimensions, _ in hands])
             
-            # Gambar garis pengukuran
-            self.draw_measurement_lines(frame, hand_landmarks, dimensions)
+        # Tambahkan panel informasi
+        with metrics.timer('draw.panel'):
+            for panel_index, (hand_landmarks, dimensions, title) in enumerate(hands):
+                if hand_landmarks:
+                    frame = self.create_info_panel(frame, dimensions, panel_index, title)
+            
+        return frame
+
+    def draw_frame(self, frame, hand_landmarks, dimensions, panel_index=0, title=None):
+        """
+        Fungsi utama untuk menggambar semua elemen untuk satu tangan
+        Args:
+            panel_index: Slot panel informasi untuk tangan ini
+            title: Judul panel (mis. ID tangan pada mode multi-tangan)
+        """
+        # Tambahkan panduan kalibrasi jika belum terkalibrasi (sekali per frame)
+        if not self.calibrator.is_calibrated and panel_index == 0:
+            with metrics.timer('draw.guide'):
+                frame = self.draw_calibration_guide(frame)
+            
+        if hand_landmarks:
+            with metrics.timer('draw.overlay'):
+                self.draw_overlays(frame, [(hand_landmarks, dimensions)])
             
             # Tambahkan panel informasi
-            frame = self.create_info_panel(frame, dimensions)
+            with metrics.timer('draw.panel'):
+                frame = self.create_info_panel(frame, dimensions, panel_index, title)
             
+        return frame
+
+    def draw_card_detection(self, frame, card_detector):
+        """Tampilkan kartu yang terdeteksi dan progres sesi deteksi kartu"""
+        height, width, _ = frame.shape
+        x1, y1, _, _ = calibration_target_rect(width, height)
+
+        if card_detector.last_corners is not None:
+            corners = np.round(card_detector.last_corners).astype(np.int32)
+            cv2.polylines(frame, [corners], True, (0, 255, 255), 2)
+
+        text = f"Mendeteksi kartu... {len(card_detector.samples)}/{card_detector.required_samples}"
+        cv2.putText(frame, text, (x1, y1 - 45),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        return frame
+
+    def draw_metrics_hud(self, frame, snapshot):
+        """HUD profiling di pojok kiri bawah: FPS dan p50/p95/p99 per tahap"""
+        height, width, _ = frame.shape
+        lines = [f"FPS {snapshot['fps']:.1f}"]
+        for stage, summary in sorted(snapshot['stages'].items()):
+            lines.append(f"{stage}: {summary['p50_ms']:.1f} / {summary['p95_ms']:.1f} / "
+                         f"{summary['p99_ms']:.1f} ms")
+        
+        line_height = 18
+        y = height - 10 - line_height * (len(lines) - 1)
+        for text in lines:
+            cv2.putText(frame, text, (10, y),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 255), 1)
+            y += line_height
         return frame
\ No newline at end of file
@@ -0,0 +1,146 @@
+import functools
+import cv2
+import numpy as np
+
+
+@functools.lru_cache(maxsize=None)
+def circle_offsets(radius, thickness=-1):
+    """
+    Offset piksel (dy, dx) dari cv2.circle, dihitung sekali per ukuran
+    sehingga banyak lingkaran kecil bisa ditulis dengan satu indexing NumPy
+    """
+    size = 2 * (radius + max(thickness, 1)) + 3
+    center = size // 2
+    canvas = np.zeros((size, size), dtype=np.uint8)
+    cv2.circle(canvas, (center, center), radius, 255, thickness)
+    ys, xs = np.nonzero(canvas)
+    return ys - center, xs - center
+
+
+def dashed_segments(starts, ends, dash_length, frame_shape):
+    """
+    Potongan garis putus-putus untuk banyak pasangan titik sekaligus
+    Args:
+        starts, ends: Array (N, 2) titik awal dan akhir
+        dash_length: Panjang satu dash (jarak antar dash sama panjang)
+        frame_shape: Ujung dash dibatasi ke dalam frame
+    Returns:
+        (segmen (M, 2, 2) int32, indeks pasangan setiap segmen, indeks pasangan dengan jarak < 1 pixel)
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+    delta = np.asarray(ends, dtype=np.float64).reshape(-1, 2) - starts
+    dist = np.hypot(delta[:, 0], delta[:, 1])
+    short = np.flatnonzero(dist < 1)
+
+    step = dash_length * 2
+    counts = np.where(dist < 1, 0, (dist.astype(np.int64) + step - 1) // step)
+    pair = np.repeat(np.arange(len(starts)), counts)
+    if pair.size == 0:
+        return np.zeros((0, 2, 2), dtype=np.int32), pair, short
+
+    # Urutan dash di dalam setiap pasangan: 0, 1, 2, ...
+    index = np.arange(pair.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    direction = delta[pair] / dist[pair, None]
+    dash_start = starts[pair] + direction * (index * step)[:, None]
+    dash_end = dash_start + direction * dash_length
+
+    segments = np.empty((pair.size, 2, 2), dtype=np.int32)
+    segments[:, 0] = np.trunc(dash_start)
+    segments[:, 1] = np.trunc(dash_end)
+    np.clip(segments[:, 1, 0], 0, frame_shape[1] - 1, out=segments[:, 1, 0])
+    np.clip(segments[:, 1, 1], 0, frame_shape[0] - 1, out=segments[:, 1, 1])
+    return segments, pair, short
+
+
+def dashed_rectangle_segments(start_point, end_point, dash_length):
+    """Potongan keempat sisi kotak putus-putus sebagai array (M, 2, 2)"""
+    x1, y1 = start_point
+    x2, y2 = end_point
+    xs = np.arange(x1, x2, dash_length * 2)
+    ys = np.arange(y1, y2, dash_length * 2)
+    x_ends = np.minimum(xs + dash_length, x2)
+    y_ends = np.minimum(ys + dash_length, y2)
+
+    segments = []
+    for y in (y1, y2):
+        segments.append(np.stack([np.stack([xs, np.full_like(xs, y)], 1),
+                                  np.stack([x_ends, np.full_like(xs, y)], 1)], 1))
+    for x in (x1, x2):
+        segments.append(np.stack([np.stack([np.full_like(ys, x), ys], 1),
+                                  np.stack([np.full_like(ys, x), y_ends], 1)], 1))
+    return np.concatenate(segments).astype(np.int32)
+
+
+class OverlayBatch:
+    """
+    Kumpulan primitif overlay satu frame, dikelompokkan per (jenis, warna, tebal).
+    draw() mengirim setiap kelompok dengan satu cv2.polylines atau satu
+    penulisan NumPy, sehingga jumlah panggilan tidak bergantung pada jumlah
+    tangan maupun segmen. Kelompok digambar sesuai urutan pertama kali dipakai.
+    """
+
+    def __init__(self):
+        self._groups = {}
+
+    def _add(self, key, item):
+        self._groups.setdefault(key, []).append(item)
+
+    def lines(self, segments, color, thickness=1):
+        """Segmen garis (N, 2, 2)"""
+        segments = np.asarray(segments, dtype=np.int32).reshape(-1, 2, 2)
+        if len(segments):
+            self._add(('lines', tuple(color), thickness), segments)
+
+    def circles(self, centers, radius, color, thickness=-1):
+        """Lingkaran berwarna sama di setiap titik (N, 2)"""
+        centers = np.asarray(centers, dtype=np.int64).reshape(-1, 2)
+        if len(centers):
+            self._add(('circles', tuple(color), radius, thickness), centers)
+
+    def gradient_circles(self, centers, colors, radius):
+        """Lingkaran terisi dengan warna per titik; titik berikutnya menimpa sebelumnya"""
+        centers = np.asarray(centers, dtype=np.int64).reshape(-1, 2)
+        if len(centers):
+            self._add(('gradient', radius), (centers, np.asarray(colors, dtype=np.uint8).reshape(-1, 3)))
+
+    def draw(self, frame):
+        # Kelompok lingkaran yang berurutan digabung menjadi satu penulisan piksel
+        stamps = []
+        for key, items in self._groups.items():
+            kind = key[0]
+            if kind == 'lines':
+                _scatter(frame, stamps)
+                stamps = []
+                _, color, thickness = key
+                cv2.polylines(frame, np.concatenate(items), False, color, thickness)
+            elif kind == 'circles':
+                _, color, radius, thickness = key
+                centers = np.concatenate(items)
+                stamps.append(_stamp(centers, circle_offsets(radius, thickness),
+                                     np.broadcast_to(np.asarray(color, dtype=np.uint8), (len(centers), 3))))
+            else:
+                centers = np.concatenate([centers for centers, _ in items])
+                colors = np.concatenate([colors for _, colors in items])
+                stamps.append(_stamp(centers, circle_offsets(key[1]), colors))
+        _scatter(frame, stamps)
+        self._groups = {}
+        return frame
+
+
+def _stamp(centers, offsets, colors):
+    """Piksel pola offset di setiap titik: (ys, xs, warna per piksel)"""
+    dy, dx = offsets
+    ys = (centers[:, 1, None] + dy).ravel()
+    xs = (centers[:, 0, None] + dx).ravel()
+    return ys, xs, np.repeat(colors, len(dy), axis=0)
+
+
+def _scatter(frame, stamps):
+    """Tulis beberapa stamp sekaligus; urutan dipertahankan sehingga stamp terakhir menimpa"""
+    if not stamps:
+        return
+    ys = np.concatenate([stamp[0] for stamp in stamps])
+    xs = np.concatenate([stamp[1] for stamp in stamps])
+    colors = np.concatenate([stamp[2] for stamp in stamps])
+    inside = (ys >= 0) & (ys < frame.shape[0]) & (xs >= 0) & (xs < frame.shape[1])
+    frame[ys[inside], xs[inside]] = colors[inside]